@@ -1,87 +1,1130 @@
 # GitDash.py - Complete Version with GitHub Integration and Simple Push Fix
 
-123123import sys
+import sys
 import os
 import datetime
 import json
+import random
+import hashlib
+import threading
+import time
+
+# Reference point for the time-to-first-paint shown in the status bar
+STARTUP_TIME = time.perf_counter()
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QFileDialog, QLineEdit, QTreeWidget, QTreeWidgetItem,
-    QListWidget, QTabWidget, QMessageBox, QSplitter, QInputDialog, QStatusBar,
+    QPushButton, QFileDialog, QLineEdit, QTreeWidget, QTreeWidgetItem, QTableView,
+    QListWidget, QListWidgetItem, QTabWidget, QMessageBox, QSplitter, QInputDialog, QStatusBar,
     QAbstractItemView, QToolBar, QFrame, QGroupBox, QDialog, QTextEdit, QCheckBox,
-    QMenu, QMenuBar, QProgressBar, QDialogButtonBox
+    QMenu, QMenuBar, QProgressBar, QDialogButtonBox, QListView, QTableWidget,
+    QTableWidgetItem, QHeaderView, QDockWidget, QPlainTextEdit, QComboBox, QStyledItemDelegate
+)
+from PyQt6.QtCore import (
+    Qt, QObject, QTimer, QThread, pyqtSignal, QAbstractTableModel, QAbstractListModel,
+    QModelIndex, QItemSelectionModel, QSortFilterProxyModel, QFileSystemWatcher, QEvent, QPointF
+)
+from PyQt6.QtGui import (
+    QAction, QIcon, QFont, QColor, QSyntaxHighlighter, QTextCharFormat, QTextCursor, QPainter, QPen
+)
+
+from gitdash_core import (
+    GITHUB_AVAILABLE, GitError, GitHubManager, RepoStatsEngine, StatusSnapshot, CommitPager,
+    resolve_git_dirs, read_head_sha, read_ref_index, RefIndex, read_status, read_stats, list_worktree_files,
+    run_git_on_paths, push_branch, pull_branch, fetch_remote, checkout_ref, scan_workspace, find_git_dir,
+    commit_staged, fetch_commit_page, fetch_head_change, load_repo_cache, stream_github_repos, read_ignored,
+    read_github_identity, read_github_login, INSTRUMENTATION, measure, count_process, LRUCache, NULL_OID,
+    read_commit_files, read_file_diff, read_blob, blob_text, commit_files_key, blob_key,
+    CommitColumns, CommitGraph, HistoryCache, load_history_cache, build_history_cache, save_history_cache,
+    extend_history_cache, stage_all_changes
 )
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt6.QtGui import QAction, QIcon, QFont
-from git import Repo, GitCommandError
-import requests
-import urllib.parse
-
-# Try to import PyGithub
-try:
-    from github import Github, GithubException
-    GITHUB_AVAILABLE = True
-except ImportError:
-    GITHUB_AVAILABLE = False
+
+if not GITHUB_AVAILABLE:
     print("PyGithub not installed. Run: pip install PyGithub")
 
-class GitHubManager:
-    def __init__(self, token=None):
-        self.token = token
-        self.github = Github(token) if token and GITHUB_AVAILABLE else None
-        
-    def set_token(self, token):
-        """Set or update GitHub token"""
-        self.token = token
-        self.github = Github(token) if GITHUB_AVAILABLE else None
-        
-    def test_connection(self):
-        """Test if token is valid"""
-        if not GITHUB_AVAILABLE:
-            return False, "PyGithub library not installed"
+class RepoJob(QThread):
+    """A single Git operation executed on a background thread"""
+    result_ready = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    progress = pyqtSignal(object)
+
+    def __init__(self, key, func, args, exclusive=False, mutates=False, conflicts=()):
+        super().__init__()
+        self.key = key
+        self.func = func
+        self.args = args
+        self.exclusive = exclusive
+        # Changes something: queued behind earlier jobs with its key, never replaced
+        self.mutates = mutates or exclusive
+        # Keys of the reads an exclusive job holds back until it is done
+        self.conflicts = frozenset(conflicts)
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Ask the job to stop; its result will be discarded"""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def wait_cancelled(self, timeout):
+        """Block up to timeout seconds; True once the job has been cancelled"""
+        return self._cancel_event.wait(timeout)
+
+    def report_progress(self, payload):
+        """Send an intermediate result to the GUI thread"""
+        if not self.is_cancelled():
+            self.progress.emit(payload)
+
+    def run(self):
         try:
-            user = self.github.get_user()
-            return True, f"Connected as {user.login} ({user.name})"
+            with measure(self.key):
+                result = self.func(self, *self.args)
         except Exception as e:
-            return False, str(e)
-    
-    def create_remote_repo(self, name, description="", private=False):
-        """Create a new repository on GitHub"""
-        if not GITHUB_AVAILABLE:
-            return False, "PyGithub library not installed"
+            if not self.is_cancelled():
+                self.failed.emit(e)
+            return
+        if not self.is_cancelled():
+            self.result_ready.emit(result)
+
+class RepoWorkerPool(QObject):
+    """Runs RepoJobs on a bounded number of background threads.
+
+    Jobs are keyed by purpose ("commits", "stage", "push"...). Submitting a
+    read cancels the queued or running job with the same key (and any keys it
+    supersedes), so only the latest result is delivered. Jobs that change
+    something (mutates, or exclusive) are never replaced that way: they queue
+    behind the earlier jobs with their key and all of them run. Exclusive jobs
+    modify the worktree or index; they run one at a time in submission order
+    and hold back the reads they supersede (those would see a half-done
+    change) until they finish. Other reads keep running meanwhile.
+
+    Cancelled jobs deliver no callback; cancelled reports their key instead.
+    """
+    cancelled = pyqtSignal(str)
+
+    def __init__(self, parent=None, max_workers=4):
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self._pending = []
+        self._running = set()
+        # key -> its jobs, oldest first (only mutating jobs share a key)
+        self._jobs = {}
+
+    def submit(self, key, func, *args, on_result=None, on_error=None, on_progress=None,
+               exclusive=False, mutates=False, supersedes=()):
+        """Queue func(job, *args) on a worker thread; callbacks run on the GUI thread"""
+        job = RepoJob(key, func, args, exclusive, mutates, supersedes)
+        for other in tuple(supersedes) if job.mutates else (key,) + tuple(supersedes):
+            self.cancel(other)
+        
+        job.result_ready.connect(lambda result: self._deliver(job, on_result, result, done=True))
+        job.failed.connect(lambda error: self._deliver(job, on_error, error, done=True))
+        if on_progress:
+            job.progress.connect(lambda payload: self._deliver(job, on_progress, payload))
+        job.finished.connect(lambda: self._on_finished(job))
+        
+        self._jobs.setdefault(key, []).append(job)
+        self._pending.append(job)
+        self._start_pending()
+        return job
+
+    def cancel(self, key):
+        """Cancel the jobs registered under key, if any"""
+        jobs = self._jobs.pop(key, ())
+        for job in jobs:
+            job.cancel()
+            if job in self._pending:
+                self._pending.remove(job)
+        if jobs:
+            self.cancelled.emit(key)
+
+    def cancel_all(self, keep=()):
+        """Cancel every job except those registered under the keys in keep"""
+        for key in list(self._jobs):
+            if key not in keep:
+                self.cancel(key)
+
+    def is_busy(self, key):
+        return key in self._jobs
+
+    def shutdown(self, timeout_ms=5000):
+        """Cancel everything and wait for running threads to exit"""
+        self.cancel_all()
+        for job in list(self._running):
+            job.wait(timeout_ms)
+
+    def _deliver(self, job, callback, value, done=False):
+        # Results of cancelled or superseded jobs are dropped
+        jobs = self._jobs.get(job.key, ())
+        if job.is_cancelled() or job not in jobs:
+            return
+        if done:
+            jobs.remove(job)
+            if not jobs:
+                del self._jobs[job.key]
+            if callback:
+                # Time spent applying the result blocks the GUI thread
+                with measure(f"{job.key} (apply)"):
+                    callback(value)
+        elif callback:
+            callback(value)
+
+    def _on_finished(self, job):
+        self._running.discard(job)
+        self._start_pending()
+
+    def _start_pending(self):
+        # Exclusive jobs block the exclusive jobs and conflicting reads queued
+        # after them; everything else starts as soon as a thread is free
+        blocking = [job for job in self._running if job.exclusive]
+        for job in list(self._pending):
+            if len(self._running) >= self.max_workers:
+                break
+            if job.exclusive:
+                ready = not blocking
+                blocking.append(job)
+            else:
+                ready = not any(job.key in other.conflicts for other in blocking)
+            if ready:
+                self._pending.remove(job)
+                self._running.add(job)
+                job.start()
+
+class RepoWatcher(QObject):
+    """Watches a repository on disk and reports which panels need a refresh.
+
+    Git's own files (HEAD, index, refs, packed-refs, config) are watched through
+    their directories, since git replaces them by renaming lock files. Worktree
+    directories and files are watched up to a cap, new directories only when
+    git doesn't ignore them (build output would rescan status constantly);
+    bursts of events are coalesced over DEBOUNCE_MS and delivered once as a
+    set of panel names.
+    """
+    changed = pyqtSignal(object)
+
+    DEBOUNCE_MS = 300
+    MAX_WATCHED_DIRS = 4000
+    MAX_WATCHED_FILES = 2000
+
+    # Files in the git directory and the panels that depend on them
+    GIT_FILES = {
+        'HEAD': {'commits', 'branches', 'stage', 'stats'},
+        'index': {'stage'},
+        'packed-refs': {'commits', 'branches', 'stats'},
+        'config': {'remote'},
+    }
+    REF_PANELS = {'commits', 'branches', 'stats'}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._flush)
+        self._dirty = set()
+        self._stamps = {}
+        self.work_dir = None
+        self.git_dir = None
+        self.common_dir = None
+        self.ref_dirs = set()
+        self.ignored_dirs = set()
+        self.partial = False
+
+    def watch(self, work_dir, git_dir, worktree_paths):
+        """Start watching; worktree_paths are repo-relative tracked/untracked files"""
+        self.clear()
+        self.work_dir = work_dir
+        self.git_dir, self.common_dir = resolve_git_dirs(git_dir)
+        
+        git_paths = [self.git_dir]
+        if self.common_dir != self.git_dir:
+            git_paths.append(self.common_dir)
+        for ref_root in ('refs/heads', 'refs/remotes', 'refs/tags'):
+            for root, dirs, files in os.walk(os.path.join(self.common_dir, ref_root)):
+                self.ref_dirs.add(root)
+        self._stamps = self._git_stamps()
+        
+        dirs, files = {work_dir}, []
+        for rel_path in worktree_paths:
+            parent = os.path.dirname(rel_path)
+            while parent and len(dirs) < self.MAX_WATCHED_DIRS:
+                full_parent = os.path.join(work_dir, parent)
+                if full_parent in dirs:
+                    break
+                dirs.add(full_parent)
+                parent = os.path.dirname(parent)
+            if len(files) < self.MAX_WATCHED_FILES:
+                files.append(os.path.join(work_dir, rel_path))
+        # Content edits of unwatched files are picked up on window activation
+        self.partial = len(files) < len(worktree_paths) or len(dirs) >= self.MAX_WATCHED_DIRS
+        
+        self._watcher.addPaths(git_paths + sorted(self.ref_dirs) + sorted(dirs) + files)
+
+    def clear(self):
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+        self._timer.stop()
+        self._dirty.clear()
+        self.ref_dirs = set()
+        self.ignored_dirs = set()
+        self.work_dir = None
+
+    def mark_dirty(self, panels):
+        """Queue panels for refresh, restarting the debounce window"""
+        self._dirty.update(panels)
+        self._timer.start()
+
+    def _git_stamps(self):
+        stamps = {}
+        for name in self.GIT_FILES:
+            base = self.common_dir if name in ('packed-refs', 'config') else self.git_dir
+            try:
+                st = os.stat(os.path.join(base, name))
+                stamps[name] = (st.st_mtime_ns, st.st_size, st.st_ino)
+            except OSError:
+                stamps[name] = None
+        return stamps
+
+    def _on_directory_changed(self, path):
+        if self.work_dir is None:
+            return
+        if path in (self.git_dir, self.common_dir):
+            # Lock files come and go here; only react to the files we track
+            stamps = self._git_stamps()
+            panels = set()
+            for name, stamp in stamps.items():
+                if stamp != self._stamps.get(name):
+                    panels |= self.GIT_FILES[name]
+            self._stamps = stamps
+            if panels:
+                self.mark_dirty(panels)
+        elif path in self.ref_dirs:
+            self._watch_new_subdirs(path, self.ref_dirs)
+            self.mark_dirty(self.REF_PANELS)
+        else:
+            self._watch_new_subdirs(path)
+            self.mark_dirty({'stage'})
+
+    def _on_file_changed(self, path):
+        if self.work_dir is None:
+            return
+        # Files replaced by rename drop out of the watch list; re-add them
+        if os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+        self.mark_dirty({'stage'})
+
+    def _watch_new_subdirs(self, path, registry=None):
+        # New directories may arrive as a whole tree (mkdir -p, unpacking...);
+        # it is walked level by level, with one ignore check per level
+        watched = set(self._watcher.directories())
+        pending = [path]
+        while pending:
+            found = []
+            for parent in pending:
+                try:
+                    entries = list(os.scandir(parent))
+                except OSError:
+                    continue
+                found += [entry.path for entry in entries
+                          if entry.is_dir(follow_symlinks=False) and entry.name != '.git'
+                          and entry.path not in watched and entry.path not in self.ignored_dirs]
+            if registry is None and found:
+                # Ref directories are never ignored; worktree ones often are
+                self._skip_ignored(found)
+                found = [new_dir for new_dir in found if new_dir not in self.ignored_dirs]
+            pending = []
+            for new_dir in found:
+                if len(watched) >= self.MAX_WATCHED_DIRS:
+                    self.partial = True
+                    return
+                self._watcher.addPath(new_dir)
+                watched.add(new_dir)
+                pending.append(new_dir)
+                if registry is not None:
+                    registry.add(new_dir)
+
+    def _skip_ignored(self, dirs):
+        """Add the ignored ones among dirs to ignored_dirs"""
+        rel_paths = {os.path.relpath(new_dir, self.work_dir): new_dir for new_dir in dirs}
         try:
-            user = self.github.get_user()
-            repo = user.create_repo(
-                name=name,
-                description=description,
-                private=private,
-                auto_init=False  # Don't init, we'll push our local
+            ignored = read_ignored(self.work_dir, list(rel_paths))
+        except GitError:
+            # Watch them all rather than miss changes
+            return
+        self.ignored_dirs.update(rel_paths[rel_path] for rel_path in ignored if rel_path in rel_paths)
+
+    def _flush(self):
+        panels, self._dirty = self._dirty, set()
+        if panels:
+            self.changed.emit(panels)
+
+class FetchScheduler(QObject):
+    """Fetches origin in the background every interval_s seconds.
+
+    Only one fetch is in flight at a time and none starts while is_busy()
+    reports a user-initiated remote operation. Failures back off
+    exponentially up to MAX_BACKOFF_S; every delay is jittered so several
+    open instances don't fetch in lockstep.
+    """
+    fetched = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+    FIRST_FETCH_S = 5
+    MAX_BACKOFF_S = 3600
+    JITTER = 0.2
+
+    def __init__(self, workers, github_manager, is_busy, parent=None):
+        super().__init__(parent)
+        self.workers = workers
+        self.github_manager = github_manager
+        self.is_busy = is_busy
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.fetch_now)
+        # A cancelled fetch never reaches _on_fetched/_on_failed
+        workers.cancelled.connect(self._on_cancelled)
+        self.repo_path = None
+        self.interval_s = 0
+        self.failures = 0
+
+    def start(self, repo_path, interval_s):
+        """Schedule fetches for repo_path; an interval of 0 disables them"""
+        if repo_path == self.repo_path and interval_s == self.interval_s and (
+                self._timer.isActive() or self.workers.is_busy('auto_fetch')):
+            return
+        self.stop()
+        if interval_s <= 0:
+            return
+        self.repo_path = repo_path
+        self.interval_s = interval_s
+        self._schedule(min(self.FIRST_FETCH_S, interval_s))
+
+    def stop(self):
+        self._timer.stop()
+        self.repo_path = None
+        self.interval_s = 0
+        self.failures = 0
+        self.workers.cancel('auto_fetch')
+
+    def fetch_now(self):
+        if not self.repo_path:
+            return
+        if self.is_busy() or self.workers.is_busy('auto_fetch'):
+            self._schedule(self.interval_s)
+            return
+        self.workers.submit(
+            'auto_fetch', fetch_remote, self.repo_path, self.github_manager, True,
+            on_result=self._on_fetched,
+            on_error=self._on_failed
+        )
+
+    def _schedule(self, delay_s):
+        jitter = random.uniform(1 - self.JITTER, 1 + self.JITTER)
+        self._timer.start(int(delay_s * jitter * 1000))
+
+    def _on_fetched(self, result):
+        self.failures = 0
+        self._schedule(self.interval_s)
+        self.fetched.emit(result)
+
+    def _on_failed(self, error):
+        self.failures += 1
+        self._schedule(min(self.interval_s * 2 ** self.failures, self.MAX_BACKOFF_S))
+        self.failed.emit(error)
+
+    def _on_cancelled(self, key):
+        # Superseded by a user's push/pull/fetch or a repository switch
+        if key == 'auto_fetch' and self.repo_path:
+            self._schedule(self.interval_s)
+
+# ==== Background Git operations ====
+# Read and network operations live in gitdash_core; these use GitPython.
+
+def git_repo(path, init=False):
+    """GitPython Repo for path; GitPython is slow to import, so it loads on first use"""
+    from git import Repo
+    return Repo.init(path) if init else Repo(path)
+
+def run_git_command(job, repo_path, command, *args):
+    """Run a single git subcommand, e.g. run_git_command(job, path, 'add', 'a.txt')"""
+    with git_repo(repo_path) as repo:
+        output = getattr(repo.git, command)(*args)
+    count_process(len(output))
+    return output
+
+class CommitLogModel(QAbstractTableModel):
+    """Commit history that is fetched page by page as the view scrolls.
+
+    Rows live in a CommitColumns store (packed binary shas, arrays of
+    timestamps and interned author ids, one UTF-8 buffer for all subjects)
+    instead of one widget item per row, so a long history costs a few dozen
+    bytes per loaded commit and only visible rows are ever formatted.
+
+    With a cache_root, the whole history is also kept in a HistoryCache:
+    reopening a repository paints the cached rows and only asks git for
+    what changed since. The Graph column's lanes come from a CommitGraph
+    that lays rows out as the view paints them.
+    """
+    HEADERS = ["Graph", "Hash", "Message", "Author", "Date"]
+    PAGE_SIZE = 200
+    ShaRole = Qt.ItemDataRole.UserRole
+    GraphRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, workers, cache_root=None, parent=None):
+        super().__init__(parent)
+        self.workers = workers
+        self.cache_root = cache_root
+        self.cache = None
+        self.pager = None
+        self.repo_path = None
+        self.head_sha = None
+        self._set_columns(CommitColumns())
+
+    def _set_columns(self, columns):
+        self._columns = columns
+        self.graph = CommitGraph(columns)
+
+    def reset(self, repo_path=None):
+        """Drop all rows and start streaming history from repo_path"""
+        self.workers.cancel('commits')
+        self.workers.cancel('new_commits')
+        self.workers.cancel('history_cache')
+        if self.pager:
+            self.pager.close()
+        self.beginResetModel()
+        self._set_columns(CommitColumns())
+        self.repo_path = repo_path
+        self.pager = CommitPager(repo_path) if repo_path else None
+        self.head_sha = self.pager.head_sha if self.pager else None
+        self.cache = None
+        if self.cache_root and self.head_sha:
+            self.cache = HistoryCache(self.cache_root, repo_path)
+        self.endResetModel()
+        if self.cache is None:
+            self.fetchMore(QModelIndex())
+            return
+        # Paging waits while 'commits' is busy loading the cache
+        self.workers.submit(
+            'commits', load_history_cache, self.cache,
+            on_result=self.adopt_cache,
+            on_error=self.cache_failed
+        )
+
+    def adopt_cache(self, cached):
+        if cached is None:
+            # Nothing usable on disk: page through git and build the cache meanwhile
+            self.build_cache()
+            self.fetchMore(QModelIndex())
+            return
+        tip, columns = cached
+        self.pager.close()
+        self.beginInsertRows(QModelIndex(), 0, len(columns) - 1)
+        self._set_columns(columns)
+        self.endInsertRows()
+        # Git is consulted only for the commits between the cached tip and HEAD
+        self.head_sha = tip
+        self.refresh(self.repo_path)
+
+    def build_cache(self):
+        tip = self.head_sha
+        self.workers.submit(
+            'history_cache', build_history_cache, self.cache, self.repo_path, tip,
+            on_result=lambda columns: self.complete_from_cache(tip, columns),
+            on_error=self.cache_failed
+        )
+
+    def complete_from_cache(self, tip, columns):
+        """Append the rest of the freshly cached history instead of paging through it"""
+        loaded = len(self._columns)
+        if tip != self.head_sha or self.pager.exhausted or columns.shas[:loaded * 20] != self._columns.shas:
+            return
+        self.workers.cancel('commits')
+        self.pager.close()
+        if len(columns) > loaded:
+            self._insert_columns(loaded, columns.slice(loaded))
+
+    def update_cache(self, old_sha, new_sha, records=None):
+        """Bring the cache to new_sha: a delta segment for new commits on top, else a rewrite"""
+        if self.cache is None or not self.pager.exhausted:
+            # Only whole histories are cached; a build is running otherwise
+            return
+        if records is None:
+            self.workers.submit(
+                'history_cache', save_history_cache, self.cache, new_sha, self._columns.slice(0),
+                on_error=self.cache_failed
             )
-            return True, repo.clone_url
-        except GithubException as e:
-            if e.status == 422:
-                return False, "Repository name already exists"
-            return False, str(e)
-        except Exception as e:
-            return False, str(e)
-    
-    def get_user_repos(self):
-        """Get list of user's repositories"""
-        if not GITHUB_AVAILABLE:
-            return []
-        try:
-            repos = []
-            for repo in self.github.get_user().get_repos():
-                repos.append({
-                    'name': repo.name,
-                    'description': repo.description,
-                    'url': repo.html_url,
-                    'clone_url': repo.clone_url,
-                    'private': repo.private
-                })
-            return repos
-        except Exception as e:
-            return []
+            return
+        self.workers.submit(
+            'history_cache', extend_history_cache, self.cache, old_sha, new_sha,
+            CommitColumns.from_records(records),
+            on_result=lambda extended: extended or self.update_cache(None, self.head_sha),
+            on_error=self.cache_failed
+        )
+
+    def cache_failed(self, error):
+        # The cache only saves time; without it history is paged from git
+        self.cache = None
+        self.fetchMore(QModelIndex())
+
+    def refresh(self, repo_path=None):
+        """Bring the rows up to date with HEAD, keeping the history it shares with the loaded rows"""
+        if repo_path is None or repo_path != self.repo_path or self.head_sha is None:
+            self.reset(repo_path)
+            return
+        new_sha = read_head_sha(find_git_dir(repo_path))
+        if new_sha == self.head_sha:
+            return
+        if new_sha is None:
+            self.reset(repo_path)
+            return
+        old_sha = self.head_sha
+        # New commits older than the last loaded row come with later pages
+        times = self._columns.times
+        since = None if self.pager.exhausted or not times else times[-1]
+        self.workers.submit(
+            'new_commits', fetch_head_change, repo_path, old_sha, new_sha, since,
+            on_result=lambda change: self.apply_head_change(old_sha, new_sha, change),
+            on_error=self.fetch_failed
+        )
+
+    def add_commit(self, record):
+        """Show a commit just made on top of HEAD without reading history again"""
+        if self.head_sha is None or record.parents[:1] != [self.head_sha]:
+            # First commit of the branch, or HEAD moved in the meantime
+            self.refresh(self.repo_path)
+            return
+        old_sha, self.head_sha = self.head_sha, record.sha
+        self.prepend_rows([record])
+        self.update_cache(old_sha, record.sha, [record])
+
+    def apply_head_change(self, old_sha, new_sha, change):
+        if old_sha != self.head_sha:
+            # The rows changed underneath (reset or another refresh won)
+            return
+        if change is None:
+            if self.cache is not None:
+                # Too far from the cached tip to catch up; read history afresh
+                self.cache.clear()
+            self.reset(self.repo_path)
+            return
+        dropped, added, deferred = change
+        self.head_sha = new_sha
+        if dropped:
+            self.remove_shas(dropped)
+        on_top = self.merge_rows(added)
+        if dropped or deferred:
+            # The old walk would bring back dropped commits and miss deferred ones
+            self.workers.cancel('commits')
+            exhausted = self.pager.exhausted
+            self.pager.close()
+            loaded = {self.sha(row) for row in range(len(self._columns))}
+            self.pager = CommitPager(self.repo_path, new_sha, seen=loaded)
+            if exhausted:
+                self.pager.close()
+        self.update_cache(old_sha, new_sha, added if on_top and not dropped else None)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent):
+        if parent.isValid() or self.pager is None:
+            return False
+        return not self.pager.exhausted and not self.workers.is_busy('commits')
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        self.workers.submit(
+            'commits', fetch_commit_page, self.pager, self.PAGE_SIZE,
+            on_result=self.append_page,
+            on_error=self.fetch_failed
+        )
+
+    def append_page(self, rows):
+        # A cancelled page never gets here; the pager hands it out again
+        self.pager.page_delivered(rows)
+        self.append_rows(rows)
+
+    def fetch_failed(self, error):
+        # Stop paging (the rows are incomplete, so not cacheable); the error
+        # is reported by the owning window
+        self.pager.exhausted = True
+        self.cache = None
+        self.parent().show_error(f"Error loading commits:\n{error}")
+
+    def _insert_columns(self, first, columns):
+        self.beginInsertRows(QModelIndex(), first, first + len(columns) - 1)
+        self._columns.insert(first, columns)
+        # Rows above the insertion keep their lanes (the graph resumes from its
+        # checkpoint above it); appending costs nothing, prepending lays out again
+        self.graph.invalidate(first)
+        self.endInsertRows()
+
+    def _remove_rows(self, first, last):
+        self.beginRemoveRows(QModelIndex(), first, last)
+        self._columns.delete(first, last)
+        self.graph.invalidate(first)
+        self.endRemoveRows()
+
+    def append_rows(self, rows):
+        if rows:
+            self._insert_columns(len(self._columns), CommitColumns.from_records(rows))
+
+    def prepend_rows(self, rows):
+        """Insert commits that are newer than every loaded row at the top"""
+        if rows:
+            self._insert_columns(0, CommitColumns.from_records(rows))
+
+    def merge_rows(self, rows):
+        """Insert newest-first commits where their commit dates place them.
+
+        Returns True when all of them went on top.
+        """
+        groups = []
+        row = 0
+        times = self._columns.times
+        for record in rows:
+            while row < len(times) and times[row] >= record.timestamp:
+                row += 1
+            if groups and groups[-1][0] == row:
+                groups[-1][1].append(record)
+            else:
+                groups.append((row, [record]))
+        # Bottom up, so the positions of the groups above stay valid
+        for row, records in reversed(groups):
+            self._insert_columns(row, CommitColumns.from_records(records))
+        return all(row == 0 for row, records in groups)
+
+    def remove_shas(self, shas):
+        """Remove the rows of the given commits, one block of adjacent rows at a time"""
+        targets = {bytes.fromhex(sha) for sha in shas}
+        packed = bytes(self._columns.shas)
+        rows = [row for row in range(len(self._columns)) if packed[row * 20:(row + 1) * 20] in targets]
+        blocks = []
+        for row in rows:
+            if blocks and blocks[-1][1] == row - 1:
+                blocks[-1][1] = row
+            else:
+                blocks.append([row, row])
+        for first, last in reversed(blocks):
+            self._remove_rows(first, last)
+
+    def sha(self, row):
+        return self._columns.sha(row)
+
+    def subject(self, row):
+        return self._columns.subject(row)
+
+    def committed_datetime(self, row):
+        tz = datetime.timezone(datetime.timedelta(minutes=self._columns.tz_minutes[row]))
+        return datetime.datetime.fromtimestamp(self._columns.times[row], tz)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return None
+            if column == 1:
+                return self.sha(row)[:7]
+            if column == 2:
+                return self.subject(row)
+            if column == 3:
+                return self._columns.author(row)
+            return self.committed_datetime(row).strftime("%Y-%m-%d %H:%M")
+        if role == self.GraphRole:
+            return self.graph.row(row)
+        if role == Qt.ItemDataRole.ForegroundRole and column == 4:
+            # Color code based on age
+            age_days = (time.time() - self._columns.times[row]) // 86400
+            if age_days < 1:
+                return QColor(Qt.GlobalColor.green)
+            elif age_days < 7:
+                return QColor(Qt.GlobalColor.yellow)
+        if role == self.ShaRole:
+            return self.sha(row)
+        return None
+
+class CommitGraphDelegate(QStyledItemDelegate):
+    """Paints a history row's lanes: lines passing through, the commit's dot and its parent edges.
+
+    Qt only asks for visible cells, so the cost of a repaint depends on the
+    height of the view, not on the length of the history.
+    """
+    LANE_WIDTH = 14
+    COLORS = [QColor(color) for color in
+              ("#7dd3fc", "#4ade80", "#facc15", "#f87171", "#c084fc", "#fb923c", "#2dd4bf", "#f472b6")]
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        lane, from_child, through, parents = index.data(CommitLogModel.GraphRole)
+        rect = option.rect
+        top, bottom, middle = rect.top(), rect.bottom() + 1, rect.center().y() + 0.5
+        # Lanes past the column's right edge aren't drawn
+        visible = rect.width() // self.LANE_WIDTH + 1
+        
+        def x(column):
+            return rect.left() + (column + 0.5) * self.LANE_WIDTH
+        
+        painter.save()
+        painter.setClipRect(rect)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        for column in range(min(through.bit_length(), visible)):
+            if through >> column & 1:
+                painter.setPen(self.pen(column))
+                painter.drawLine(QPointF(x(column), top), QPointF(x(column), bottom))
+        if from_child:
+            painter.setPen(self.pen(lane))
+            painter.drawLine(QPointF(x(lane), top), QPointF(x(lane), middle))
+        for column in range(parents.bit_length()):
+            if parents >> column & 1:
+                painter.setPen(self.pen(column))
+                painter.drawLine(QPointF(x(lane), middle), QPointF(x(column), bottom))
+        color = self.COLORS[lane % len(self.COLORS)]
+        painter.setPen(QPen(color.darker(150), 1.5))
+        painter.setBrush(color)
+        painter.drawEllipse(QPointF(x(lane), middle), 4, 4)
+        painter.restore()
+
+    def pen(self, column):
+        return QPen(self.COLORS[column % len(self.COLORS)], 2)
+
+class DiffHighlighter(QSyntaxHighlighter):
+    """Colors added, removed and hunk header lines"""
+    def __init__(self, document):
+        super().__init__(document)
+        self.enabled = True
+        self.formats = {}
+        for prefix, color in (('+', "#4ade80"), ('-', "#f87171"), ('@', "#7dd3fc")):
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(color))
+            self.formats[prefix] = text_format
+
+    def highlightBlock(self, text):
+        if self.enabled and text:
+            text_format = self.formats.get(text[0])
+            if text_format is not None:
+                self.setFormat(0, len(text), text_format)
+
+class DiffView(QPlainTextEdit):
+    """Read-only diff or file text, laid out a chunk of lines at a time.
+
+    Only the first chunk is inserted up front; the next one follows when the
+    user scrolls near the end, so a huge diff doesn't block the GUI thread.
+    """
+    CHUNK_LINES = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        font = QFont("monospace")
+        font.setStyleHint(QFont.StyleHint.TypeWriter)
+        self.setFont(font)
+        self.highlighter = DiffHighlighter(self.document())
+        self._lines = []
+        self._shown = 0
+        self.verticalScrollBar().valueChanged.connect(self._load_more)
+
+    def show_text(self, text, diff=True):
+        self.highlighter.enabled = diff
+        self._lines = text.split('\n')
+        self._shown = 0
+        self.clear()
+        self._append_chunk()
+
+    def clear_text(self):
+        self._lines = []
+        self._shown = 0
+        self.clear()
+
+    def _append_chunk(self):
+        chunk = self._lines[self._shown:self._shown + self.CHUNK_LINES]
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        # Inserting through a cursor leaves the scroll position alone
+        cursor.insertText(('\n' if self._shown else '') + '\n'.join(chunk))
+        self._shown += len(chunk)
+
+    def _load_more(self, value):
+        scrollbar = self.verticalScrollBar()
+        if self._shown < len(self._lines) and value >= scrollbar.maximum() - scrollbar.pageStep():
+            self._append_chunk()
+
+class RefListModel(QAbstractTableModel):
+    """Branches, remote-tracking branches and tags from a RefIndex.
+
+    Filtering and sorting swap the row list in one layout change, with
+    persistent indexes (selection, current row) moved by ref name.
+    """
+    COLUMNS = ["Name", "Last Commit", "Author", "Tracking"]
+    KIND_ICONS = {'local': "🌿", 'remote': "☁️", 'tag': "🏷️"}
+    RefRole = Qt.ItemDataRole.UserRole
+    SORT_KEYS = [
+        lambda ref: ref.name.lower(),
+        lambda ref: ref.timestamp or 0,
+        lambda ref: ref.author.lower(),
+        lambda ref: (ref.gone, ref.behind, ref.ahead)
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.ref_index = RefIndex([])
+        self.query = ""
+        self.kind = None
+        # None keeps the index order (ranked by match quality while filtering)
+        self.sort_column = None
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self._rows = []
+
+    def set_ref_index(self, ref_index):
+        self.ref_index = ref_index
+        self._refilter()
+
+    def set_query(self, query):
+        self.query = query
+        self._refilter()
+
+    def set_kind(self, kind):
+        self.kind = kind
+        self._refilter()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sort_column, self.sort_order = column, order
+        self._refilter()
+
+    def _refilter(self):
+        refs = self.ref_index.refs
+        rows = [refs[i] for i in self.ref_index.filter(self.query)]
+        if self.kind is not None:
+            rows = [ref for ref in rows if ref.kind == self.kind]
+        if self.sort_column is not None:
+            rows.sort(key=self.SORT_KEYS[self.sort_column],
+                      reverse=self.sort_order == Qt.SortOrder.DescendingOrder)
+        self._replace_rows(rows)
+
+    def _replace_rows(self, rows):
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_names = [self._rows[index.row()].ref_name for index in old_indexes]
+        self._rows = rows
+        positions = {ref.ref_name: row for row, ref in enumerate(rows)}
+        new_indexes = []
+        for index, name in zip(old_indexes, old_names):
+            row = positions.get(name)
+            new_indexes.append(QModelIndex() if row is None else self.index(row, index.column()))
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def set_current(self, branch):
+        """Move the current-branch marker without re-reading refs"""
+        self.ref_index.current = branch
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, 0))
+
+    def ref(self, row):
+        return self._rows[row]
+
+    def row_of(self, ref_name):
+        for row, ref in enumerate(self._rows):
+            if ref.ref_name == ref_name:
+                return row
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        ref, column = self._rows[index.row()], index.column()
+        is_current = ref.kind == 'local' and ref.name == self.ref_index.current
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return f"{self.KIND_ICONS[ref.kind]} {ref.name}" + ("  ✔" if is_current else "")
+            if column == 1:
+                if ref.timestamp is None:
+                    return "…"
+                return datetime.datetime.fromtimestamp(ref.timestamp).strftime("%Y-%m-%d %H:%M")
+            if column == 2:
+                return ref.author
+            return ref.track_text()
+        if role == Qt.ItemDataRole.ToolTipRole and column == 0:
+            if ref.upstream:
+                track = ref.track_text()
+                return f"{ref.ref_name}\nTracking {ref.upstream}" + (f" ({track})" if track else " (up to date)")
+            return ref.ref_name
+        if role == Qt.ItemDataRole.ForegroundRole and column in (0, 3) and (ref.behind or ref.gone):
+            return QColor("#facc15")
+        if role == Qt.ItemDataRole.FontRole and is_current:
+            font = QFont()
+            font.setBold(True)
+            return font
+        if role == self.RefRole:
+            return ref
+        return None
+
+class GitHubRepoListModel(QAbstractListModel):
+    """Repository rows, filled page by page as the listing streams in"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pages = []
+        self._rows = []
+
+    def set_page(self, index, rows, changed=True):
+        """Insert or replace page index; unchanged (304) pages are left alone.
+
+        Only the rows between the part the old and new page start with and
+        the part they end with are touched, so an added or removed repository
+        is a single row insert or removal and the view keeps its scroll
+        position and selection.
+        """
+        if index < len(self._pages) and (not changed or self._pages[index] == rows):
+            return
+        while len(self._pages) <= index:
+            self._pages.append([])
+        first = sum(len(page) for page in self._pages[:index])
+        old = self._pages[index]
+        self._pages[index] = rows
+        
+        limit = min(len(old), len(rows))
+        head = 0
+        while head < limit and old[head] == rows[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old[-1 - tail] == rows[-1 - tail]:
+            tail += 1
+        old_end, new_end = len(old) - tail, len(rows) - tail
+        replaced = min(old_end, new_end) - head
+        start = first + head
+        if replaced:
+            self._rows[start:start + replaced] = rows[head:head + replaced]
+            self.dataChanged.emit(self.index(start), self.index(start + replaced - 1))
+        start += replaced
+        if new_end > old_end:
+            self.beginInsertRows(QModelIndex(), start, first + new_end - 1)
+            self._rows[start:start] = rows[head + replaced:new_end]
+            self.endInsertRows()
+        elif old_end > new_end:
+            self.beginRemoveRows(QModelIndex(), start, first + old_end - 1)
+            del self._rows[start:first + old_end]
+            self.endRemoveRows()
+
+    def truncate_pages(self, count):
+        """Drop pages past count (the listing got shorter)"""
+        first = sum(len(page) for page in self._pages[:count])
+        del self._pages[count:]
+        if first < len(self._rows):
+            self.beginRemoveRows(QModelIndex(), first, len(self._rows) - 1)
+            del self._rows[first:]
+            self.endRemoveRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        repo = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            item_text = f"📦 {repo['name']}"
+            if repo['private']:
+                item_text += " 🔒"
+            if repo['description']:
+                item_text += f"\n   {repo['description']}"
+            return item_text
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return repo['url']
+        return None
+
+class GitHubReposDialog(QDialog):
+    """Repository browser that shows the cached listing at once and streams updates"""
+    def __init__(self, parent, cached_pages):
+        super().__init__(parent)
+        self.setWindowTitle("📋 My GitHub Repositories")
+        self.setModal(True)
+        self.resize(600, 400)
+        self.setStyleSheet(parent.styleSheet() if parent else "")
+        
+        layout = QVBoxLayout(self)
+        
+        self.header = QLabel()
+        self.header.setStyleSheet("font-size: 16px; font-weight: bold; margin-bottom: 10px;")
+        layout.addWidget(self.header)
+        
+        # Type-ahead filter over the rows loaded so far
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter repositories...")
+        layout.addWidget(self.filter_input)
+        
+        self.model = GitHubRepoListModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.filter_input.textChanged.connect(self.proxy.setFilterFixedString)
+        
+        self.repo_list = QListView()
+        self.repo_list.setModel(self.proxy)
+        # Rows with a description are two lines high, so sizes aren't uniform;
+        # batched layout keeps long listings responsive instead
+        self.repo_list.setLayoutMode(QListView.LayoutMode.Batched)
+        layout.addWidget(self.repo_list)
+        
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #7dd3fc;")
+        layout.addWidget(self.status_label)
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+        
+        for index, page in enumerate(cached_pages):
+            self.model.set_page(index, page['rows'])
+        self.loading = True
+        self.update_header()
+        
+    def update_header(self):
+        self.header.setText(f"📋 Your GitHub Repositories ({self.model.rowCount()})")
+        self.status_label.setText("🔄 Refreshing from GitHub..." if self.loading else "")
+        
+    def add_page(self, progress):
+        index, rows, changed = progress
+        self.model.set_page(index, rows, changed)
+        self.update_header()
+        
+    def finish(self, page_count):
+        self.model.truncate_pages(page_count)
+        self.loading = False
+        self.update_header()
+        if not self.model.rowCount():
+            self.status_label.setText("No repositories found.")
+        
+    def fail(self, error):
+        self.loading = False
+        self.update_header()
+        self.status_label.setText(f"⚠️ Unable to fetch repositories: {error}")
 
 class GitHubSetupDialog(QDialog):
     def __init__(self, parent=None, current_token=None):
@@ -238,15 +1281,293 @@ class CreateGitHubRepoDialog(QDialog):
             'private': self.private_check.isChecked()
         }
 
+class WorkspaceDialog(QDialog):
+    """Status of every registered repository, scanned in parallel"""
+    COLUMNS = ["Repository", "Branch", "Sync", "Staged", "Modified", "Untracked", "Scan"]
+
+    def __init__(self, parent, workers, repo_paths):
+        super().__init__(parent)
+        self.setWindowTitle("🗂️ Workspace")
+        self.setModal(True)
+        self.resize(820, 480)
+        self.setStyleSheet(parent.styleSheet() if parent else "")
+        
+        self.workers = workers
+        self.repo_paths = list(repo_paths)
+        self.selected_path = None
+        
+        layout = QVBoxLayout(self)
+        
+        self.header = QLabel()
+        self.header.setStyleSheet("font-size: 16px; font-weight: bold; margin-bottom: 10px;")
+        layout.addWidget(self.header)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.doubleClicked.connect(self.open_selected)
+        layout.addWidget(self.table)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        add_btn = QPushButton("➕ Add Repository")
+        add_btn.clicked.connect(self.add_repository)
+        folder_btn = QPushButton("📁 Add Folder")
+        folder_btn.clicked.connect(self.add_folder)
+        remove_btn = QPushButton("➖ Remove")
+        remove_btn.clicked.connect(self.remove_selected)
+        rescan_btn = QPushButton("🔄 Rescan")
+        rescan_btn.clicked.connect(self.rescan)
+        open_btn = QPushButton("📂 Open")
+        open_btn.clicked.connect(self.open_selected)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        for button in (add_btn, folder_btn, remove_btn, rescan_btn, open_btn, close_btn):
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+        
+        self.rows = {}
+        for path in self.repo_paths:
+            self.add_row(path)
+        self.rescan()
+    
+    def add_row(self, path):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        name_item = QTableWidgetItem(os.path.basename(path.rstrip(os.sep)) or path)
+        name_item.setToolTip(path)
+        self.table.setItem(row, 0, name_item)
+        for column in range(1, len(self.COLUMNS)):
+            self.table.setItem(row, column, QTableWidgetItem(""))
+        self.rows[path] = row
+    
+    def rescan(self):
+        """Scan every repository; rows update as each scan completes"""
+        for row in self.rows.values():
+            self.table.item(row, len(self.COLUMNS) - 1).setText("⏳")
+        self.pending = len(self.repo_paths)
+        self.update_header()
+        self.workers.submit(
+            'workspace', scan_workspace, list(self.repo_paths),
+            on_progress=self.show_status,
+            on_result=self.on_scan_finished,
+            on_error=lambda e: self.header.setText(f"⚠️ Workspace scan failed: {e}")
+        )
+    
+    def show_status(self, status):
+        row = self.rows.get(status.path)
+        if row is None:
+            return
+        self.pending -= 1
+        scan_item = self.table.item(row, 6)
+        if status.error:
+            for column in range(1, 6):
+                self.table.item(row, column).setText("")
+            scan_item.setText("⚠️ error")
+            scan_item.setToolTip(status.error)
+            self.update_header()
+            return
+        
+        if not status.upstream:
+            sync = "—"
+        elif status.ahead or status.behind:
+            sync = " ".join(text for count, text in ((status.ahead, f"↑{status.ahead}"), (status.behind, f"↓{status.behind}")) if count)
+        else:
+            sync = "✓"
+        values = [status.branch or "(detached)", sync, status.staged, status.modified, status.untracked]
+        for column, value in enumerate(values, start=1):
+            self.table.item(row, column).setText(str(value))
+        self.table.item(row, 2).setToolTip(f"Tracking {status.upstream}" if status.upstream else "No upstream")
+        scan_item.setText(f"{status.elapsed * 1000:.0f} ms")
+        scan_item.setToolTip("")
+        
+        if status.conflicted:
+            color = QColor("#f87171")
+        elif status.behind or status.staged or status.modified:
+            color = QColor("#facc15")
+        else:
+            color = QColor("#e0e0e0")
+        for column in range(len(self.COLUMNS)):
+            self.table.item(row, column).setForeground(color)
+        self.update_header()
+    
+    def on_scan_finished(self, elapsed):
+        self.pending = 0
+        self.update_header(f" — scanned in {elapsed:.2f} s")
+    
+    def update_header(self, suffix=""):
+        count = len(self.repo_paths)
+        if self.pending:
+            suffix = f" — scanning {self.pending} of {count}..."
+        self.header.setText(f"🗂️ Workspace ({count} repositories){suffix}")
+    
+    def register(self, paths):
+        added = [path for path in paths if path not in self.rows]
+        for path in added:
+            self.repo_paths.append(path)
+            self.add_row(path)
+        if added:
+            self.rescan()
+        return added
+    
+    def add_repository(self):
+        path = QFileDialog.getExistingDirectory(self, "Select Git Repository")
+        if not path:
+            return
+        if not os.path.exists(os.path.join(path, ".git")):
+            QMessageBox.warning(self, "Workspace", "The selected directory is not a Git repository.")
+            return
+        self.register([os.path.abspath(path)])
+    
+    def add_folder(self):
+        """Register every repository directly inside a folder"""
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder of Repositories")
+        if not folder:
+            return
+        paths = []
+        for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, ".git")):
+                paths.append(os.path.abspath(entry.path))
+        if not self.register(paths):
+            QMessageBox.information(self, "Workspace", "No new repositories found in that folder.")
+    
+    def remove_selected(self):
+        rows = sorted({index.row() for index in self.table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            path = self.table.item(row, 0).toolTip()
+            self.table.removeRow(row)
+            self.repo_paths.remove(path)
+        self.rows = {path: row for row, path in enumerate(self.repo_paths)}
+        self.update_header()
+    
+    def open_selected(self):
+        row = self.table.currentRow()
+        if row < 0:
+            return
+        self.selected_path = self.table.item(row, 0).toolTip()
+        self.accept()
+
+class DiagnosticsPanel(QWidget):
+    """Rolling per-operation timings from gitdash_core's instrumentation"""
+    COLUMNS = ["Operation", "Count", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Procs/op", "KiB/op", "Failures"]
+    REFRESH_MS = 1000
+
+    def __init__(self, parent, main_window):
+        super().__init__(parent)
+        self.main_window = main_window
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+        
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        export_btn = QPushButton("💾 Export JSON...")
+        export_btn.clicked.connect(self.export)
+        reset_btn = QPushButton("🧹 Reset")
+        reset_btn.clicked.connect(self.reset)
+        button_layout.addWidget(export_btn)
+        button_layout.addWidget(reset_btn)
+        layout.addLayout(button_layout)
+        
+        # Only poll while the dock is on screen
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+    
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+    
+    def refresh(self):
+        summary = INSTRUMENTATION.summary()
+        self.table.setRowCount(len(summary))
+        for row, (name, stats) in enumerate(summary.items()):
+            values = [name, stats['count'], f"{stats['p50_ms']:.1f}", f"{stats['p95_ms']:.1f}",
+                      f"{stats['p99_ms']:.1f}", f"{stats['max_ms']:.1f}", f"{stats['processes_per_op']:g}",
+                      f"{stats['bytes_per_op'] / 1024:.1f}", stats['failures']]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+    
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Timings", "gitdash-timings.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            INSTRUMENTATION.export(path, startup_ms=self.main_window.startup_ms)
+        except OSError as e:
+            self.main_window.show_error(f"Failed to export timings: {e}")
+            return
+        self.main_window.status_bar.showMessage(f"📈 Timings exported to {path}", 3000)
+    
+    def reset(self):
+        INSTRUMENTATION.reset()
+        self.refresh()
+
 class GitDash(QMainWindow):
+    # How long a validated GitHub identity is trusted before re-checking
+    GITHUB_IDENTITY_TTL = 6 * 3600
+    DEFAULT_FETCH_INTERVAL_MIN = 10
+
+    # Jobs that only read repository state; mutating jobs cancel them. Paging
+    # ('commits') is left alone: loaded history stays valid and refresh
+    # catches up when HEAD moves
+    READ_JOBS = ('new_commits', 'branches', 'stage', 'stats')
+
+    # Jobs that don't depend on the open repository; switching repositories keeps them
+    APP_JOBS = ('github_identity', 'github_login', 'github_repos', 'workspace')
+
+    # Stage panel row kinds, in display order
+    STAGE_ROWS = {
+        'untracked': ("🆕 Untracked", Qt.GlobalColor.red),
+        'modified': ("📝 Modified", Qt.GlobalColor.yellow),
+        'staged': ("✅ Staged", Qt.GlobalColor.green),
+    }
+    # Patching rows costs a scan per row; rebuild once more than 1/ratio of the paths changed
+    STAGE_REBUILD_RATIO = 4
+    # Parsed diffs, changed-file lists and blobs, keyed by (immutable) object id
+    OBJECT_CACHE_BYTES = 64 * 1024 * 1024
+    DIFF_STATUS = {'A': "🆕", 'M': "📝", 'D': "🗑️", 'R': "🔀", 'C': "📄", 'T': "🔁"}
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("GitDash - Git GUI Dashboard")
         self.resize(1200, 800)
         self.repo = None
+        self.stats_engine = None
+        self.status_snapshot = StatusSnapshot()
+        self.stage_items = {}
+        self.stage_group_sizes = dict.fromkeys(self.STAGE_ROWS, 0)
+        self.commit_count = None
+        self.branch_count = None
+        self.workers = RepoWorkerPool(self)
+        self.remote_operation = None
         self.github_manager = GitHubManager()
+        self.fetch_scheduler = FetchScheduler(
+            self.workers, self.github_manager, lambda: self.remote_operation is not None, self
+        )
+        self.fetch_scheduler.fetched.connect(self.on_background_fetch)
+        self.fetch_scheduler.failed.connect(self.on_background_fetch_failed)
         self.config_dir = os.path.expanduser("~/.gitdash")
         self.config_file = os.path.join(self.config_dir, "config.json")
+        self.config = {}
         self.load_config()
         
         # Apply modern dark theme
@@ -290,16 +1611,16 @@ class GitDash(QMainWindow):
                 background-color: #555555;
                 color: #999999;
             }
-            QTreeWidget, QListWidget {
+            QTreeWidget, QTableView, QListWidget {
                 background-color: #252526;
                 border: 1px solid #3e3e42;
                 border-radius: 4px;
                 outline: none;
             }
-            QTreeWidget::item:selected, QListWidget::item:selected {
+            QTreeWidget::item:selected, QTableView::item:selected, QListWidget::item:selected {
                 background-color: #094771;
             }
-            QTreeWidget::item:hover, QListWidget::item:hover {
+            QTreeWidget::item:hover, QTableView::item:hover, QListWidget::item:hover {
                 background-color: #2a2d2e;
             }
             QTabWidget::pane {
@@ -423,67 +1744,65 @@ class GitDash(QMainWindow):
         commit_header.setStyleSheet("font-size: 16px; font-weight: bold; color: #ffffff; margin-bottom: 10px;")
         commit_layout.addWidget(commit_header)
         
-        self.commit_tree = QTreeWidget()
-        self.commit_tree.setHeaderLabels(["Hash", "Message", "Author", "Date"])
-        self.commit_tree.setRootIsDecorated(False)
+        # Model/view history: pages are fetched as the user scrolls
+        # (a table view only asks for more rows once the last row is visible)
+        self.commit_model = CommitLogModel(self.workers, os.path.join(self.config_dir, "cache", "history"), self)
+        self.commit_tree = QTableView()
+        self.commit_tree.setModel(self.commit_model)
+        self.commit_tree.setShowGrid(False)
+        self.commit_tree.setWordWrap(False)
         self.commit_tree.setAlternatingRowColors(True)
-        commit_layout.addWidget(self.commit_tree)
+        self.commit_tree.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.commit_tree.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.commit_tree.verticalHeader().hide()
+        self.commit_tree.verticalHeader().setDefaultSectionSize(24)
+        self.commit_tree.horizontalHeader().setStretchLastSection(True)
+        self.commit_tree.setItemDelegateForColumn(0, CommitGraphDelegate(self.commit_tree))
+        self.commit_tree.setColumnWidth(0, 8 * CommitGraphDelegate.LANE_WIDTH)
+        self.commit_tree.setColumnWidth(1, 80)
+        self.commit_tree.setColumnWidth(2, 360)
+        self.commit_tree.setColumnWidth(3, 140)
+        self.commit_model.rowsInserted.connect(self.keep_commit_scroll)
+        self.commit_model.rowsRemoved.connect(lambda parent, first, last: self.keep_commit_scroll(parent, first, last, removed=True))
+        self.commit_model.modelReset.connect(self.clear_commit_diff)
+        self.commit_tree.selectionModel().currentRowChanged.connect(self.on_commit_selected)
+        
+        # Diff of the selected commit: changed files on the left, patch on the right
+        self.object_cache = LRUCache(self.OBJECT_CACHE_BYTES)
+        self.shown_commit = None
+        diff_panel = QWidget()
+        diff_layout = QVBoxLayout(diff_panel)
+        diff_layout.setContentsMargins(0, 6, 0, 0)
+        diff_header = QHBoxLayout()
+        self.commit_info_label = QLabel("Select a commit to see its changes")
+        self.commit_info_label.setStyleSheet("color: #7dd3fc;")
+        diff_header.addWidget(self.commit_info_label, 1)
+        self.full_file_check = QCheckBox("📄 Full file")
+        self.full_file_check.toggled.connect(self.show_selected_file)
+        diff_header.addWidget(self.full_file_check)
+        diff_layout.addLayout(diff_header)
+        
+        diff_splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.commit_files = QListWidget()
+        self.commit_files.currentItemChanged.connect(self.show_selected_file)
+        diff_splitter.addWidget(self.commit_files)
+        self.diff_view = DiffView()
+        diff_splitter.addWidget(self.diff_view)
+        diff_splitter.setSizes([220, 480])
+        diff_layout.addWidget(diff_splitter)
+        
+        commit_splitter = QSplitter(Qt.Orientation.Vertical)
+        commit_splitter.addWidget(self.commit_tree)
+        commit_splitter.addWidget(diff_panel)
+        commit_splitter.setSizes([320, 280])
+        commit_layout.addWidget(commit_splitter)
         self.tabs.addTab(self.commit_tab, "📜 Commits")
 
-        # Branches Tab
+        # Branches Tab (built the first time it is shown)
         self.branch_tab = QWidget()
-        branch_layout = QVBoxLayout(self.branch_tab)
-        branch_layout.setContentsMargins(10, 10, 10, 10)
-        
-        branch_header = QLabel("🌿 Branch Management")
-        branch_header.setStyleSheet("font-size: 16px; font-weight: bold; color: #ffffff; margin-bottom: 10px;")
-        branch_layout.addWidget(branch_header)
-        
-        self.current_branch_label = QLabel("Current Branch: None")
-        self.current_branch_label.setStyleSheet("font-size: 14px; color: #7dd3fc; margin-bottom: 10px;")
-        branch_layout.addWidget(self.current_branch_label)
-        
-        # Remote info
-        self.remote_info_label = QLabel("Remote: Not configured")
-        self.remote_info_label.setStyleSheet("font-size: 12px; color: #fbbf24; margin-bottom: 10px;")
-        branch_layout.addWidget(self.remote_info_label)
-
-        self.branch_list = QListWidget()
-        branch_layout.addWidget(self.branch_list)
-
-        branch_btns = QHBoxLayout()
-        branch_btns.setSpacing(10)
-        
-        create_branch_btn = QPushButton("➕ Create Branch")
-        create_branch_btn.clicked.connect(self.create_branch)
-        branch_btns.addWidget(create_branch_btn)
-
-        delete_branch_btn = QPushButton("🗑️ Delete Branch")
-        delete_branch_btn.clicked.connect(self.delete_branch)
-        delete_branch_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #d73a49;
-            }
-            QPushButton:hover {
-                background-color: #cb2431;
-            }
-        """)
-        branch_btns.addWidget(delete_branch_btn)
-
-        checkout_btn = QPushButton("✔️ Checkout")
-        checkout_btn.clicked.connect(self.checkout_branch)
-        checkout_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2ea043;
-            }
-            QPushButton:hover {
-                background-color: #238636;
-            }
-        """)
-        branch_btns.addWidget(checkout_btn)
-
-        branch_layout.addLayout(branch_btns)
+        self.branch_list = None
         self.tabs.addTab(self.branch_tab, "🌿 Branches")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
         # Right side - Staging Area
         self.stage_widget = QWidget()
@@ -556,6 +1875,16 @@ class GitDash(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Ready")
         
+        # Progress of the running push/pull/fetch, with a way to abort it
+        self.remote_progress = QProgressBar()
+        self.remote_progress.setMaximumWidth(220)
+        self.remote_progress.hide()
+        self.status_bar.addPermanentWidget(self.remote_progress)
+        self.cancel_remote_btn = QPushButton("⏹️ Cancel")
+        self.cancel_remote_btn.clicked.connect(self.cancel_remote_operation)
+        self.cancel_remote_btn.hide()
+        self.status_bar.addPermanentWidget(self.cancel_remote_btn)
+        
         # Add repository stats to status bar
         self.stats_label = QLabel("")
         self.status_bar.addPermanentWidget(self.stats_label)
@@ -564,13 +1893,128 @@ class GitDash(QMainWindow):
         self.github_status_label = QLabel("GitHub: Not connected")
         self.status_bar.addPermanentWidget(self.github_status_label)
 
-        # Timer for auto-refresh (optional)
-        self.auto_refresh_timer = QTimer()
-        self.auto_refresh_timer.timeout.connect(self.update_stats)
-        self.auto_refresh_timer.start(5000)  # Update every 5 seconds
+        # Refresh panels when the repository changes on disk (no polling)
+        self.repo_watcher = RepoWatcher(self)
+        self.repo_watcher.changed.connect(self.on_repo_changed)
         
         # Update toolbar based on config
         self.update_github_ui()
+        
+        # Time to first paint, reported in the status bar once the window is up
+        self.startup_ms = None
+        self.diagnostics_dock = None
+        self.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self and event.type() == QEvent.Type.Paint and self.startup_ms is None:
+            self.startup_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+            INSTRUMENTATION.record("startup (first paint)", self.startup_ms)
+            self.removeEventFilter(self)
+            QTimer.singleShot(0, self.report_startup_time)
+        return super().eventFilter(obj, event)
+
+    def report_startup_time(self):
+        if self.status_bar.currentMessage() == "Ready":
+            self.status_bar.showMessage(f"Ready ({self.startup_ms:.0f} ms to first paint)")
+
+    def build_branch_tab(self):
+        """Build the Branches tab; it is not visible at startup"""
+        branch_layout = QVBoxLayout(self.branch_tab)
+        branch_layout.setContentsMargins(10, 10, 10, 10)
+        
+        branch_header = QLabel("🌿 Branch Management")
+        branch_header.setStyleSheet("font-size: 16px; font-weight: bold; color: #ffffff; margin-bottom: 10px;")
+        branch_layout.addWidget(branch_header)
+        
+        self.current_branch_label = QLabel("Current Branch: None")
+        self.current_branch_label.setStyleSheet("font-size: 14px; color: #7dd3fc; margin-bottom: 10px;")
+        branch_layout.addWidget(self.current_branch_label)
+        
+        # Remote info
+        self.remote_info_label = QLabel("Remote: Not configured")
+        self.remote_info_label.setStyleSheet("font-size: 12px; color: #fbbf24; margin-bottom: 10px;")
+        branch_layout.addWidget(self.remote_info_label)
+
+        # Type-ahead over every ref: prefix matches first, then fuzzy ones
+        filter_layout = QHBoxLayout()
+        self.branch_filter = QLineEdit()
+        self.branch_filter.setPlaceholderText("Filter branches and tags...")
+        filter_layout.addWidget(self.branch_filter)
+        self.branch_kind = QComboBox()
+        for label, kind in (("All refs", None), ("🌿 Local", 'local'), ("☁️ Remote", 'remote'), ("🏷️ Tags", 'tag')):
+            self.branch_kind.addItem(label, kind)
+        filter_layout.addWidget(self.branch_kind)
+        branch_layout.addLayout(filter_layout)
+        
+        self.ref_index = None
+        self.ref_index_path = None
+        self.ref_model = RefListModel(self)
+        self.branch_filter.textChanged.connect(self.ref_model.set_query)
+        self.branch_kind.currentIndexChanged.connect(
+            lambda index: self.ref_model.set_kind(self.branch_kind.itemData(index)))
+        self.branch_list = QTableView()
+        self.branch_list.setModel(self.ref_model)
+        self.branch_list.setShowGrid(False)
+        self.branch_list.setWordWrap(False)
+        self.branch_list.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.branch_list.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.branch_list.verticalHeader().hide()
+        self.branch_list.verticalHeader().setDefaultSectionSize(24)
+        self.branch_list.horizontalHeader().setStretchLastSection(True)
+        self.branch_list.horizontalHeader().setSortIndicatorShown(False)
+        self.branch_list.horizontalHeader().sectionClicked.connect(self.sort_branches)
+        self.branch_list.setColumnWidth(0, 320)
+        self.branch_list.setColumnWidth(1, 130)
+        self.branch_list.setColumnWidth(2, 140)
+        self.branch_list.doubleClicked.connect(lambda index: self.checkout_branch())
+        # Remember the chosen ref so it is selected again once a filter lets it back in
+        self.chosen_ref = None
+        self.branch_list.selectionModel().currentRowChanged.connect(self.on_ref_chosen)
+        self.ref_model.layoutChanged.connect(self.restore_chosen_ref)
+        branch_layout.addWidget(self.branch_list)
+        
+        self.branch_count_label = QLabel()
+        self.branch_count_label.setStyleSheet("color: #7dd3fc;")
+        branch_layout.addWidget(self.branch_count_label)
+
+        branch_btns = QHBoxLayout()
+        branch_btns.setSpacing(10)
+        
+        create_branch_btn = QPushButton("➕ Create Branch")
+        create_branch_btn.clicked.connect(self.create_branch)
+        branch_btns.addWidget(create_branch_btn)
+
+        delete_branch_btn = QPushButton("🗑️ Delete Branch")
+        delete_branch_btn.clicked.connect(self.delete_branch)
+        delete_branch_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #d73a49;
+            }
+            QPushButton:hover {
+                background-color: #cb2431;
+            }
+        """)
+        branch_btns.addWidget(delete_branch_btn)
+
+        checkout_btn = QPushButton("✔️ Checkout")
+        checkout_btn.clicked.connect(self.checkout_branch)
+        checkout_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2ea043;
+            }
+            QPushButton:hover {
+                background-color: #238636;
+            }
+        """)
+        branch_btns.addWidget(checkout_btn)
+
+        branch_layout.addLayout(branch_btns)
+
+    def on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.branch_tab and self.branch_list is None:
+            self.build_branch_tab()
+            self.update_remote_actions()
+            self.load_branches()
 
     def create_menu_bar(self):
         menubar = self.menuBar()
@@ -579,6 +2023,7 @@ class GitDash(QMainWindow):
         file_menu = menubar.addMenu("File")
         file_menu.addAction("📂 Open Repository", self.open_repo)
         file_menu.addAction("🆕 Create Repository", self.create_repo)
+        file_menu.addAction("🗂️ Workspace", self.show_workspace)
         file_menu.addSeparator()
         file_menu.addAction("🚪 Exit", self.close)
         
@@ -589,9 +2034,11 @@ class GitDash(QMainWindow):
         github_menu.addAction("🔐 Test Push Authentication", self.test_github_push_auth)
         github_menu.addSeparator()
         github_menu.addAction("📋 View My Repos", self.view_github_repos)
+        github_menu.addAction("⏱️ Auto-fetch Interval...", self.set_fetch_interval)
         
         # Help menu
         help_menu = menubar.addMenu("Help")
+        help_menu.addAction("📈 Performance Diagnostics", self.show_diagnostics)
         help_menu.addAction("📖 About", self.show_about)
 
     def create_toolbar(self):
@@ -613,6 +2060,11 @@ class GitDash(QMainWindow):
         self.pull_action.triggered.connect(self.pull_from_github)
         self.pull_action.setEnabled(False)
         
+        # Fetch action
+        self.fetch_action = toolbar.addAction("📥 Fetch")
+        self.fetch_action.triggered.connect(self.fetch_from_github)
+        self.fetch_action.setEnabled(False)
+        
         # Push action
         self.push_action = toolbar.addAction("⬆️ Push")
         self.push_action.triggered.connect(self.push_to_github)
@@ -629,66 +2081,192 @@ class GitDash(QMainWindow):
         if os.path.exists(self.config_file):
             try:
                 with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    if 'github_token' in config:
-                        self.github_manager.set_token(config['github_token'])
+                    self.config = json.load(f)
+                    if 'github_token' in self.config:
+                        self.github_manager.set_token(self.config['github_token'])
             except:
                 pass
     
     def save_config(self):
         """Save configuration to file"""
         os.makedirs(self.config_dir, exist_ok=True)
-        config = {}
-        if self.github_manager.token:
-            config['github_token'] = self.github_manager.token
         with open(self.config_file, 'w') as f:
-            json.dump(config, f)
+            json.dump(self.config, f)
+    
+    def token_fingerprint(self):
+        """Short hash identifying the current token (the cache never stores it twice)"""
+        token = self.github_manager.token or ""
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
     
     def update_github_ui(self):
-        """Update UI based on GitHub connection status"""
+        """Update UI based on GitHub connection status.
+
+        The last validated identity is shown straight from the config; the
+        network check runs in the background once it is older than the TTL.
+        """
         if self.github_manager.token and GITHUB_AVAILABLE:
-            success, message = self.github_manager.test_connection()
-            if success:
-                self.github_status_label.setText(f"GitHub: ✅ {message.split('(')[1].strip(')')}")
+            identity = self.config.get('github_identity')
+            if identity and identity.get('token') == self.token_fingerprint():
+                self.github_status_label.setText(f"GitHub: ✅ {identity['name'] or identity['login']}")
             else:
-                self.github_status_label.setText("GitHub: ❌ Invalid token")
+                identity = None
+                self.github_status_label.setText("GitHub: 🔄 Checking...")
+            expired = not identity or time.time() - identity.get('validated_at', 0) > self.GITHUB_IDENTITY_TTL
+            if expired:
+                # Deferred so the window paints before any network traffic
+                QTimer.singleShot(0, self.check_github_identity)
         else:
             self.github_status_label.setText("GitHub: Not connected")
         
         # Update push/pull availability
         self.update_remote_actions()
     
+    def check_github_identity(self):
+        """Validate the token in the background and cache the identity"""
+        if not self.github_manager.token:
+            return
+        fingerprint = self.token_fingerprint()
+        self.workers.submit(
+            'github_identity', read_github_identity, self.github_manager,
+            on_result=lambda identity: self.on_github_identity(fingerprint, identity),
+            on_error=self.on_github_identity_failed
+        )
+    
+    def on_github_identity(self, fingerprint, identity):
+        if fingerprint != self.token_fingerprint():
+            return  # Token changed while checking
+        login, name = identity
+        self.config['github_identity'] = {
+            'token': fingerprint,
+            'login': login,
+            'name': name,
+            'validated_at': time.time()
+        }
+        self.save_config()
+        self.github_status_label.setText(f"GitHub: ✅ {name or login}")
+    
+    def on_github_identity_failed(self, error):
+        if getattr(error, 'status', None) in (401, 403):
+            self.config.pop('github_identity', None)
+            self.save_config()
+            self.github_status_label.setText("GitHub: ❌ Invalid token")
+        elif self.config.get('github_identity', {}).get('token') == self.token_fingerprint():
+            # Network trouble: keep showing the last known identity
+            identity = self.config['github_identity']
+            self.github_status_label.setText(f"GitHub: ⚠️ {identity['name'] or identity['login']} (offline)")
+        else:
+            self.github_status_label.setText("GitHub: ⚠️ Unable to verify token")
+    
     def update_remote_actions(self):
         """Enable/disable push/pull based on remote availability"""
         has_remote = False
+        remote_text = "Remote: Not configured"
         if self.repo:
             try:
                 has_remote = 'origin' in self.repo.remotes
                 if has_remote:
                     origin = self.repo.remotes.origin
-                    self.remote_info_label.setText(f"Remote: {origin.url}")
-                else:
-                    self.remote_info_label.setText("Remote: Not configured")
+                    remote_text = f"Remote: {origin.url}"
             except:
-                self.remote_info_label.setText("Remote: Not configured")
-        
-        self.push_action.setEnabled(has_remote)
-        self.pull_action.setEnabled(has_remote)
+                pass
+        if self.branch_list is not None:
+            self.remote_info_label.setText(remote_text)
+        
+        # Keep push/pull/fetch disabled while one of them is running
+        busy = self.remote_operation is not None
+        self.push_action.setEnabled(has_remote and not busy)
+        self.pull_action.setEnabled(has_remote and not busy)
+        self.fetch_action.setEnabled(has_remote and not busy)
 
     def update_stats(self):
         """Update repository statistics in status bar"""
-        if self.repo:
-            try:
-                # Count commits
-                commit_count = len(list(self.repo.iter_commits()))
-                # Count branches
-                branch_count = len(list(self.repo.branches))
-                # Count modified files
-                modified_count = len(self.repo.index.diff(None))
-                
-                self.stats_label.setText(f"📊 {commit_count} commits | 🌿 {branch_count} branches | 📝 {modified_count} modified")
-            except:
-                pass
+        if not self.repo:
+            return
+        # Skip timer ticks while a previous count is still running
+        if self.workers.is_busy('stats'):
+            return
+        if self.stats_engine is None or self.stats_engine.repo_path != self.repo.working_dir:
+            self.stats_engine = RepoStatsEngine(self.repo.working_dir)
+        self.workers.submit('stats', read_stats, self.stats_engine, on_result=self.show_stats)
+
+    def show_stats(self, stats):
+        self.commit_count, self.branch_count = stats
+        self.update_stats_label()
+
+    def update_stats_label(self):
+        if self.commit_count is None:
+            return
+        # Modified count comes from the shared status snapshot
+        modified_count = len(self.status_snapshot.unstaged)
+        self.stats_label.setText(f"📊 {self.commit_count} commits | 🌿 {self.branch_count} branches | 📝 {modified_count} modified")
+
+    def on_repo_changed(self, panels):
+        """Refresh only the panels whose inputs changed on disk"""
+        if not self.repo:
+            return
+        if 'commits' in panels and read_head_sha(self.repo.git_dir) != self.commit_model.head_sha:
+            self.load_commits()
+        if 'branches' in panels:
+            self.load_branches()
+        if 'stage' in panels:
+            self.load_stage_changes()
+        if 'stats' in panels:
+            self.update_stats()
+        if 'remote' in panels:
+            self.update_remote_actions()
+            self.schedule_fetches()
+
+    def watch_repo(self):
+        """(Re)start the file watcher for the current repository"""
+        self.repo_watcher.clear()
+        if not self.repo:
+            return
+        work_dir, git_dir = self.repo.working_dir, self.repo.git_dir
+        self.workers.submit(
+            'watch', list_worktree_files, work_dir,
+            on_result=lambda paths: self.repo_watcher.watch(work_dir, git_dir, paths)
+        )
+        self.schedule_fetches()
+
+    def schedule_fetches(self):
+        """(Re)start background fetching if the current repository has an origin"""
+        try:
+            has_remote = self.repo is not None and 'origin' in self.repo.remotes
+        except Exception:
+            has_remote = False
+        if not has_remote:
+            self.fetch_scheduler.stop()
+            return
+        minutes = self.config.get('fetch_interval_minutes', self.DEFAULT_FETCH_INTERVAL_MIN)
+        self.fetch_scheduler.start(self.repo.working_dir, minutes * 60)
+
+    def on_background_fetch(self, result):
+        # Ahead/behind counts depend on the remote-tracking refs just updated
+        self.load_branches()
+
+    def on_background_fetch_failed(self, error):
+        # Keep quiet beyond the status bar; the scheduler backs off and retries
+        lines = [line.strip(" '") for line in str(error).splitlines() if line.strip(" '")]
+        reason = next((line[line.index("fatal:"):] for line in lines if "fatal:" in line), lines[-1] if lines else "")
+        self.status_bar.showMessage(f"⚠️ Background fetch failed: {reason}", 5000)
+
+    def set_fetch_interval(self):
+        """Ask for the background fetch interval (0 turns it off)"""
+        minutes, ok = QInputDialog.getInt(
+            self, "Auto-fetch Interval", "Fetch origin every N minutes (0 = off):",
+            self.config.get('fetch_interval_minutes', self.DEFAULT_FETCH_INTERVAL_MIN), 0, 1440
+        )
+        if ok:
+            self.config['fetch_interval_minutes'] = minutes
+            self.save_config()
+            self.schedule_fetches()
+
+    def changeEvent(self, event):
+        # Large worktrees are only partly watched; rescan when the user comes back
+        if (event.type() == QEvent.Type.ActivationChange and self.isActiveWindow()
+                and self.repo and self.repo_watcher.partial):
+            self.repo_watcher.mark_dirty({'stage'})
+        super().changeEvent(event)
 
     # ==== GitHub Integration Methods ====
     
@@ -699,10 +2277,12 @@ class GitDash(QMainWindow):
         if dialog.exec():
             token = dialog.get_token()
             if token:
-                self.github_manager = GitHubManager(token)
+                # Keep the one long-lived client, just switch its token
+                self.github_manager.set_token(token)
                 
                 # Save token if requested
                 if dialog.should_save_token():
+                    self.config['github_token'] = token
                     self.save_config()
                 
                 self.status_bar.showMessage("✅ GitHub connected successfully!")
@@ -751,7 +2331,7 @@ class GitDash(QMainWindow):
                     self.repo.create_remote('origin', result)
                     
                     # Push existing commits if any
-                    if list(self.repo.iter_commits()):
+                    if self.repo.head.is_valid():
                         reply = QMessageBox.question(
                             self, 
                             "Push Existing Commits?",
@@ -778,39 +2358,17 @@ class GitDash(QMainWindow):
             self.show_error("Please setup GitHub first (GitHub → Setup GitHub)")
             return
         
-        repos = self.github_manager.get_user_repos()
-        if not repos:
-            self.show_info("No repositories found or unable to fetch repositories.")
-            return
-        
-        # Create a simple dialog to show repos
-        dialog = QDialog(self)
-        dialog.setWindowTitle("📋 My GitHub Repositories")
-        dialog.setModal(True)
-        dialog.resize(600, 400)
-        dialog.setStyleSheet(self.styleSheet())
-        
-        layout = QVBoxLayout(dialog)
-        
-        header = QLabel(f"📋 Your GitHub Repositories ({len(repos)})")
-        header.setStyleSheet("font-size: 16px; font-weight: bold; margin-bottom: 10px;")
-        layout.addWidget(header)
-        
-        repo_list = QListWidget()
-        for repo in repos:
-            item_text = f"📦 {repo['name']}"
-            if repo['private']:
-                item_text += " 🔒"
-            if repo['description']:
-                item_text += f"\n   {repo['description']}"
-            repo_list.addItem(item_text)
-        layout.addWidget(repo_list)
-        
-        close_btn = QPushButton("Close")
-        close_btn.clicked.connect(dialog.accept)
-        layout.addWidget(close_btn)
-        
+        # Show the cached listing at once, then revalidate it page by page
+        cache_path = os.path.join(self.config_dir, "cache", f"repos_{self.token_fingerprint()}.json")
+        dialog = GitHubReposDialog(self, load_repo_cache(cache_path))
+        self.workers.submit(
+            'github_repos', stream_github_repos, self.github_manager, cache_path,
+            on_progress=dialog.add_page,
+            on_result=dialog.finish,
+            on_error=dialog.fail
+        )
         dialog.exec()
+        self.workers.cancel('github_repos')
     
     def test_github_push_auth(self):
         """Test if we can authenticate for push operations"""
@@ -822,30 +2380,26 @@ class GitDash(QMainWindow):
             self.show_error("Please open a repository with a GitHub remote first")
             return
         
-        try:
-            # Test token
-            g = Github(self.github_manager.token)
-            user = g.get_user()
-            
-            # Get remote info
-            origin = self.repo.remotes.origin
-            remote_url = origin.url
-            
-            info = f"✅ Authentication Test Results:\n\n"
-            info += f"GitHub User: {user.login}\n"
-            info += f"Remote URL: {remote_url}\n"
-            info += f"Token: {'✓ Valid' if self.github_manager.token else '✗ Missing'}\n\n"
-            
-            if remote_url.startswith('https://'):
-                info += "Using HTTPS (token authentication)\n"
-            elif remote_url.startswith('git@'):
-                info += "Using SSH (key authentication)\n"
-                info += "⚠️ Note: GitDash uses token auth, consider using HTTPS URLs\n"
-            
-            self.show_info(info)
-            
-        except Exception as e:
-            self.show_error(f"Authentication test failed:\n{str(e)}")
+        remote_url = self.repo.remotes.origin.url
+        self.workers.submit(
+            'github_login', read_github_login, self.github_manager,
+            on_result=lambda login: self.show_push_auth_result(login, remote_url),
+            on_error=lambda e: self.show_error(f"Authentication test failed:\n{str(e)}")
+        )
+    
+    def show_push_auth_result(self, login, remote_url):
+        info = "✅ Authentication Test Results:\n\n"
+        info += f"GitHub User: {login}\n"
+        info += f"Remote URL: {remote_url}\n"
+        info += f"Token: {'✓ Valid' if self.github_manager.token else '✗ Missing'}\n\n"
+        
+        if remote_url.startswith('https://'):
+            info += "Using HTTPS (token authentication)\n"
+        elif remote_url.startswith('git@'):
+            info += "Using SSH (key authentication)\n"
+            info += "⚠️ Note: GitDash uses token auth, consider using HTTPS URLs\n"
+        
+        self.show_info(info)
     
     def push_to_github(self):
         """Push commits to GitHub"""
@@ -855,7 +2409,7 @@ class GitDash(QMainWindow):
         
         try:
             # Check if there are commits to push
-            if not list(self.repo.iter_commits()):
+            if not self.repo.head.is_valid():
                 self.show_error("No commits to push. Make some commits first!")
                 return
             
@@ -870,88 +2424,50 @@ class GitDash(QMainWindow):
             except:
                 self.show_error("No active branch found")
                 return
-            
-            # Get remote URL and configure auth
-            origin = self.repo.remotes.origin
-            original_url = origin.url
-            
-            self.status_bar.showMessage(f"⬆️ Pushing to GitHub...")
-            QApplication.processEvents()
-            
-            # Configure authentication for HTTPS
-            if original_url.startswith('https://') and self.github_manager and self.github_manager.token:
-                try:
-                    # Get GitHub username
-                    g = Github(self.github_manager.token)
-                    user = g.get_user()
-                    username = user.login
-                    
-                    # Create authenticated URL
-                    parsed = urllib.parse.urlparse(original_url)
-                    auth_url = f"https://{username}:{self.github_manager.token}@{parsed.netloc}{parsed.path}"
-                    
-                    # Set the authenticated URL temporarily
-                    with origin.config_writer as cw:
-                        cw.set("url", auth_url)
-                    
-                except Exception as e:
-                    self.show_error(f"Failed to configure authentication: {str(e)}")
-                    return
-            
-            try:
-                # Disable buttons
-                self.push_action.setEnabled(False)
-                self.pull_action.setEnabled(False)
-                
-                # Push with set-upstream
-                self.status_bar.showMessage(f"⬆️ Pushing branch '{current_branch}' to origin...")
-                QApplication.processEvents()
-                
-                # Use git command directly
-                push_output = self.repo.git.push('--set-upstream', 'origin', current_branch, '--porcelain')
-                
-                # Restore original URL
-                if original_url.startswith('https://'):
-                    with origin.config_writer as cw:
-                        cw.set("url", original_url)
-                
-                self.status_bar.showMessage(f"✅ Successfully pushed to origin/{current_branch}")
-                self.show_info(f"Push successful!\n\nBranch '{current_branch}' has been pushed to GitHub.")
-                self.refresh_ui()
-                
-            except GitCommandError as e:
-                # Restore original URL even on error
-                if original_url.startswith('https://'):
-                    with origin.config_writer as cw:
-                        cw.set("url", original_url)
-                
-                error_msg = str(e)
-                if "authentication failed" in error_msg.lower():
-                    self.show_error(
-                        "Authentication failed!\n\n"
-                        "This usually means:\n"
-                        "1. Your GitHub token is invalid or expired\n"
-                        "2. The token doesn't have 'repo' permissions\n"
-                        "3. The repository doesn't exist on GitHub\n\n"
-                        "Please check your GitHub token in GitHub → Setup GitHub"
-                    )
-                elif "permission denied" in error_msg.lower():
-                    self.show_error("Permission denied. Check that your token has 'repo' scope.")
-                elif "remote contains work" in error_msg.lower():
-                    self.show_error("The remote repository has changes you don't have locally.\nTry pulling first.")
-                elif "failed to push" in error_msg.lower():
-                    self.show_error(f"Push failed. Make sure:\n1. You have internet connection\n2. The GitHub repo exists\n3. Your token is valid\n\nError: {error_msg}")
-                else:
-                    self.show_error(f"Push failed:\n{error_msg}")
-            finally:
-                # Always re-enable buttons
-                self.push_action.setEnabled(True)
-                self.pull_action.setEnabled(True)
-                
         except Exception as e:
             self.show_error(f"Unexpected error during push:\n{str(e)}\n\nType: {type(e).__name__}")
-            self.push_action.setEnabled(True)
-            self.pull_action.setEnabled(True)
+            return
+        
+        self.start_remote_operation(
+            'push', push_branch, current_branch,
+            message=f"⬆️ Pushing branch '{current_branch}' to origin...",
+            on_result=lambda result: self.on_push_finished(current_branch, result),
+            on_error=self.on_push_failed,
+            supersedes=('auto_fetch',)
+        )
+    
+    def on_push_finished(self, current_branch, result):
+        self.finish_remote_operation()
+        output, transfer = result
+        self.status_bar.showMessage(f"✅ Successfully pushed to origin/{current_branch}{self.format_transfer(transfer)}")
+        self.show_info(f"Push successful!\n\nBranch '{current_branch}' has been pushed to GitHub.")
+        self.refresh_ui()
+    
+    def on_push_failed(self, error):
+        # Always re-enable buttons
+        self.finish_remote_operation()
+        if not isinstance(error, GitError):
+            self.show_error(f"Unexpected error during push:\n{str(error)}\n\nType: {type(error).__name__}")
+            return
+        
+        error_msg = str(error)
+        if "authentication failed" in error_msg.lower():
+            self.show_error(
+                "Authentication failed!\n\n"
+                "This usually means:\n"
+                "1. Your GitHub token is invalid or expired\n"
+                "2. The token doesn't have 'repo' permissions\n"
+                "3. The repository doesn't exist on GitHub\n\n"
+                "Please check your GitHub token in GitHub → Setup GitHub"
+            )
+        elif "permission denied" in error_msg.lower():
+            self.show_error("Permission denied. Check that your token has 'repo' scope.")
+        elif "remote contains work" in error_msg.lower():
+            self.show_error("The remote repository has changes you don't have locally.\nTry pulling first.")
+        elif "failed to push" in error_msg.lower():
+            self.show_error(f"Push failed. Make sure:\n1. You have internet connection\n2. The GitHub repo exists\n3. Your token is valid\n\nError: {error_msg}")
+        else:
+            self.show_error(f"Push failed:\n{error_msg}")
     
     def pull_from_github(self):
         """Pull changes from GitHub"""
@@ -965,8 +2481,8 @@ class GitDash(QMainWindow):
                 self.show_error("No remote 'origin' configured")
                 return
             
-            # Check for uncommitted changes
-            if self.repo.is_dirty():
+            # Check for uncommitted changes (from the last status snapshot)
+            if self.status_snapshot.unstaged or self.status_snapshot.staged:
                 reply = QMessageBox.question(
                     self,
                     "Uncommitted Changes",
@@ -977,81 +2493,135 @@ class GitDash(QMainWindow):
                 if reply != QMessageBox.StandardButton.Yes:
                     return
             
-            # Get remote URL and configure auth
-            origin = self.repo.remotes.origin
-            original_url = origin.url
-            
-            self.status_bar.showMessage("⬇️ Pulling from GitHub...")
-            QApplication.processEvents()
-            
-            # Configure authentication for HTTPS
-            if original_url.startswith('https://') and self.github_manager and self.github_manager.token:
-                try:
-                    # Get GitHub username
-                    g = Github(self.github_manager.token)
-                    user = g.get_user()
-                    username = user.login
-                    
-                    # Create authenticated URL
-                    parsed = urllib.parse.urlparse(original_url)
-                    auth_url = f"https://{username}:{self.github_manager.token}@{parsed.netloc}{parsed.path}"
-                    
-                    # Set the authenticated URL temporarily
-                    with origin.config_writer as cw:
-                        cw.set("url", auth_url)
-                    
-                except Exception as e:
-                    self.show_error(f"Failed to configure authentication: {str(e)}")
-                    return
-            
-            try:
-                # Disable buttons
-                self.push_action.setEnabled(False)
-                self.pull_action.setEnabled(False)
-                
-                # Pull
-                current_branch = self.repo.active_branch.name
-                self.status_bar.showMessage(f"⬇️ Pulling branch '{current_branch}' from origin...")
-                QApplication.processEvents()
-                
-                # Use git command directly
-                pull_output = self.repo.git.pull('origin', current_branch)
-                
-                # Restore original URL
-                if original_url.startswith('https://'):
-                    with origin.config_writer as cw:
-                        cw.set("url", original_url)
-                
-                self.status_bar.showMessage("✅ Pull completed successfully")
-                if "Already up to date" in pull_output:
-                    self.show_info("Already up to date!")
-                else:
-                    self.show_info(f"Pull successful!\n\nChanges pulled from GitHub:\n{pull_output}")
-                self.refresh_ui()
-                
-            except GitCommandError as e:
-                # Restore original URL even on error
-                if original_url.startswith('https://'):
-                    with origin.config_writer as cw:
-                        cw.set("url", original_url)
-                
-                error_msg = str(e)
-                if "authentication failed" in error_msg.lower():
-                    self.show_error("Authentication failed! Please check your GitHub token.")
-                elif "merge conflict" in error_msg.lower():
-                    self.show_error("Merge conflict detected! You need to resolve conflicts manually.")
-                else:
-                    self.show_error(f"Pull failed:\n{error_msg}")
-            finally:
-                # Always re-enable buttons
-                self.push_action.setEnabled(True)
-                self.pull_action.setEnabled(True)
-                
+            current_branch = self.repo.active_branch.name
         except Exception as e:
             self.show_error(f"Unexpected error during pull:\n{str(e)}")
-            self.push_action.setEnabled(True)
-            self.pull_action.setEnabled(True)
+            return
+        
+        self.start_remote_operation(
+            'pull', pull_branch, current_branch,
+            message=f"⬇️ Pulling branch '{current_branch}' from origin...",
+            on_result=self.on_pull_finished,
+            on_error=self.on_pull_failed,
+            exclusive=True
+        )
+    
+    def on_pull_finished(self, result):
+        self.finish_remote_operation()
+        pull_output, transfer = result
+        self.status_bar.showMessage(f"✅ Pull completed successfully{self.format_transfer(transfer)}")
+        if "Already up to date" in pull_output:
+            self.show_info("Already up to date!")
+        else:
+            self.show_info(f"Pull successful!\n\nChanges pulled from GitHub:\n{pull_output}")
+        self.refresh_ui()
+    
+    def on_pull_failed(self, error):
+        # Always re-enable buttons
+        self.finish_remote_operation()
+        if not isinstance(error, GitError):
+            self.show_error(f"Unexpected error during pull:\n{str(error)}")
+            return
+        
+        error_msg = str(error)
+        if "authentication failed" in error_msg.lower():
+            self.show_error("Authentication failed! Please check your GitHub token.")
+        elif "merge conflict" in error_msg.lower():
+            self.show_error("Merge conflict detected! You need to resolve conflicts manually.")
+        else:
+            self.show_error(f"Pull failed:\n{error_msg}")
+    
+    def fetch_from_github(self):
+        """Fetch all branches from origin without touching the working tree"""
+        if not self.repo or 'origin' not in self.repo.remotes:
+            self.show_error("No remote 'origin' configured")
+            return
+        
+        self.start_remote_operation(
+            'fetch', fetch_remote,
+            message="📥 Fetching from origin...",
+            on_result=self.on_fetch_finished,
+            on_error=self.on_fetch_failed,
+            supersedes=('auto_fetch',)
+        )
+    
+    def on_fetch_finished(self, result):
+        self.finish_remote_operation()
+        output, transfer = result
+        self.status_bar.showMessage(f"✅ Fetched origin{self.format_transfer(transfer)}")
+        self.load_branches()
+    
+    def on_fetch_failed(self, error):
+        self.finish_remote_operation()
+        self.show_error(f"Fetch failed:\n{str(error)}")
+    
+    # ==== Remote operation progress ====
+    
+    def start_remote_operation(self, key, func, *args, message, on_result, on_error, supersedes=None,
+                               exclusive=False):
+        """Run a push/pull/fetch job with live progress and a Cancel button.
+
+        Only pull changes the worktree and index, so only pull is exclusive;
+        push and fetch run alongside the panels' reads.
+        """
+        self.remote_operation = key
+        self.remote_progress.setRange(0, 0)  # busy until git reports a percentage
+        self.remote_progress.setFormat("")
+        self.remote_progress.show()
+        self.cancel_remote_btn.show()
+        self.status_bar.showMessage(message)
+        
+        self.workers.submit(
+            key, func, self.repo.working_dir, *args, self.github_manager,
+            on_result=on_result,
+            on_error=on_error,
+            on_progress=self.on_remote_progress,
+            exclusive=exclusive, mutates=True,
+            supersedes=self.READ_JOBS + ('auto_fetch',) if supersedes is None else supersedes
+        )
+        self.update_remote_actions()
+    
+    def on_remote_progress(self, progress):
+        self.remote_progress.setRange(0, 100)
+        self.remote_progress.setValue(progress['percent'])
+        self.remote_progress.setFormat(f"{progress['stage']} %p%")
+        message = f"{progress['stage']}: {progress['done']}/{progress['total']}"
+        if progress['transferred']:
+            message += f", {progress['transferred']}"
+        if progress['rate']:
+            message += f" | {progress['rate']}"
+        self.status_bar.showMessage(message)
+    
+    def finish_remote_operation(self):
+        self.remote_operation = None
+        self.remote_progress.hide()
+        self.cancel_remote_btn.hide()
+        self.update_remote_actions()
+    
+    def cancel_remote_operation(self):
+        """Stop the running push/pull/fetch; git is terminated on the worker thread"""
+        key = self.remote_operation
+        if not key:
+            return
+        self.workers.cancel(key)
+        self.finish_remote_operation()
+        self.status_bar.showMessage(f"⏹️ {key.capitalize()} cancelled")
+        self.refresh_ui()
     
+    def format_transfer(self, transfer):
+        if not transfer:
+            return ""
+        return f" ({transfer['transferred']} at {transfer['rate']})"
+    
+    def show_diagnostics(self):
+        """Show the diagnostics dock, building it on first use"""
+        if self.diagnostics_dock is None:
+            self.diagnostics_dock = QDockWidget("📈 Performance Diagnostics", self)
+            self.diagnostics_dock.setWidget(DiagnosticsPanel(self.diagnostics_dock, self))
+            self.addDockWidget(Qt.DockWidgetArea.BottomDockWidgetArea, self.diagnostics_dock)
+        self.diagnostics_dock.show()
+        self.diagnostics_dock.raise_()
+
     def show_about(self):
         """Show about dialog"""
         about_text = """<h2>GitDash</h2>
@@ -1080,16 +2650,34 @@ class GitDash(QMainWindow):
             self.show_error("Invalid directory path.")
             return
         try:
-            self.repo = Repo(path)
+            # Results for the previous repository are no longer wanted
+            self.workers.cancel_all(keep=self.APP_JOBS)
+            if self.remote_operation:
+                self.finish_remote_operation()
+            self.repo = git_repo(path)
             if self.repo.bare:
                 self.show_error("The selected directory is not a valid Git repository.")
                 self.repo = None
                 return
             self.status_bar.showMessage(f"Repository opened: {path}")
+            self.watch_repo()
             self.refresh_ui()
         except Exception as e:
             self.show_error(f"Failed to open repository:\n{e}")
 
+    def show_workspace(self):
+        """Show the status of every registered repository; optionally open one"""
+        registered = self.config.get('workspace_repos', [])
+        dialog = WorkspaceDialog(self, self.workers, registered)
+        dialog.exec()
+        self.workers.cancel('workspace')
+        if dialog.repo_paths != registered:
+            self.config['workspace_repos'] = dialog.repo_paths
+            self.save_config()
+        if dialog.selected_path:
+            self.repo_input.setText(dialog.selected_path)
+            self.open_repo()
+
     def create_repo(self):
         base_dir = QFileDialog.getExistingDirectory(self, "Select Parent Folder for New Git Repository")
         if not base_dir:
@@ -1105,7 +2693,7 @@ class GitDash(QMainWindow):
 
         try:
             # Initialize the repository first
-            repo = Repo.init(repo_path)
+            repo = git_repo(repo_path, init=True)
             
             # Create README.md file
             readme_path = os.path.join(repo_path, "README.md")
@@ -1119,6 +2707,7 @@ class GitDash(QMainWindow):
             # Now the repo has a valid HEAD and master branch
             self.repo = repo
             self.repo_input.setText(repo_path)
+            self.watch_repo()
             self.status_bar.showMessage(f"Initialized new repository at {repo_path}")
             
             # Ask if user wants to create GitHub repo
@@ -1146,81 +2735,259 @@ class GitDash(QMainWindow):
         self.update_remote_actions()
 
     def load_commits(self):
-        self.commit_tree.clear()
-        if not self.repo:
+        self.commit_model.refresh(self.repo.working_dir if self.repo else None)
+
+    # ==== Commit diffs ====
+
+    def clear_commit_diff(self):
+        self.workers.cancel('commit_files')
+        self.workers.cancel('file_diff')
+        self.shown_commit = None
+        self.commit_files.clear()
+        self.diff_view.clear_text()
+        self.commit_info_label.setText("Select a commit to see its changes")
+
+    def on_commit_selected(self, current, previous):
+        if not current.isValid() or not self.repo:
+            self.clear_commit_diff()
             return
-        try:
-            # Check if repo has any commits
-            try:
-                commits = list(self.repo.iter_commits(max_count=100))
-                for commit in commits:
-                    item = QTreeWidgetItem([
-                        commit.hexsha[:7],
-                        commit.message.strip().split("\n")[0],
-                        commit.author.name,
-                        commit.committed_datetime.strftime("%Y-%m-%d %H:%M")
-                    ])
-                    # Color code based on age
-                    age_days = (datetime.datetime.now(datetime.timezone.utc) - commit.committed_datetime).days
-                    if age_days < 1:
-                        item.setForeground(3, Qt.GlobalColor.green)
-                    elif age_days < 7:
-                        item.setForeground(3, Qt.GlobalColor.yellow)
-                    
-                    self.commit_tree.addTopLevelItem(item)
-            except Exception:
-                # No commits yet
-                pass
-        except Exception as e:
-            self.show_error(f"Error loading commits:\n{e}")
+        sha = self.commit_model.sha(current.row())
+        if sha == self.shown_commit:
+            return
+        self.shown_commit = sha
+        self.commit_info_label.setText(f"{sha[:7]}  {self.commit_model.subject(current.row())}")
+        # Commits are immutable: a revisited one comes straight from the cache
+        files = self.object_cache.get(commit_files_key(sha))
+        if files is not None:
+            self.show_commit_files(sha, files)
+            return
+        self.commit_files.clear()
+        self.diff_view.clear_text()
+        self.workers.submit(
+            'commit_files', read_commit_files, self.repo.working_dir, sha, self.object_cache,
+            on_result=lambda files: self.show_commit_files(sha, files),
+            on_error=lambda e: self.show_error(f"Error loading commit changes:\n{e}")
+        )
+
+    def show_commit_files(self, sha, files):
+        if sha != self.shown_commit:
+            return
+        self.commit_files.clear()
+        for changed in files:
+            label = f"{changed.orig_path} → {changed.path}" if changed.orig_path else changed.path
+            item = QListWidgetItem(f"{self.DIFF_STATUS.get(changed.status, changed.status)} {label}")
+            item.setData(Qt.ItemDataRole.UserRole, changed)
+            self.commit_files.addItem(item)
+        if files:
+            self.commit_files.setCurrentRow(0)
+        else:
+            self.diff_view.show_text("(no changes)", diff=False)
+
+    def show_selected_file(self, *args):
+        item = self.commit_files.currentItem()
+        if item is None or not self.repo:
+            self.diff_view.clear_text()
+            return
+        changed = item.data(Qt.ItemDataRole.UserRole)
+        if self.full_file_check.isChecked():
+            self.show_file_contents(changed)
+            return
+        text = self.object_cache.get(changed.diff_key())
+        if text is not None:
+            self.diff_view.show_text(text)
+            return
+        self.diff_view.clear_text()
+        self.workers.submit(
+            'file_diff', read_file_diff, self.repo.working_dir, changed, self.object_cache,
+            on_result=lambda text: self.show_file_text(changed, text, diff=True),
+            on_error=lambda e: self.show_error(f"Error loading diff:\n{e}")
+        )
+
+    def show_file_contents(self, changed):
+        """The file as of the commit (as before it, for a deletion)"""
+        if changed.is_submodule():
+            self.diff_view.show_text(f"Submodule at {changed.new_oid[:7]}", diff=False)
+            return
+        oid = changed.old_oid if changed.new_oid == NULL_OID else changed.new_oid
+        data = self.object_cache.get(blob_key(oid))
+        if data is not None:
+            self.diff_view.show_text(blob_text(data), diff=False)
+            return
+        self.diff_view.clear_text()
+        self.workers.submit(
+            'file_diff', read_blob, self.repo.working_dir, oid, self.object_cache,
+            on_result=lambda data: self.show_file_text(changed, blob_text(data), diff=False),
+            on_error=lambda e: self.show_error(f"Error loading file:\n{e}")
+        )
+
+    def show_file_text(self, changed, text, diff):
+        # Ignore results for a file or mode that is no longer selected
+        item = self.commit_files.currentItem()
+        if item is not None and item.data(Qt.ItemDataRole.UserRole) is changed \
+                and self.full_file_check.isChecked() != diff:
+            self.diff_view.show_text(text, diff=diff)
+
+    def keep_commit_scroll(self, parent, first, last, removed=False):
+        # Rows inserted or removed above the top visible one shouldn't move what's on screen
+        scrollbar = self.commit_tree.verticalScrollBar()
+        step = 1
+        if self.commit_tree.verticalScrollMode() == QAbstractItemView.ScrollMode.ScrollPerPixel:
+            step = self.commit_tree.verticalHeader().defaultSectionSize()
+        top = scrollbar.value() // step
+        if scrollbar.value() == 0 or (last >= top if removed else first > top):
+            return
+        count = last - first + 1
+        scrollbar.setValue(scrollbar.value() + (-count if removed else count) * step)
 
     def load_branches(self):
-        self.branch_list.clear()
+        if self.branch_list is None:
+            # Branches tab not built yet; it loads when first shown
+            return
         if not self.repo:
+            self.show_branches(RefIndex([]))
             return
-        try:
-            try:
-                current = self.repo.active_branch.name
-                self.current_branch_label.setText(f"Current Branch: 🌿 {current}")
-            except TypeError:
-                # No branches yet (empty repo)
-                self.current_branch_label.setText("Current Branch: (no branches)")
-                return
+        # The previous index is reused as is when no ref moved
+        work_dir = self.repo.working_dir
+        previous = self.ref_index if self.ref_index_path == work_dir else None
+        self.workers.submit(
+            'branches', read_ref_index, work_dir, previous,
+            on_progress=lambda ref_index: self.show_branches(ref_index, work_dir),
+            on_result=lambda ref_index: self.show_branches(ref_index, work_dir),
+            on_error=lambda e: self.show_error(f"Error loading branches:\n{e}")
+        )
 
-            for branch in self.repo.branches:
-                item = self.branch_list.addItem(f"🌿 {branch.name}")
-        except Exception as e:
-            self.show_error(f"Error loading branches:\n{e}")
+    def show_branches(self, ref_index, work_dir=None):
+        self.ref_index, self.ref_index_path = ref_index, work_dir
+        self.ref_model.set_ref_index(ref_index)
+        counts = {kind: 0 for kind in RefListModel.KIND_ICONS}
+        for ref in ref_index.refs:
+            counts[ref.kind] += 1
+        self.branch_count_label.setText(
+            f"{counts['local']} local | {counts['remote']} remote | {counts['tag']} tags"
+            + ("" if ref_index.complete else " | loading details..."))
+        if not counts['local']:
+            # No branches yet (empty repo)
+            self.current_branch_label.setText("Current Branch: (no branches)")
+            return
+        current = ref_index.current or "(detached HEAD)"
+        self.current_branch_label.setText(f"Current Branch: 🌿 {current}")
+
+    def sort_branches(self, column):
+        # Header clicks cycle ascending -> descending -> ranked/ref order
+        header = self.branch_list.horizontalHeader()
+        if self.ref_model.sort_column != column:
+            order = Qt.SortOrder.AscendingOrder
+        elif self.ref_model.sort_order == Qt.SortOrder.AscendingOrder:
+            order = Qt.SortOrder.DescendingOrder
+        else:
+            header.setSortIndicatorShown(False)
+            self.ref_model.sort(None)
+            return
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(column, order)
+        self.ref_model.sort(column, order)
+
+    def on_ref_chosen(self, current, previous):
+        if current.isValid():
+            self.chosen_ref = self.ref_model.ref(current.row()).ref_name
+
+    def restore_chosen_ref(self):
+        if self.chosen_ref is None or self.branch_list.currentIndex().isValid():
+            return
+        row = self.ref_model.row_of(self.chosen_ref)
+        if row is not None:
+            self.branch_list.selectRow(row)
+
+    def selected_ref(self):
+        index = self.branch_list.currentIndex()
+        return self.ref_model.ref(index.row()) if index.isValid() else None
 
     def load_stage_changes(self):
-        self.stage_tree.clear()
         if not self.repo:
+            self.show_stage_changes(StatusSnapshot())
+            return
+        self.workers.submit(
+            'stage', read_status, self.repo.working_dir,
+            on_result=self.show_stage_changes,
+            on_error=lambda e: self.show_error(f"Error loading stage changes:\n{e}")
+        )
+
+    def show_stage_changes(self, snapshot):
+        self.status_snapshot = snapshot
+        self.update_stats_label()
+        # Diff rows by (path, kind); untouched rows keep their selection
+        changed_paths = {file_path for file_path, kind in snapshot.row_keys() ^ self.stage_items.keys()}
+        if not changed_paths:
             return
+        if len(changed_paths) * self.STAGE_REBUILD_RATIO > len(snapshot.entries):
+            self.rebuild_stage_rows(snapshot)
+        else:
+            self.update_stage_rows(changed_paths)
+
+    def rebuild_stage_rows(self, snapshot):
+        """Recreate every stage row, keeping the selection and scroll position"""
+        current = self.stage_tree.currentItem()
+        selected, current_key = set(), None
+        for key, item in self.stage_items.items():
+            if item.isSelected():
+                selected.add(key)
+            if item is current:
+                current_key = key
+        scroll = self.stage_tree.verticalScrollBar().value()
+        
+        self.stage_tree.clear()
+        self.stage_items = {}
+        self.stage_group_sizes = dict.fromkeys(self.STAGE_ROWS, 0)
+        items = []
+        # Untracked, then modified (unstaged), then staged files
+        for kind, paths in (('untracked', snapshot.untracked),
+                            ('modified', snapshot.unstaged),
+                            ('staged', snapshot.staged)):
+            for file_path in paths:
+                items.append(self._make_stage_item(file_path, kind))
+            self.stage_group_sizes[kind] = len(paths)
+        self.stage_tree.addTopLevelItems(items)
+        
+        if current_key in self.stage_items:
+            self.stage_tree.setCurrentItem(self.stage_items[current_key], 0,
+                                           QItemSelectionModel.SelectionFlag.NoUpdate)
+        for key in selected:
+            item = self.stage_items.get(key)
+            if item is not None:
+                item.setSelected(True)
+        self.stage_tree.verticalScrollBar().setValue(scroll)
+
+    def _make_stage_item(self, file_path, kind):
+        label, color = self.STAGE_ROWS[kind]
+        item = QTreeWidgetItem([file_path, label])
+        item.setForeground(1, color)
+        self.stage_items[(file_path, kind)] = item
+        return item
+
+    def update_stage_rows(self, paths):
+        """Insert/remove stage rows for paths whose snapshot entry changed"""
+        self.stage_tree.setUpdatesEnabled(False)
         try:
-            # Get untracked files
-            untracked = self.repo.untracked_files
-            for file_path in untracked:
-                item = QTreeWidgetItem([file_path, "🆕 Untracked"])
-                item.setForeground(1, Qt.GlobalColor.red)
-                self.stage_tree.addTopLevelItem(item)
-            
-            # Get modified files (unstaged)
-            if self.repo.head.is_valid():
-                unstaged = self.repo.index.diff(None)
-                for diff in unstaged:
-                    item = QTreeWidgetItem([diff.a_path, f"📝 Modified"])
-                    item.setForeground(1, Qt.GlobalColor.yellow)
-                    self.stage_tree.addTopLevelItem(item)
-                
-                # Get staged files
-                staged = self.repo.index.diff("HEAD")
-                for diff in staged:
-                    item = QTreeWidgetItem([diff.a_path, f"✅ Staged"])
-                    item.setForeground(1, Qt.GlobalColor.green)
-                    self.stage_tree.addTopLevelItem(item)
-                    
-        except Exception as e:
-            self.show_error(f"Error loading stage changes:\n{e}")
+            for file_path in paths:
+                entry = self.status_snapshot.entries.get(file_path)
+                kinds = entry.row_kinds() if entry else ()
+                for kind in self.STAGE_ROWS:
+                    item = self.stage_items.get((file_path, kind))
+                    if item is not None and kind not in kinds:
+                        del self.stage_items[(file_path, kind)]
+                        self.stage_tree.takeTopLevelItem(self.stage_tree.indexOfTopLevelItem(item))
+                        self.stage_group_sizes[kind] -= 1
+                    elif item is None and kind in kinds:
+                        # Append at the end of the row's group
+                        position = 0
+                        for group in self.STAGE_ROWS:
+                            position += self.stage_group_sizes[group]
+                            if group == kind:
+                                break
+                        self.stage_tree.insertTopLevelItem(position, self._make_stage_item(file_path, kind))
+                        self.stage_group_sizes[kind] += 1
+        finally:
+            self.stage_tree.setUpdatesEnabled(True)
 
     def stage_selected(self):
         if not self.repo:
@@ -1230,28 +2997,37 @@ class GitDash(QMainWindow):
         if not selected:
             self.show_error("Select file(s) to stage.")
             return
-        try:
-            for item in selected:
-                self.repo.git.add(item.text(0))
-            self.status_bar.showMessage(f"✅ {len(selected)} file(s) staged.")
-            self.load_stage_changes()
-        except Exception as e:
-            self.show_error(f"Error staging files:\n{e}")
+        # Only paths with something to add: an already staged deletion is in
+        # neither the index nor the worktree and would fail the whole batch
+        # (git add stages worktree deletions itself)
+        paths = self.status_snapshot.unstaged_paths(dict.fromkeys(item.text(0) for item in selected))
+        if not paths:
+            self.status_bar.showMessage("Nothing to stage in the selection.")
+            return
+        self.workers.submit(
+            'index', run_git_on_paths, self.repo.working_dir, ['add'], paths,
+            on_result=lambda output: self.on_index_changed(
+                self.status_snapshot.apply_staged(paths), f"✅ {len(paths)} file(s) staged."),
+            on_error=lambda e: self.show_error(f"Error staging files:\n{e}"),
+            exclusive=True, supersedes=('stage',)
+        )
 
     def stage_all(self):
         if not self.repo:
             self.show_error("Open a repository first.")
             return
-        try:
-            # Check if there are any changes to stage
-            if not self.repo.untracked_files and not self.repo.index.diff(None):
-                self.status_bar.showMessage("Everything is up to date. Nothing to stage.")
-                return
-            self.repo.git.add(all=True)
-            self.status_bar.showMessage("✅ All changes staged.")
-            self.load_stage_changes()
-        except Exception as e:
-            self.show_error(f"Error staging all files:\n{e}")
+        # Check if there are any changes to stage
+        if not self.status_snapshot.has_unstaged_changes():
+            self.status_bar.showMessage("Everything is up to date. Nothing to stage.")
+            return
+        paths = self.status_snapshot.untracked + self.status_snapshot.unstaged
+        self.workers.submit(
+            'index', stage_all_changes, self.repo.working_dir,
+            on_result=lambda output: self.on_index_changed(
+                self.status_snapshot.apply_staged(paths), "✅ All changes staged."),
+            on_error=lambda e: self.show_error(f"Error staging all files:\n{e}"),
+            exclusive=True, supersedes=('stage',)
+        )
 
     def unstage_selected(self):
         if not self.repo:
@@ -1261,13 +3037,34 @@ class GitDash(QMainWindow):
         if not selected:
             self.show_error("Select file(s) to unstage.")
             return
-        try:
-            for item in selected:
-                self.repo.git.reset(item.text(0))
-            self.status_bar.showMessage(f"➖ {len(selected)} file(s) unstaged.")
-            self.load_stage_changes()
-        except Exception as e:
-            self.show_error(f"Error unstaging files:\n{e}")
+        # Only staged paths: without commits yet, an untracked one would make
+        # `git rm --cached` fail for the whole batch
+        paths = self.status_snapshot.staged_paths(dict.fromkeys(item.text(0) for item in selected))
+        if not paths:
+            self.status_bar.showMessage("Nothing to unstage in the selection.")
+            return
+        # Unstaging a rename must also restore its source path
+        entries = self.status_snapshot.entries
+        pathspecs = paths + [entries[p].orig_path for p in paths if p in entries and entries[p].orig_path]
+        if self.status_snapshot.head_oid:
+            args = ['reset', '--quiet']
+        else:
+            # No HEAD to reset to yet: drop the paths from the index (--force
+            # for ones changed again since; --cached keeps the worktree copy)
+            args = ['rm', '--cached', '--force', '--quiet', '-r']
+        self.workers.submit(
+            'index', run_git_on_paths, self.repo.working_dir, args, pathspecs,
+            on_result=lambda output: self.on_index_changed(
+                self.status_snapshot.apply_unstaged(paths), f"➖ {len(paths)} file(s) unstaged."),
+            on_error=lambda e: self.show_error(f"Error unstaging files:\n{e}"),
+            exclusive=True, supersedes=('stage',)
+        )
+
+    def on_index_changed(self, changed_paths, message):
+        self.status_bar.showMessage(message)
+        # Patch only the affected rows instead of rescanning the worktree
+        self.update_stage_rows(changed_paths)
+        self.update_stats_label()
 
     def commit_changes(self):
         if not self.repo:
@@ -1275,79 +3072,138 @@ class GitDash(QMainWindow):
             return
         commit_msg, ok = QInputDialog.getText(self, "Commit Message", "Enter commit message:")
         if ok and commit_msg.strip():
-            try:
-                # Check if there are staged changes
-                if self.repo.head.is_valid() and not self.repo.index.diff("HEAD"):
-                    self.show_error("No staged changes to commit.")
-                    return
-                elif not self.repo.head.is_valid() and not self.repo.index.entries:
-                    self.show_error("No staged changes to commit.")
-                    return
-                    
-                self.repo.index.commit(commit_msg.strip())
-                self.status_bar.showMessage("✅ Changes committed successfully!")
-                self.load_commits()
-                self.load_stage_changes()
-            except Exception as e:
-                self.show_error(f"Error committing changes:\n{e}")
+            # The stage panel's snapshot already knows whether anything is staged
+            if not self.status_snapshot.has_staged_changes():
+                self.show_error("No staged changes to commit.")
+                return
+            self.status_bar.showMessage("Committing...")
+            self.workers.submit(
+                'commit', commit_staged, self.repo.working_dir, commit_msg.strip(),
+                on_result=self.on_commit_finished,
+                on_error=lambda e: self.show_error(f"Error committing changes:\n{e}"),
+                exclusive=True, supersedes=('new_commits', 'stage')
+            )
         else:
             self.status_bar.showMessage("Commit canceled.")
 
+    def on_commit_finished(self, record):
+        self.commit_model.add_commit(record)
+        # Committed rows leave the stage panel; nothing is rescanned
+        self.on_index_changed(self.status_snapshot.apply_committed(record.sha),
+                              f"✅ Committed {record.sha[:7]}: {record.subject}")
+        self.update_stats()
+
     def create_branch(self):
         if not self.repo:
             self.show_error("Open a repository first.")
             return
         new_branch_name, ok = QInputDialog.getText(self, "Create Branch", "Enter new branch name:")
         if ok and new_branch_name.strip():
-            try:
-                self.repo.git.branch(new_branch_name.strip())
-                self.status_bar.showMessage(f"🌿 Branch '{new_branch_name}' created.")
-                self.load_branches()
-            except GitCommandError as e:
-                self.show_error(f"Error creating branch:\n{e}")
+            self.workers.submit(
+                'branch', run_git_command, self.repo.working_dir, 'branch', new_branch_name.strip(),
+                on_result=lambda output: self.on_branches_changed(f"🌿 Branch '{new_branch_name}' created."),
+                on_error=lambda e: self.show_error(f"Error creating branch:\n{e}"),
+                exclusive=True, supersedes=('branches',)
+            )
+
+    def on_branches_changed(self, message):
+        self.status_bar.showMessage(message)
+        self.load_branches()
+        self.update_stats()
 
     def delete_branch(self):
         if not self.repo:
             self.show_error("Open a repository first.")
             return
-        selected = self.branch_list.currentItem()
-        if not selected:
+        ref = self.selected_ref()
+        if ref is None:
             self.show_error("Select a branch to delete.")
             return
-        branch_name = selected.text().replace("🌿 ", "")
-        try:
-            if branch_name == self.repo.active_branch.name:
-                self.show_error("Cannot delete the current active branch.")
-                return
-        except TypeError:
-            pass
-        confirm = QMessageBox.question(self, "Confirm Delete", f"Delete branch '{branch_name}'?",
+        if ref.kind == 'remote':
+            self.show_error("Remote-tracking branches can't be deleted here; delete the branch on the remote.")
+            return
+        if ref.kind == 'local' and ref.name == self.ref_index.current:
+            self.show_error("Cannot delete the current active branch.")
+            return
+        what = "tag" if ref.kind == 'tag' else "branch"
+        confirm = QMessageBox.question(self, "Confirm Delete", f"Delete {what} '{ref.name}'?",
                                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if confirm == QMessageBox.StandardButton.Yes:
-            try:
-                self.repo.git.branch("-D", branch_name)
-                self.status_bar.showMessage(f"🗑️ Branch '{branch_name}' deleted.")
-                self.load_branches()
-            except GitCommandError as e:
-                self.show_error(f"Error deleting branch:\n{e}")
+            args = ('tag', '-d', ref.name) if ref.kind == 'tag' else ('branch', '-D', ref.name)
+            self.workers.submit(
+                'branch', run_git_command, self.repo.working_dir, *args,
+                on_result=lambda output: self.on_branches_changed(f"🗑️ {what.capitalize()} '{ref.name}' deleted."),
+                on_error=lambda e: self.show_error(f"Error deleting {what}:\n{e}"),
+                exclusive=True, supersedes=('branches',)
+            )
 
     def checkout_branch(self):
         if not self.repo:
             self.show_error("Open a repository first.")
             return
-        selected = self.branch_list.currentItem()
-        if not selected:
+        ref = self.selected_ref()
+        if ref is None:
             self.show_error("Select a branch to checkout.")
             return
-        branch_name = selected.text().replace("🌿 ", "")
-        try:
-            self.repo.git.checkout(branch_name)
-            self.status_bar.showMessage(f"✔️ Checked out branch '{branch_name}'.")
-            self.load_commits()
+        if ref.kind == 'remote':
+            # Creates a local branch tracking it
+            args = ['--track', ref.name]
+        elif ref.kind == 'tag':
+            args = ['--detach', ref.ref_name]
+        else:
+            args = [ref.name]
+        self.status_bar.showMessage(f"Checking out '{ref.name}'...")
+        self.remote_progress.setRange(0, 0)  # busy until git reports a percentage
+        self.remote_progress.setFormat("")
+        self.remote_progress.show()
+        # A refresh still running against the old branch would be stale
+        self.workers.submit(
+            'checkout', checkout_ref, self.repo.working_dir, args,
+            on_result=self.on_checkout_finished,
+            on_error=self.on_checkout_failed,
+            on_progress=self.on_remote_progress,
+            exclusive=True, supersedes=self.READ_JOBS
+        )
+
+    def hide_checkout_progress(self):
+        # The bar is shared with push/pull/fetch
+        if self.remote_operation is None:
+            self.remote_progress.hide()
+
+    def on_checkout_failed(self, error):
+        self.hide_checkout_progress()
+        self.show_error(f"Error checking out branch:\n{error}")
+
+    def on_checkout_finished(self, result):
+        old_sha, new_sha, branch = result
+        self.hide_checkout_progress()
+        if branch:
+            self.status_bar.showMessage(f"✔️ Checked out branch '{branch}'.")
+        else:
+            self.status_bar.showMessage(f"✔️ Checked out {new_sha[:7]} (detached HEAD).")
+        # Rows shared by both histories stay; only the diverging commits are read
+        self.load_commits()
+        self.mark_current_branch(branch)
+        self.load_stage_changes()
+        self.update_stats()
+
+    def mark_current_branch(self, branch):
+        """Point the Branches tab at the checked-out branch without listing refs again"""
+        if self.ref_index is None or self.ref_index_path != self.repo.working_dir:
+            # Not loaded yet; the next load reads HEAD anyway
+            return
+        if branch is not None and f"refs/heads/{branch}" not in self.ref_index.shas:
+            # Checking out a remote branch created a local one
             self.load_branches()
-            self.load_stage_changes()
-        except GitCommandError as e:
-            self.show_error(f"Error checking out branch:\n{e}")
+            return
+        self.ref_model.set_current(branch)
+        self.current_branch_label.setText(f"Current Branch: 🌿 {branch or '(detached HEAD)'}")
+
+    def closeEvent(self, event):
+        # Let background Git operations wind down before the threads are destroyed
+        self.fetch_scheduler.stop()
+        self.workers.shutdown()
+        super().closeEvent(event)
 
     def show_error(self, message):
         msg = QMessageBox(self)
@@ -1392,16 +3248,19 @@ def main():
     app = QApplication(sys.argv)
     app.setStyle("Fusion")  # Use Fusion style for better dark theme support
     
-    # Check if PyGithub is available
-    if not GITHUB_AVAILABLE:
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Icon.Warning)
-        msg.setWindowTitle("Optional Dependency")
-        msg.setText("PyGithub is not installed. GitHub features will be disabled.\n\nTo enable GitHub integration, run:\npip install PyGithub")
-        msg.exec()
-    
     window = GitDash()
     window.show()
+    
+    # Check if PyGithub is available (once the window is up, so it doesn't hold up the first paint)
+    if not GITHUB_AVAILABLE:
+        def warn_missing_pygithub():
+            msg = QMessageBox(window)
+            msg.setIcon(QMessageBox.Icon.Warning)
+            msg.setWindowTitle("Optional Dependency")
+            msg.setText("PyGithub is not installed. GitHub features will be disabled.\n\nTo enable GitHub integration, run:\npip install PyGithub")
+            msg.exec()
+        QTimer.singleShot(0, warn_missing_pygithub)
+    
     sys.exit(app.exec())
 
 if __name__ == "__main__":
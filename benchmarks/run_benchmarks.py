@@ -0,0 +1,306 @@
+# run_benchmarks.py - Time GitDash's core operations against synthetic repositories
+#
+#   python benchmarks/run_benchmarks.py                        small profile, checked against its baseline
+#   python benchmarks/run_benchmarks.py --profile medium --save-baseline
+#   python benchmarks/run_benchmarks.py --only stage_all,commit_changes --repeat 20
+#
+# Each benchmark runs what one GUI action runs on its worker thread
+# (load_commits -> the first CommitPager page, update_stats -> a fresh
+# RepoStatsEngine, ...). Timing goes through gitdash_core's instrumentation,
+# so git process counts and bytes read are reported next to wall time.
+#
+# Baselines are stored in benchmarks/baselines/<profile>.json. A run exits with
+# status 1 when an operation's median is slower than its baseline by more than
+# --tolerance. Push and pull go to a local bare repository, so no network
+# access is needed.
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import synthrepo
+from gitdash_core import (
+    INSTRUMENTATION, GitHubManager, Job, RepoStatsEngine, StatusSnapshot, CommitPager, CommitGraph, HistoryCache,
+    measure, run_git, read_head_sha, find_git_dir, build_history_cache, read_ref_index, read_status, read_stats,
+    run_git_on_paths, stage_all_changes, fetch_commit_page, commit_staged, push_branch, pull_branch, fetch_remote
+)
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'baselines')
+
+# Same page size as the GUI's commit list
+COMMIT_PAGE_SIZE = 200
+
+# Differences below this are noise, whatever the percentage
+MIN_REGRESSION_MS = 2.0
+
+JOB = Job()
+NO_TOKEN = GitHubManager()
+SEQUENCE = itertools.count()
+
+# ==== Benchmarks ====
+#
+# A benchmark is func(context, timed): it prepares whatever it needs, runs the
+# operation under `with timed:` and puts the repository back the way it was.
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+class Context:
+    """Repository paths plus data shared by several benchmarks"""
+    def __init__(self, paths):
+        self.work = paths['work']
+        self.pull = paths['pull']
+        self.branch = synthrepo.BRANCH
+        self._snapshot = None
+        self._history_cache = None
+
+    @property
+    def history_cache(self):
+        """HistoryCache of the work repository, built once in a temporary directory"""
+        if self._history_cache is None:
+            self._cache_dir = tempfile.TemporaryDirectory()
+            self._history_cache = HistoryCache(self._cache_dir.name, self.work)
+            build_history_cache(JOB, self._history_cache, self.work, read_head_sha(find_git_dir(self.work)))
+        return self._history_cache
+
+    @property
+    def snapshot(self):
+        if self._snapshot is None:
+            self._snapshot = StatusSnapshot.scan(self.work)
+        return self._snapshot
+
+    def selection(self):
+        """What a user would select: the modified files and half of the untracked ones"""
+        untracked = self.snapshot.untracked
+        return self.snapshot.unstaged + untracked[:len(untracked) // 2]
+
+@benchmark('load_commits')
+def bench_load_commits(context, timed):
+    with timed:
+        pager = CommitPager(context.work)
+        fetch_commit_page(JOB, pager, COMMIT_PAGE_SIZE)
+        # Stops git log; its process is counted when it ends
+        pager.close()
+
+@benchmark('load_commits_cached')
+def bench_load_commits_cached(context, timed):
+    # Reopening with the history cache at HEAD: the whole history, no git process
+    cache = context.history_cache
+    with timed:
+        cache.load()
+
+@benchmark('commit_graph')
+def bench_commit_graph(context, timed):
+    # Lanes for the whole history: what scrolling to the last commit costs
+    tip, columns = context.history_cache.load()
+    with timed:
+        CommitGraph(columns).row(len(columns) - 1)
+
+@benchmark('load_stage_changes')
+def bench_load_stage_changes(context, timed):
+    with timed:
+        read_status(JOB, context.work)
+
+@benchmark('update_stats')
+def bench_update_stats(context, timed):
+    with timed:
+        read_stats(JOB, RepoStatsEngine(context.work))
+
+@benchmark('update_stats_cached')
+def bench_update_stats_cached(context, timed):
+    # Refresh with HEAD unchanged, the common case while the app is open
+    engine = RepoStatsEngine(context.work)
+    read_stats(JOB, engine)
+    with timed:
+        read_stats(JOB, engine)
+
+@benchmark('load_branches')
+def bench_load_branches(context, timed):
+    with timed:
+        read_ref_index(JOB, context.work)
+
+@benchmark('load_branches_cached')
+def bench_load_branches_cached(context, timed):
+    # Refresh with no ref moved: the ref files are read, no git process runs
+    previous = read_ref_index(JOB, context.work)
+    with timed:
+        read_ref_index(JOB, context.work, previous)
+
+@benchmark('stage_selected')
+def bench_stage_selected(context, timed):
+    paths = context.selection()
+    with timed:
+        run_git_on_paths(JOB, context.work, ['add'], paths)
+    run_git(context.work, 'reset', '--quiet')
+
+@benchmark('stage_all')
+def bench_stage_all(context, timed):
+    with timed:
+        stage_all_changes(JOB, context.work)
+    run_git(context.work, 'reset', '--quiet')
+
+@benchmark('commit_changes')
+def bench_commit_changes(context, timed):
+    run_git(context.work, 'add', '--all')
+    with timed:
+        commit_staged(JOB, context.work, f"Benchmark commit {next(SEQUENCE)}")
+    # Drop the commit and unstage again
+    run_git(context.work, 'reset', '--quiet', 'HEAD~1')
+
+@benchmark('push')
+def bench_push(context, timed):
+    # A new commit on a throwaway branch, so every push transfers something
+    tip = run_git(context.work, 'commit-tree', 'HEAD^{tree}', '-p', 'HEAD',
+                  '-m', f"Benchmark push {next(SEQUENCE)}").decode().strip()
+    run_git(context.work, 'branch', '--force', 'bench/push', tip)
+    with timed:
+        push_branch(JOB, context.work, 'bench/push', NO_TOKEN)
+    run_git(context.work, 'push', '--quiet', 'origin', '--delete', 'bench/push')
+    run_git(context.work, 'branch', '--quiet', '--delete', '--force', 'bench/push')
+
+@benchmark('pull')
+def bench_pull(context, timed):
+    # Fall one commit behind, then fast-forward
+    run_git(context.pull, 'reset', '--quiet', '--hard', 'HEAD~1')
+    with timed:
+        pull_branch(JOB, context.pull, context.branch, NO_TOKEN)
+
+@benchmark('fetch')
+def bench_fetch(context, timed):
+    with timed:
+        fetch_remote(JOB, context.work, NO_TOKEN)
+
+def run_benchmarks(context, names, repeat, warmup):
+    """Run each benchmark warmup + repeat times; returns the instrumentation summary"""
+    INSTRUMENTATION.reset()
+    for name in names:
+        for _ in range(warmup):
+            BENCHMARKS[name](context, contextlib.nullcontext())
+        for _ in range(repeat):
+            BENCHMARKS[name](context, measure(name))
+    summary = INSTRUMENTATION.summary()
+    return {name: summary[name] for name in names}
+
+# ==== Baselines ====
+
+def environment():
+    git_version = subprocess.run(['git', '--version'], stdout=subprocess.PIPE, text=True).stdout.strip()
+    return {
+        'python': platform.python_version(),
+        'git': git_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+def baseline_path(profile):
+    return os.path.join(BASELINE_DIR, f"{profile}.json")
+
+def load_baseline(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def compare(results, baseline, tolerance):
+    """Return (name, baseline ms, current ms) for every operation that got slower"""
+    regressions = []
+    for name, stats in results['operations'].items():
+        reference = baseline['operations'].get(name)
+        if reference is None:
+            continue
+        limit = reference['p50_ms'] * (1 + tolerance)
+        if stats['p50_ms'] > limit and stats['p50_ms'] - reference['p50_ms'] > MIN_REGRESSION_MS:
+            regressions.append((name, reference['p50_ms'], stats['p50_ms']))
+    return regressions
+
+def print_table(operations, baseline=None):
+    print(f"{'operation':<22}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'procs':>7}{'KiB':>10}{'baseline':>10}")
+    for name, stats in operations.items():
+        reference = baseline['operations'].get(name) if baseline else None
+        print(f"{name:<22}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+              f"{stats['processes_per_op']:>7g}{stats['bytes_per_op'] / 1024:>10.1f}"
+              f"{reference['p50_ms'] if reference else '-':>10}")
+
+# ==== Entry point ====
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GitDash's Git operations on a synthetic repository")
+    synthrepo.add_shape_arguments(parser)
+    parser.add_argument("--only", metavar="NAMES", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per operation (default: 10)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs first (default: 1)")
+    parser.add_argument("--work-dir", help="where the synthetic repository is kept; an existing directory "
+                        "must be empty or generated by synthrepo (default: <tmp>/gitdash-bench/<profile>)")
+    parser.add_argument("--fresh", action="store_true", help="regenerate the repository even if it exists")
+    parser.add_argument("--json", dest="output", metavar="PATH", help="also write the results to PATH")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store the results as the profile's baseline instead of comparing")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against PATH instead of the profile's baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown of the median before a run fails (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    names = list(BENCHMARKS)
+    if args.only:
+        names = [name.strip() for name in args.only.split(',') if name.strip()]
+        unknown = [name for name in names if name not in BENCHMARKS]
+        if unknown:
+            parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    synthrepo.isolate_environment()
+    params = synthrepo.shape_from_args(args)
+    work_dir = args.work_dir or os.path.join(tempfile.gettempdir(), 'gitdash-bench', args.profile)
+    started = time.perf_counter()
+    paths = synthrepo.load_or_generate(work_dir, params, args.seed, args.fresh)
+    print(f"Repository: {paths['work']} ({time.perf_counter() - started:.1f} s to prepare)", file=sys.stderr)
+
+    operations = run_benchmarks(Context(paths), names, args.repeat, args.warmup)
+    results = {
+        'profile': args.profile,
+        'params': dict(params, seed=args.seed),
+        'repeat': args.repeat,
+        'environment': environment(),
+        'generated_at': time.time(),
+        'operations': operations
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path(args.profile), 'w') as f:
+            json.dump(results, f, indent=2)
+        print_table(operations)
+        print(f"Baseline saved to {baseline_path(args.profile)}", file=sys.stderr)
+        return 0
+
+    baseline = load_baseline(args.baseline or baseline_path(args.profile))
+    if baseline is not None and baseline.get('params') != results['params']:
+        print("Baseline was recorded with different repository parameters; not comparing", file=sys.stderr)
+        baseline = None
+    print_table(operations, baseline)
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {before:.1f} ms -> {after:.1f} ms", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
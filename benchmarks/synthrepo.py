@@ -0,0 +1,210 @@
+# synthrepo.py - Deterministic synthetic repositories for the GitDash benchmarks
+#
+#   python benchmarks/synthrepo.py DIR --profile medium
+#   python benchmarks/synthrepo.py DIR --commits 20000 --files 3000 --branches 50
+#
+# History is written with a single `git fast-import` stream instead of one git
+# process per commit (the medium profile takes a few seconds). DIR ends up holding:
+#
+#   work/      the repository under test (modified and untracked files on top)
+#   remote.git bare repository used as origin for push/pull/fetch
+#   pull/      second clone of remote.git that pull benchmarks fast-forward
+#   .synthrepo marker; a non-empty DIR without it is never replaced
+#
+# Everything is local; no network access is needed.
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+
+# commits, files, branches, untracked, modified, binary blobs (count x KiB)
+PROFILES = {
+    'small': dict(commits=500, files=200, branches=10, untracked=50, modified=20,
+                  binaries=5, binary_kib=64),
+    'medium': dict(commits=10000, files=5000, branches=100, untracked=1000, modified=200,
+                   binaries=20, binary_kib=1024),
+    'large': dict(commits=100000, files=50000, branches=1000, untracked=10000, modified=2000,
+                  binaries=50, binary_kib=4096)
+}
+
+BRANCH = 'main'
+# Written into every generated directory; only those are ever replaced
+MARKER = '.synthrepo'
+EPOCH = 1700000000
+AUTHOR = "GitDash Bench <bench@gitdash.invalid>"
+
+# Pin identity and ignore the user's git configuration so runs are comparable
+GIT_ENV = {
+    'GIT_CONFIG_NOSYSTEM': '1',
+    'GIT_CONFIG_GLOBAL': os.devnull,
+    'GIT_TERMINAL_PROMPT': '0',
+    'GIT_AUTHOR_NAME': 'GitDash Bench',
+    'GIT_AUTHOR_EMAIL': 'bench@gitdash.invalid',
+    'GIT_COMMITTER_NAME': 'GitDash Bench',
+    'GIT_COMMITTER_EMAIL': 'bench@gitdash.invalid'
+}
+
+def isolate_environment():
+    """Apply GIT_ENV to this process so every git child inherits it"""
+    os.environ.update(GIT_ENV)
+
+def git(cwd, *args):
+    subprocess.run(['git', '-C', cwd] + list(args), check=True, stdout=subprocess.DEVNULL)
+
+def file_path(index):
+    # Spread files over a two-level tree like a real source layout
+    return f"src/d{index % 37:02d}/m{index % 11}/file{index:06d}.txt"
+
+def text_blob(index, revision):
+    return f"file {index} revision {revision}\n".encode() + b"x" * (64 + index % 512) + b"\n"
+
+class FastImportStream:
+    """Writes fast-import commands to a git fast-import process"""
+    def __init__(self, out):
+        self.out = out
+        self.marks = 0
+
+    def data(self, payload):
+        self.out.write(b"data %d\n" % len(payload))
+        self.out.write(payload)
+        self.out.write(b"\n")
+
+    def commit(self, ref, number, message, changes, parent=None):
+        """changes is a list of (path, bytes); returns the commit's mark"""
+        self.marks += 1
+        self.out.write(f"commit {ref}\nmark :{self.marks}\n".encode())
+        self.out.write(f"committer {AUTHOR} {EPOCH + number * 60} +0000\n".encode())
+        self.data(message.encode())
+        if parent is not None:
+            self.out.write(f"from :{parent}\n".encode())
+        for path, payload in changes:
+            self.out.write(f"M 100644 inline {path}\n".encode())
+            self.data(payload)
+        return self.marks
+
+    def reset(self, ref, mark):
+        self.out.write(f"reset {ref}\nfrom :{mark}\n\n".encode())
+
+def write_history(repo_path, params, seed):
+    rng = random.Random(seed)
+    proc = subprocess.Popen(['git', '-C', repo_path, 'fast-import', '--quiet'], stdin=subprocess.PIPE)
+    stream = FastImportStream(proc.stdin)
+    ref = f"refs/heads/{BRANCH}"
+
+    # Root commit holds every file plus the binary blobs
+    changes = [(file_path(i), text_blob(i, 0)) for i in range(params['files'])]
+    for i in range(params['binaries']):
+        changes.append((f"assets/blob{i:03d}.bin", rng.randbytes(params['binary_kib'] * 1024)))
+    marks = [stream.commit(ref, 0, "Initial import\n", changes)]
+
+    revisions = {}
+    for number in range(1, params['commits']):
+        touched = rng.sample(range(params['files']), min(params['files'], rng.randint(1, 4)))
+        changes = []
+        for i in touched:
+            revisions[i] = revisions.get(i, 0) + 1
+            changes.append((file_path(i), text_blob(i, revisions[i])))
+        marks.append(stream.commit(ref, number, f"Change {number}: update {len(touched)} file(s)\n", changes))
+
+    # Branches start at random points; every other one carries a commit of its own
+    for i in range(params['branches']):
+        start = marks[rng.randrange(len(marks))]
+        branch_ref = f"refs/heads/feature/b{i:04d}"
+        if i % 2:
+            index = rng.randrange(params['files'])
+            stream.commit(branch_ref, params['commits'] + i, f"Work on feature {i}\n",
+                          [(file_path(index), text_blob(index, -i))], parent=start)
+        else:
+            stream.reset(branch_ref, start)
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+
+def dirty_worktree(repo_path, params, seed):
+    """Modify tracked files and add untracked ones"""
+    rng = random.Random(seed + 1)
+    for i in rng.sample(range(params['files']), min(params['files'], params['modified'])):
+        with open(os.path.join(repo_path, file_path(i)), 'ab') as f:
+            f.write(b"local edit\n")
+    for i in range(params['untracked']):
+        path = os.path.join(repo_path, 'scratch', f"u{i % 20:02d}", f"new{i:06d}.txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(f"untracked {i}\n".encode())
+
+def repo_paths(target):
+    return {name: os.path.join(target, directory)
+            for name, directory in (('work', 'work'), ('remote', 'remote.git'), ('pull', 'pull'))}
+
+def generate(target, params, seed=0):
+    """Build work/, remote.git and pull/ under target; returns their paths.
+
+    target must be missing, empty or a directory generated before.
+    """
+    if os.path.exists(target):
+        if os.listdir(target) and not os.path.isfile(os.path.join(target, MARKER)):
+            raise SystemExit(f"synthrepo: {target} is not empty and was not generated by synthrepo; "
+                             "refusing to replace it")
+        shutil.rmtree(target)
+    paths = repo_paths(target)
+    work, remote, pull = paths['work'], paths['remote'], paths['pull']
+    os.makedirs(work)
+    open(os.path.join(target, MARKER), 'w').close()
+
+    git(work, 'init', '--quiet', f'--initial-branch={BRANCH}')
+    write_history(work, params, seed)
+    git(work, 'checkout', '--quiet', '--force', BRANCH)
+    git(target, 'clone', '--quiet', '--bare', work, remote)
+    git(work, 'remote', 'add', 'origin', remote)
+    git(work, 'fetch', '--quiet', 'origin')
+    git(work, 'branch', '--quiet', f'--set-upstream-to=origin/{BRANCH}', BRANCH)
+    git(target, 'clone', '--quiet', '--branch', BRANCH, remote, pull)
+    dirty_worktree(work, params, seed)
+
+    with open(os.path.join(target, 'params.json'), 'w') as f:
+        json.dump(dict(params, seed=seed), f, indent=2)
+    return paths
+
+def load_or_generate(target, params, seed=0, fresh=False):
+    """Reuse the repository in target if it was generated with the same parameters"""
+    try:
+        with open(os.path.join(target, 'params.json'), 'r') as f:
+            reusable = not fresh and json.load(f) == dict(params, seed=seed)
+    except (OSError, ValueError):
+        reusable = False
+    return repo_paths(target) if reusable else generate(target, params, seed)
+
+def add_shape_arguments(parser):
+    """--profile plus per-dimension overrides, shared with run_benchmarks.py"""
+    parser.add_argument("--profile", choices=sorted(PROFILES), default='small')
+    for name in PROFILES['small']:
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=int, metavar="N",
+                            help=f"override the profile's {name.replace('_', ' ')}")
+    parser.add_argument("--seed", type=int, default=0)
+
+def shape_from_args(args):
+    params = dict(PROFILES[args.profile])
+    for name in params:
+        if getattr(args, name) is not None:
+            params[name] = getattr(args, name)
+    if params['files'] < 1 or params['commits'] < 1:
+        raise SystemExit("synthrepo: need at least one commit and one file")
+    return params
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic repository for benchmarking")
+    parser.add_argument("target", help="directory to create (replaced if synthrepo generated it, "
+                        "otherwise it must be empty)")
+    add_shape_arguments(parser)
+    args = parser.parse_args(argv)
+    isolate_environment()
+    paths = generate(args.target, shape_from_args(args), args.seed)
+    print(paths['work'])
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
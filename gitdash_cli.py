@@ -0,0 +1,248 @@
+# gitdash_cli.py - Headless GitDash: the GUI's Git and GitHub operations from a shell
+#
+#   gitdash stats               commits / branches / modified counts
+#   gitdash status [--json]     porcelain-v2 status snapshot
+#   gitdash log [-n N]          history of HEAD
+#   gitdash branches            local branches with ahead/behind
+#   gitdash push|pull|fetch     remote operations with the configured GitHub token
+#   gitdash create-repo NAME    create a GitHub repository and add it as origin
+#
+#   --timings                   print per-operation timings as JSON to stderr
+#
+# Only gitdash_core is imported (no Qt, no GitPython), so commands start fast
+# and work without a display server.
+
+import argparse
+import json
+import os
+import sys
+import threading
+
+from gitdash_core import (
+    GitError, GitHubManager, Job, RepoStatsEngine, StatusSnapshot, iter_log, read_branches,
+    push_branch, pull_branch, fetch_remote, run_git, read_head_sha, find_git_dir, INSTRUMENTATION, measure
+)
+
+def load_token():
+    """GitHub token from $GITHUB_TOKEN or the GUI's ~/.gitdash/config.json"""
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+    try:
+        with open(os.path.expanduser("~/.gitdash/config.json"), 'r') as f:
+            return json.load(f).get('github_token')
+    except (OSError, ValueError):
+        return None
+
+def print_json(data):
+    json.dump(data, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+def current_branch(repo_path):
+    current, branches = read_branches(None, repo_path)
+    if current is None:
+        raise SystemExit("gitdash: no branch is checked out")
+    return current
+
+# ==== Commands ====
+
+def cmd_stats(args):
+    engine = RepoStatsEngine(args.repo)
+    snapshot = StatusSnapshot.scan(args.repo)
+    stats = {
+        'commits': engine.count_commits(),
+        'branches': engine.count_branches(),
+        'modified': len(snapshot.unstaged)
+    }
+    if args.json:
+        print_json(stats)
+    else:
+        print(f"{stats['commits']} commits | {stats['branches']} branches | {stats['modified']} modified")
+
+def cmd_status(args):
+    snapshot = StatusSnapshot.scan(args.repo)
+    if args.json:
+        print_json({
+            'branch': snapshot.branch,
+            'head': snapshot.head_oid,
+            'upstream': snapshot.upstream,
+            'ahead': snapshot.ahead,
+            'behind': snapshot.behind,
+            'entries': [{
+                'path': entry.path,
+                'orig_path': entry.orig_path,
+                'index': entry.index_status,
+                'worktree': entry.worktree_status
+            } for entry in snapshot.entries.values()]
+        })
+        return
+    header = f"## {snapshot.branch or '(detached)'}"
+    if snapshot.upstream:
+        header += f"...{snapshot.upstream} [ahead {snapshot.ahead}, behind {snapshot.behind}]"
+    print(header)
+    for entry in snapshot.entries.values():
+        path = f"{entry.orig_path} -> {entry.path}" if entry.orig_path else entry.path
+        print(f"{entry.index_status}{entry.worktree_status} {path}")
+
+def cmd_log(args):
+    # Unborn branch: no history yet (git log would fail)
+    has_head = read_head_sha(find_git_dir(args.repo)) is not None
+    records = iter_log(args.repo, max_count=args.max_count) if has_head else []
+    if args.json:
+        print_json([{
+            'sha': record.sha,
+            'parents': record.parents,
+            'author': record.author,
+            'author_email': record.author_email,
+            'date': record.committed_datetime().isoformat(),
+            'subject': record.subject
+        } for record in records])
+        return
+    for record in records:
+        date = record.committed_datetime().strftime("%Y-%m-%d %H:%M")
+        print(f"{record.sha[:7]}  {date}  {record.author}  {record.subject}")
+
+def cmd_branches(args):
+    current, branches = read_branches(None, args.repo)
+    if args.json:
+        print_json([{
+            'name': branch.name,
+            'current': branch.name == current,
+            'upstream': branch.upstream,
+            'ahead': branch.ahead,
+            'behind': branch.behind,
+            'gone': branch.gone
+        } for branch in branches])
+        return
+    for branch in branches:
+        marker = "*" if branch.name == current else " "
+        track = branch.track_text()
+        print(f"{marker} {branch.name}" + (f"  [{branch.upstream}: {track}]" if track else ""))
+
+def run_remote(func, repo_path, *args):
+    """Run push/pull/fetch on a thread so Ctrl-C can cancel it cleanly"""
+    show_progress = sys.stderr.isatty()
+
+    def report(progress):
+        if show_progress:
+            line = f"{progress['stage']}: {progress['percent']}% ({progress['done']}/{progress['total']})"
+            if progress['rate']:
+                line += f", {progress['transferred']} | {progress['rate']}"
+            sys.stderr.write(f"\r{line}\033[K")
+            sys.stderr.flush()
+
+    job = Job(on_progress=report)
+    outcome = {}
+
+    def run():
+        try:
+            outcome['result'] = func(job, repo_path, *args, GitHubManager(load_token()))
+        except Exception as e:
+            outcome['error'] = e
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.1)
+    except KeyboardInterrupt:
+        # git runs in its own process group; the job terminates it
+        job.cancel()
+        worker.join()
+        raise SystemExit("\ngitdash: cancelled")
+    if show_progress:
+        sys.stderr.write("\r\033[K")
+    if 'error' in outcome:
+        raise outcome['error']
+    output, transfer = outcome['result']
+    if output:
+        print(output)
+    if transfer:
+        print(f"{transfer['transferred']} at {transfer['rate']}", file=sys.stderr)
+
+def cmd_push(args):
+    run_remote(push_branch, args.repo, args.branch or current_branch(args.repo))
+
+def cmd_pull(args):
+    run_remote(pull_branch, args.repo, args.branch or current_branch(args.repo))
+
+def cmd_fetch(args):
+    run_remote(fetch_remote, args.repo)
+
+def cmd_create_repo(args):
+    manager = GitHubManager(load_token())
+    if not manager.token:
+        raise SystemExit("gitdash: no GitHub token (set GITHUB_TOKEN or use GitHub → Setup GitHub)")
+    success, result = manager.create_remote_repo(args.name, args.description, args.private)
+    if not success:
+        raise SystemExit(f"gitdash: {result}")
+    print(result)
+    if args.add_remote:
+        run_git(args.repo, 'remote', 'add', 'origin', result)
+
+# ==== Entry point ====
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="gitdash", description="GitDash repository tools without the GUI")
+    parser.add_argument("-C", dest="repo", default=".", metavar="PATH",
+                        help="run as if started in PATH (default: current directory)")
+    parser.add_argument("--timings", action="store_true",
+                        help="print wall time, git processes and bytes read to stderr as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    stats = commands.add_parser("stats", help="commit, branch and modified file counts")
+    stats.add_argument("--json", action="store_true")
+    stats.set_defaults(func=cmd_stats)
+
+    status = commands.add_parser("status", help="working tree and index status")
+    status.add_argument("--json", action="store_true")
+    status.set_defaults(func=cmd_status)
+
+    log = commands.add_parser("log", help="commit history of HEAD")
+    log.add_argument("-n", dest="max_count", type=int, default=20, help="number of commits (default: 20)")
+    log.add_argument("--json", action="store_true")
+    log.set_defaults(func=cmd_log)
+
+    branches = commands.add_parser("branches", help="local branches with ahead/behind counts")
+    branches.add_argument("--json", action="store_true")
+    branches.set_defaults(func=cmd_branches)
+
+    for name, func, help_text in (("push", cmd_push, "push a branch to origin (sets upstream)"),
+                                  ("pull", cmd_pull, "pull a branch from origin")):
+        remote = commands.add_parser(name, help=help_text)
+        remote.add_argument("branch", nargs="?", help="branch name (default: current branch)")
+        remote.set_defaults(func=func)
+
+    fetch = commands.add_parser("fetch", help="fetch origin")
+    fetch.set_defaults(func=cmd_fetch)
+
+    create = commands.add_parser("create-repo", help="create a GitHub repository")
+    create.add_argument("name")
+    create.add_argument("--description", default="")
+    create.add_argument("--private", action="store_true")
+    create.add_argument("--no-remote", dest="add_remote", action="store_false",
+                        help="don't add the new repository as origin")
+    create.set_defaults(func=cmd_create_repo)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        # Commands work from any subdirectory, like git itself
+        args.repo = run_git(args.repo, 'rev-parse', '--show-toplevel').decode('utf-8', 'surrogateescape').strip()
+        with measure(args.command):
+            args.func(args)
+    except GitError as e:
+        print(f"gitdash: {e.stderr or e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Output piped into head & co.
+        sys.stderr.close()
+    finally:
+        if args.timings and not sys.stderr.closed:
+            json.dump(INSTRUMENTATION.summary(), sys.stderr, indent=2)
+            sys.stderr.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
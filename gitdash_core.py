@@ -0,0 +1,1891 @@
+# gitdash_core.py - Git and GitHub operations shared by the GitDash GUI and CLI
+#
+# Only the standard library and the git executable are needed here: no Qt and
+# no GitPython. PyGithub and requests are imported on first use, so scripts that
+# never talk to GitHub don't pay for them.
+
+import os
+import sys
+import subprocess
+import datetime
+import json
+import re
+import signal
+import base64
+import threading
+import collections
+import contextlib
+import time
+import hashlib
+import mmap
+import tempfile
+import importlib.util
+import urllib.parse
+from array import array
+
+GITHUB_AVAILABLE = importlib.util.find_spec("github") is not None
+
+# ==== Instrumentation ====
+
+class OperationStats:
+    """Rolling window of samples for one operation name"""
+    WINDOW = 512
+
+    def __init__(self):
+        self.samples = collections.deque(maxlen=self.WINDOW)  # (wall_ms, processes, bytes_read)
+        self.count = 0
+        self.failures = 0
+
+    def percentile(self, values, fraction):
+        # Nearest-rank on the sorted window
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+    def summary(self):
+        walls = sorted(sample[0] for sample in self.samples)
+        window = len(self.samples) or 1
+        return {
+            'count': self.count,
+            'failures': self.failures,
+            'p50_ms': round(self.percentile(walls, 0.50), 2) if walls else 0,
+            'p95_ms': round(self.percentile(walls, 0.95), 2) if walls else 0,
+            'p99_ms': round(self.percentile(walls, 0.99), 2) if walls else 0,
+            'max_ms': round(walls[-1], 2) if walls else 0,
+            'processes_per_op': round(sum(sample[1] for sample in self.samples) / window, 2),
+            'bytes_per_op': round(sum(sample[2] for sample in self.samples) / window)
+        }
+
+class Instrumentation:
+    """Per-operation wall time, git process count and bytes read.
+
+    Operations are timed with measure(name); every git process started on
+    the same thread meanwhile is counted against it through count_process().
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = {}
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        outer = getattr(self._local, 'sample', None)
+        sample = self._local.sample = [0, 0]
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            wall_ms = (time.perf_counter() - started) * 1000
+            self._local.sample = outer
+            if outer is not None:
+                # Nested operations also count toward the enclosing one
+                outer[0] += sample[0]
+                outer[1] += sample[1]
+            self.record(name, wall_ms, sample[0], sample[1], failed)
+
+    def count_process(self, bytes_read):
+        sample = getattr(self._local, 'sample', None)
+        if sample is not None:
+            sample[0] += 1
+            sample[1] += bytes_read
+
+    def record(self, name, wall_ms, processes=0, bytes_read=0, failed=False):
+        with self._lock:
+            stats = self._operations.get(name)
+            if stats is None:
+                stats = self._operations[name] = OperationStats()
+            stats.samples.append((wall_ms, processes, bytes_read))
+            stats.count += 1
+            stats.failures += failed
+
+    def summary(self):
+        """{operation: {count, failures, p50_ms, p95_ms, p99_ms, max_ms, ...}}"""
+        with self._lock:
+            return {name: stats.summary() for name, stats in sorted(self._operations.items())}
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+
+    def export(self, path, **extra):
+        """Write the summary (plus any extra top-level fields) as JSON"""
+        data = dict(extra, generated_at=time.time(), operations=self.summary())
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+INSTRUMENTATION = Instrumentation()
+measure = INSTRUMENTATION.measure
+count_process = INSTRUMENTATION.count_process
+
+# ==== Git processes ====
+
+class GitError(Exception):
+    """A git process exited with a non-zero status"""
+    def __init__(self, command, status, stderr=b''):
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode('utf-8', 'replace')
+        self.command = list(command)
+        self.status = status
+        self.stderr = stderr.strip()
+        super().__init__(f"'{' '.join(self.command)}' failed with exit code {status}\n{self.stderr}")
+
+def run_git(repo_path, *args, input=None):
+    """Run `git -C repo_path <args>` and return its stdout as bytes"""
+    command = ['git', '-C', repo_path] + list(args)
+    result = subprocess.run(command, input=input, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    count_process(len(result.stdout))
+    if result.returncode != 0:
+        raise GitError(command, result.returncode, result.stderr)
+    return result.stdout
+
+def remote_url(repo_path, remote='origin'):
+    return run_git(repo_path, 'remote', 'get-url', remote).decode('utf-8', 'replace').strip()
+
+class Job:
+    """Cancellation flag and progress callback for one operation.
+
+    Operations below take the job as their first argument. The GUI passes
+    its RepoJob threads (same interface); scripts pass a Job.
+    """
+    def __init__(self, on_progress=None):
+        self.on_progress = on_progress
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def wait_cancelled(self, timeout):
+        """Block up to timeout seconds; True once the job has been cancelled"""
+        return self._cancel_event.wait(timeout)
+
+    def report_progress(self, payload):
+        if self.on_progress and not self.is_cancelled():
+            self.on_progress(payload)
+
+def resolve_git_dirs(git_dir):
+    """Return (git_dir, common_dir) for a repository or linked worktree"""
+    common_dir = git_dir
+    commondir_file = os.path.join(git_dir, "commondir")
+    if os.path.isfile(commondir_file):
+        with open(commondir_file, 'r') as f:
+            common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    return git_dir, common_dir
+
+def read_ref_sha(common_dir, ref_name):
+    """Resolve a ref to its sha from loose ref files or packed-refs (no git process)"""
+    loose_path = os.path.join(common_dir, ref_name)
+    if os.path.isfile(loose_path):
+        with open(loose_path, 'r') as f:
+            value = f.read().strip()
+        if value.startswith("ref: "):
+            return read_ref_sha(common_dir, value[5:])
+        return value or None
+    return read_packed_refs(common_dir).get(ref_name)
+
+_packed_refs_cache = {}
+
+def read_packed_refs(common_dir):
+    """Parse packed-refs into {ref_name: sha}, cached until the file changes"""
+    packed_path = os.path.join(common_dir, "packed-refs")
+    try:
+        stat = os.stat(packed_path)
+    except OSError:
+        return {}
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _packed_refs_cache.get(packed_path)
+    if cached and cached[0] == key:
+        return cached[1]
+    refs = {}
+    with open(packed_path, 'r') as f:
+        for line in f:
+            if line.startswith(("#", "^")):
+                continue
+            parts = line.split()
+            if len(parts) == 2:
+                refs[parts[1]] = parts[0]
+    _packed_refs_cache[packed_path] = (key, refs)
+    return refs
+
+def read_head_sha(git_dir):
+    """Resolve HEAD to a sha by reading the ref files directly, None if unborn"""
+    git_dir, common_dir = resolve_git_dirs(git_dir)
+    with open(os.path.join(git_dir, "HEAD"), 'r') as f:
+        head = f.read().strip()
+    if not head.startswith("ref: "):
+        return head  # Detached HEAD
+    ref_name = head[5:]
+    # Per-worktree refs live next to HEAD, shared refs in the common dir
+    if os.path.isfile(os.path.join(git_dir, ref_name)):
+        return read_ref_sha(git_dir, ref_name)
+    return read_ref_sha(common_dir, ref_name)
+
+class RepoStatsEngine:
+    """Incremental repository statistics for the status bar.
+
+    The commit count is cached against the HEAD sha. When HEAD moves only the
+    range between the old and new tip is counted; a full ``rev-list --count``
+    is taken only on first use or when history was rewritten. The branch
+    count is cached against the branch ref files and only recounted when one
+    of them is added or removed.
+    """
+    def __init__(self, repo_path):
+        self.repo_path = repo_path
+        self.git_dir = find_git_dir(repo_path)
+        self.head_sha = None
+        self.commit_count = 0
+        self.branch_stamp = None
+        self.branch_count = 0
+        self._lock = threading.Lock()
+
+    def count_commits(self):
+        """Return the number of commits reachable from HEAD"""
+        with self._lock:
+            return self._count_commits()
+
+    def _count_commits(self):
+        head_sha = read_head_sha(self.git_dir)
+        if head_sha == self.head_sha:
+            return self.commit_count
+        
+        if head_sha is None:
+            # Unborn branch (empty repository)
+            count = 0
+        elif self.head_sha is None:
+            count = self._full_count(head_sha)
+        else:
+            try:
+                # Commits only in old tip (left) / only in new tip (right)
+                out = run_git(self.repo_path, 'rev-list', '--left-right', '--count', f"{self.head_sha}...{head_sha}")
+                removed, added = (int(n) for n in out.split())
+                if removed:
+                    # History was rewritten (reset, rebase, amend...)
+                    count = self._full_count(head_sha)
+                else:
+                    count = self.commit_count + added
+            except GitError:
+                # Old tip no longer exists (e.g. pruned)
+                count = self._full_count(head_sha)
+        
+        self.head_sha = head_sha
+        self.commit_count = count
+        return count
+
+    def _full_count(self, head_sha):
+        return int(run_git(self.repo_path, 'rev-list', '--count', head_sha))
+
+    def count_branches(self):
+        """Return the number of local branches"""
+        # Taken before counting: a branch created meanwhile is picked up next time
+        stamp = ref_files_stamp(self.git_dir, 'refs/heads/')
+        with self._lock:
+            if stamp is None or stamp != self.branch_stamp:
+                self.branch_count = run_git(self.repo_path, 'for-each-ref', '--format=x', 'refs/heads').count(b'\n')
+                self.branch_stamp = stamp
+            return self.branch_count
+
+class StatusEntry:
+    """Index (X) and worktree (Y) state of one path, as in porcelain v2"""
+    __slots__ = ('path', 'orig_path', 'index_status', 'worktree_status')
+
+    def __init__(self, path, index_status, worktree_status, orig_path=None):
+        self.path = path
+        self.orig_path = orig_path
+        self.index_status = index_status
+        self.worktree_status = worktree_status
+
+    def key(self):
+        return (self.path, self.index_status, self.worktree_status)
+
+    def row_kinds(self):
+        """Stage panel rows for this path: untracked, modified and/or staged"""
+        if self.index_status == '?':
+            return ('untracked',)
+        kinds = ()
+        if self.worktree_status != '.':
+            kinds += ('modified',)
+        if self.index_status != '.':
+            kinds += ('staged',)
+        return kinds
+
+class StatusSnapshot:
+    """Result of one `git status --porcelain=v2` scan.
+
+    A single snapshot per refresh feeds the stage tree, stage_all,
+    commit_changes and the status bar stats, so the worktree and index are
+    only scanned once.
+    """
+    def __init__(self):
+        self.entries = {}
+        self.head_oid = None
+        self.branch = None
+        self.upstream = None
+        self.ahead = 0
+        self.behind = 0
+
+    @property
+    def untracked(self):
+        return [e.path for e in self.entries.values() if e.index_status == '?']
+
+    @property
+    def unstaged(self):
+        return [e.path for e in self.entries.values()
+                if e.index_status != '?' and e.worktree_status != '.']
+
+    @property
+    def staged(self):
+        return [e.path for e in self.entries.values()
+                if e.index_status not in ('?', '.')]
+
+    @property
+    def conflicted(self):
+        return [e.path for e in self.entries.values() if e.index_status == 'U' or e.worktree_status == 'U']
+
+    def has_unstaged_changes(self):
+        return any(e.index_status == '?' or e.worktree_status != '.' for e in self.entries.values())
+
+    def has_staged_changes(self):
+        return any(e.index_status not in ('?', '.') for e in self.entries.values())
+
+    def unstaged_paths(self, paths):
+        """The ones among paths that are untracked or changed in the worktree"""
+        entries = self.entries
+        return [path for path in paths
+                if path in entries and (entries[path].index_status == '?' or entries[path].worktree_status != '.')]
+
+    def staged_paths(self, paths):
+        """The ones among paths with changes in the index"""
+        entries = self.entries
+        return [path for path in paths if path in entries and entries[path].index_status not in ('?', '.')]
+
+    def apply_staged(self, paths):
+        """Update entries after `git add paths`; returns the paths that changed"""
+        changed = []
+        for path in paths:
+            entry = self.entries.get(path)
+            if entry is None or entry.worktree_status == '.':
+                continue
+            if entry.index_status == '?':
+                entry.index_status = 'A'
+            elif entry.worktree_status == 'D':
+                if entry.index_status == 'A':
+                    # Added, then deleted: nothing left to track
+                    del self.entries[path]
+                    changed.append(path)
+                    continue
+                entry.index_status = 'D'
+            elif entry.index_status in ('.', 'M', 'T'):
+                entry.index_status = 'A' if entry.worktree_status == 'A' else entry.worktree_status
+            entry.worktree_status = '.'
+            changed.append(path)
+        return changed
+
+    def apply_unstaged(self, paths):
+        """Update entries after `git reset paths`; returns the paths that changed"""
+        changed = []
+        for path in paths:
+            entry = self.entries.get(path)
+            if entry is None or entry.index_status in ('?', '.'):
+                continue
+            changed.append(path)
+            if entry.index_status in ('A', 'R', 'C'):
+                if entry.index_status == 'R' and entry.orig_path:
+                    # The rename source reappears as a deleted file
+                    self._add(StatusEntry(entry.orig_path, '.', 'D'))
+                    changed.append(entry.orig_path)
+                if entry.worktree_status == 'D':
+                    del self.entries[path]
+                else:
+                    entry.index_status = entry.worktree_status = '?'
+                    entry.orig_path = None
+            else:
+                if entry.worktree_status != 'D':
+                    entry.worktree_status = 'D' if entry.index_status == 'D' else (
+                        'T' if entry.index_status == 'T' else 'M')
+                entry.index_status = '.'
+        return changed
+
+    def apply_committed(self, head_oid):
+        """Update entries after committing the index; returns the paths that changed"""
+        changed = []
+        for path, entry in list(self.entries.items()):
+            if entry.index_status in ('?', '.'):
+                continue
+            changed.append(path)
+            if entry.worktree_status == '.':
+                del self.entries[path]
+            else:
+                # Worktree changes on top of the commit stay unstaged
+                entry.index_status = '.'
+                entry.orig_path = None
+        if self.upstream and self.head_oid:
+            self.ahead += 1
+        self.head_oid = head_oid
+        return changed
+
+    def row_keys(self):
+        """(path, kind) of every stage panel row this snapshot produces"""
+        return {(path, kind) for path, entry in self.entries.items() for kind in entry.row_kinds()}
+
+    def same_entries(self, other):
+        return other is not None and self.entries.keys() == other.entries.keys() and all(
+            entry.key() == other.entries[path].key() for path, entry in self.entries.items()
+        )
+
+    @classmethod
+    def scan(cls, repo_path, job=None, untracked='all'):
+        """Take a snapshot with a single streaming `git status --porcelain=v2 -z`"""
+        args = ['git', '-C', repo_path, 'status', '--porcelain=v2', '-z',
+                '--branch', f'--untracked-files={untracked}']
+        proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        snapshot = cls()
+        bytes_read = 0
+        try:
+            tail = b''
+            pending_rename = None
+            while True:
+                chunk = proc.stdout.read1(65536)
+                if not chunk:
+                    break
+                bytes_read += len(chunk)
+                records = (tail + chunk).split(b'\0')
+                tail = records.pop()
+                for record in records:
+                    if pending_rename is not None:
+                        # Second field of a rename/copy record is the original path
+                        pending_rename.orig_path = record.decode('utf-8', 'surrogateescape')
+                        pending_rename = None
+                    else:
+                        pending_rename = snapshot._parse_record(record.decode('utf-8', 'surrogateescape'))
+                if job is not None and job.is_cancelled():
+                    break
+            
+            if job is not None and job.is_cancelled():
+                return snapshot
+            stderr = proc.stderr.read()
+            if proc.wait() != 0:
+                raise GitError(args, proc.returncode, stderr)
+            return snapshot
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
+            count_process(bytes_read)
+
+    def _parse_record(self, record):
+        """Parse one record; returns the entry when an original path follows"""
+        kind = record[:1]
+        if kind == '#':
+            header, _, value = record[2:].partition(' ')
+            if header == 'branch.oid':
+                self.head_oid = None if value == '(initial)' else value
+            elif header == 'branch.head':
+                self.branch = None if value == '(detached)' else value
+            elif header == 'branch.upstream':
+                self.upstream = value
+            elif header == 'branch.ab':
+                ahead, behind = value.split()
+                self.ahead, self.behind = int(ahead), -int(behind)
+        elif kind == '1':
+            fields = record.split(' ', 8)
+            self._add(StatusEntry(fields[8], fields[1][0], fields[1][1]))
+        elif kind == '2':
+            fields = record.split(' ', 9)
+            entry = StatusEntry(fields[9], fields[1][0], fields[1][1])
+            self._add(entry)
+            return entry
+        elif kind == 'u':
+            fields = record.split(' ', 10)
+            self._add(StatusEntry(fields[10], fields[1][0], fields[1][1]))
+        elif kind == '?':
+            self._add(StatusEntry(record[2:], '?', '?'))
+        return None
+
+    def _add(self, entry):
+        self.entries[entry.path] = entry
+
+# ==== Git operations ====
+# Each operation is called as func(job, ...) - on a RepoJob thread in the GUI -
+# runs its own git processes and returns plain data.
+
+class BranchInfo:
+    """A local branch and how it compares to its upstream"""
+    __slots__ = ('name', 'upstream', 'ahead', 'behind', 'gone')
+
+    def __init__(self, name, upstream=None, ahead=0, behind=0, gone=False):
+        self.name = name
+        self.upstream = upstream
+        self.ahead = ahead
+        self.behind = behind
+        self.gone = gone
+
+    @classmethod
+    def from_track(cls, name, upstream, track):
+        # track is "ahead 2, behind 1", "behind 3", "gone" or "" (in sync)
+        info = cls(name, upstream or None, gone=(track == 'gone'))
+        for part in track.split(', '):
+            if part.startswith('ahead '):
+                info.ahead = int(part[6:])
+            elif part.startswith('behind '):
+                info.behind = int(part[7:])
+        return info
+
+    def track_text(self):
+        if self.gone:
+            return "upstream gone"
+        return " ".join(text for count, text in ((self.ahead, f"↑{self.ahead}"), (self.behind, f"↓{self.behind}")) if count)
+
+BRANCH_FORMAT = '%00'.join(['%(HEAD)', '%(refname:short)', '%(upstream:short)', '%(upstream:track,nobracket)'])
+
+def read_branches(job, repo_path):
+    """Return (current branch or None, [BranchInfo]) from one for-each-ref call"""
+    output = run_git(repo_path, 'for-each-ref', f'--format={BRANCH_FORMAT}', 'refs/heads')
+    current = None
+    branches = []
+    for line in output.decode('utf-8', 'replace').splitlines():
+        head, name, upstream, track = line.split('\0')
+        if head == '*':
+            current = name
+        branches.append(BranchInfo.from_track(name, upstream, track))
+    return current, branches
+
+REF_KINDS = (('local', 'refs/heads/'), ('remote', 'refs/remotes/'), ('tag', 'refs/tags/'))
+
+class RefInfo(BranchInfo):
+    """A branch, remote-tracking branch or tag with its last commit"""
+    __slots__ = ('ref_name', 'kind', 'sha', 'timestamp', 'author')
+
+    def __init__(self, ref_name, sha, timestamp=None, author="", upstream=None):
+        for kind, prefix in REF_KINDS:
+            if ref_name.startswith(prefix):
+                break
+        super().__init__(ref_name[len(prefix):], upstream)
+        self.ref_name = ref_name
+        self.kind = kind
+        self.sha = sha
+        self.timestamp = timestamp
+        self.author = author
+
+# Annotated tags have no author; fall back to the tagged commit's, then the tagger
+REF_FORMAT = '%00'.join(['%(symref)', '%(refname)', '%(objectname)', '%(creatordate:unix)', '%(authorname)',
+                         '%(*authorname)', '%(taggername)', '%(upstream:short)', '%(upstream:track,nobracket)'])
+
+def scan_ref_files(git_dir):
+    """{ref name: sha} of branches, remote-tracking branches and tags.
+
+    Reads packed-refs and the loose ref files directly, without starting
+    git. Returns None when refs are not stored that way (reftable).
+    """
+    git_dir, common_dir = resolve_git_dirs(git_dir)
+    if os.path.exists(os.path.join(common_dir, 'reftable')):
+        return None
+    prefixes = tuple(prefix for kind, prefix in REF_KINDS)
+    refs = {name: sha for name, sha in read_packed_refs(common_dir).items() if name.startswith(prefixes)}
+    for prefix in prefixes:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(common_dir, prefix)):
+            for filename in filenames:
+                if filename.endswith('.lock'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, common_dir).replace(os.sep, '/')
+                try:
+                    with open(path, 'r') as f:
+                        value = f.read().strip()
+                except OSError:
+                    continue
+                if value.startswith('ref: '):
+                    # Symbolic (origin/HEAD); for-each-ref skips those too
+                    refs.pop(name, None)
+                elif value:
+                    refs[name] = value
+    return refs
+
+def ref_files_stamp(git_dir, prefix):
+    """Stamp of the refs under prefix that changes when one is added or removed.
+
+    Made of packed-refs' size and mtime and the mtime of every loose ref
+    directory (git creates, renames and deletes ref files there). None when
+    refs are not stored as files (reftable).
+    """
+    git_dir, common_dir = resolve_git_dirs(git_dir)
+    if os.path.exists(os.path.join(common_dir, 'reftable')):
+        return None
+    try:
+        stat = os.stat(os.path.join(common_dir, 'packed-refs'))
+        stamp = [(stat.st_mtime_ns, stat.st_size)]
+    except OSError:
+        stamp = [None]
+    for dirpath, dirnames, filenames in os.walk(os.path.join(common_dir, prefix)):
+        try:
+            stamp.append((dirpath, os.stat(dirpath).st_mtime_ns))
+        except OSError:
+            # Removed while walking (an emptied directory being pruned)
+            return None
+    return tuple(stamp)
+
+def read_current_branch(git_dir):
+    """Checked-out branch name from HEAD, None when detached"""
+    with open(os.path.join(git_dir, "HEAD"), 'r') as f:
+        head = f.read().strip()
+    return head[len("ref: refs/heads/"):] if head.startswith("ref: refs/heads/") else None
+
+def config_stamp(git_dir):
+    # Upstream settings live in config; a change there invalidates tracking info
+    git_dir, common_dir = resolve_git_dirs(git_dir)
+    try:
+        stat = os.stat(os.path.join(common_dir, 'config'))
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+class RefIndex:
+    """Every branch, remote-tracking branch and tag of a repository.
+
+    Names are kept lower-cased in ref order so filtering is a scan over
+    plain strings. Refining a query (typing another character) only searches
+    the previous query's matches.
+    """
+    def __init__(self, refs, current=None, stamp=None, complete=True):
+        self.refs = refs
+        self.current = current
+        self.stamp = stamp
+        # False while only names and shas are known (no dates or tracking yet)
+        self.complete = complete
+        self.shas = {ref.ref_name: ref.sha for ref in refs}
+        self._keys = [ref.name.lower() for ref in refs]
+        self._last_query = None
+        self._last_matches = None
+
+    def __len__(self):
+        return len(self.refs)
+
+    def filter(self, query):
+        """Indices of refs matching query: prefix matches first, then fuzzy ones.
+
+        A prefix match starts the name or one of its path segments ("feat"
+        finds "origin/feature/login"); a fuzzy match contains the query's
+        characters in order ("fln" finds it too).
+        """
+        query = query.strip().lower()
+        if not query:
+            return list(range(len(self.refs)))
+        candidates = range(len(self.refs))
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_matches
+        pattern = re.compile('.*?'.join(map(re.escape, query)))
+        segment = '/' + query
+        keys = self._keys
+        prefix, fuzzy = [], []
+        for i in candidates:
+            key = keys[i]
+            if key.startswith(query) or segment in key:
+                prefix.append(i)
+            else:
+                match = pattern.search(key)
+                if match:
+                    fuzzy.append((match.end() - match.start(), i))
+        fuzzy.sort()
+        matches = prefix + [i for span, i in fuzzy]
+        self._last_query, self._last_matches = query, sorted(matches)
+        return matches
+
+def read_ref_index(job, repo_path, previous=None):
+    """RefIndex of repo_path, reusing previous when no ref moved.
+
+    The ref files are read directly first. If they match previous (and the
+    config is unchanged), previous is returned with a fresh current branch
+    and no git process runs. Otherwise one for-each-ref pass collects dates,
+    authors and tracking; when there is nothing to show yet, the bare names
+    are reported through job.report_progress while it runs.
+    """
+    git_dir = find_git_dir(repo_path)
+    current = read_current_branch(git_dir)
+    stamp = config_stamp(git_dir)
+    files = scan_ref_files(git_dir)
+    if files is not None:
+        if previous is not None and previous.complete and previous.stamp == stamp and previous.shas == files:
+            previous.current = current
+            return previous
+        if previous is None and job is not None:
+            quick = [RefInfo(name, sha) for name, sha in sorted(files.items())]
+            job.report_progress(RefIndex(quick, current, stamp, complete=False))
+    
+    output = run_git(repo_path, 'for-each-ref', f'--format={REF_FORMAT}',
+                     *(prefix for kind, prefix in REF_KINDS))
+    refs = []
+    for line in output.decode('utf-8', 'replace').splitlines():
+        symref, ref_name, sha, date, author, tagged_author, tagger, upstream, track = line.split('\0')
+        if symref:
+            continue
+        ref = RefInfo(ref_name, sha, int(date) if date else None, author or tagged_author or tagger)
+        if upstream:
+            tracking = BranchInfo.from_track(ref.name, upstream, track)
+            ref.upstream, ref.ahead, ref.behind, ref.gone = upstream, tracking.ahead, tracking.behind, tracking.gone
+        refs.append(ref)
+    return RefIndex(refs, current, stamp)
+
+def read_status(job, repo_path):
+    """Return a StatusSnapshot of the index and worktree"""
+    return StatusSnapshot.scan(repo_path, job)
+
+def list_worktree_files(job, repo_path):
+    """Return tracked and untracked (non-ignored) paths for the file watcher"""
+    output = run_git(repo_path, 'ls-files', '-z', '--cached', '--others', '--exclude-standard')
+    return [path for path in output.decode('utf-8', 'surrogateescape').split('\0') if path]
+
+def read_ignored(repo_path, paths):
+    """The ones among repo-relative paths that .gitignore & co. exclude"""
+    if not paths:
+        return set()
+    try:
+        output = run_git(repo_path, 'check-ignore', '-z', '--stdin',
+                         input=b'\0'.join(path.encode('utf-8', 'surrogateescape') for path in paths))
+    except GitError as e:
+        if e.status == 1:
+            # None of them is ignored
+            return set()
+        raise
+    return {path for path in output.decode('utf-8', 'surrogateescape').split('\0') if path}
+
+def load_repo_cache(cache_path):
+    """Read cached repository listing pages, [] if missing or unreadable"""
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f).get('pages', [])
+    except (OSError, ValueError):
+        return []
+
+def stream_github_repos(job, github_manager, cache_path):
+    """Fetch the repository listing page by page, reporting each page as it arrives"""
+    pages = []
+    for page, changed in github_manager.iter_repo_pages(load_repo_cache(cache_path)):
+        if job.is_cancelled():
+            return len(pages)
+        job.report_progress((len(pages), page['rows'], changed))
+        pages.append(page)
+    
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'pages': pages}, f)
+    os.replace(tmp_path, cache_path)
+    return len(pages)
+
+def read_github_identity(job, github_manager):
+    """Return (login, name) for the configured token"""
+    return github_manager.get_identity()
+
+def read_github_login(job, github_manager):
+    """Return the login of the token's user (memoized by the client)"""
+    return github_manager.get_login()
+
+def read_stats(job, stats_engine):
+    """Return (commit count, branch count)"""
+    return stats_engine.count_commits(), stats_engine.count_branches()
+
+# Selections larger than this are passed to git on stdin instead of argv
+PATHSPEC_ARGV_LIMIT = 200
+
+def run_git_on_paths(job, repo_path, args, paths):
+    """Run `git <args>` on many paths with a single process.
+
+    Paths are taken literally (no glob magic); large selections go through
+    --pathspec-from-file on stdin so they never hit the argv size limit.
+    """
+    args = ['--literal-pathspecs'] + list(args)
+    stdin = None
+    if len(paths) > PATHSPEC_ARGV_LIMIT:
+        args += ['--pathspec-from-file=-', '--pathspec-file-nul']
+        stdin = b'\0'.join(path.encode('utf-8', 'surrogateescape') for path in paths)
+    else:
+        args += ['--'] + list(paths)
+    return run_git(repo_path, *args, input=stdin)
+
+def stage_all_changes(job, repo_path):
+    """Stage every change in the worktree, new and deleted files included"""
+    return run_git(repo_path, 'add', '--all')
+
+def commit_staged(job, repo_path, message):
+    """Commit the index with `git commit` (hooks included); returns the new CommitRecord"""
+    # Untracked files can't end up in the commit; don't let git look for them
+    run_git(repo_path, 'commit', '--quiet', '--untracked-files=no', '--file=-',
+            input=message.encode('utf-8'))
+    return next(iter_log(repo_path, 'HEAD', max_count=1))
+
+# git redraws progress lines in place with \r, e.g.
+#   "Writing objects:  45% (9/20), 1.20 MiB | 2.00 MiB/s"
+GIT_PROGRESS_RE = re.compile(
+    r'^(?:remote: )?(?P<stage>[A-Za-z][A-Za-z ]*?):\s+(?P<percent>\d+)% \((?P<done>\d+)/(?P<total>\d+)\)'
+    r'(?:, (?P<transferred>[\d.]+ (?:bytes|[KMGT]iB))(?: \| (?P<rate>[\d.]+ (?:bytes|[KMGT]iB)/s))?)?'
+)
+
+def parse_git_progress(line):
+    """Parse one line of git --progress output into a dict, None if it isn't one"""
+    match = GIT_PROGRESS_RE.match(line)
+    if not match:
+        return None
+    progress = match.groupdict()
+    for field in ('percent', 'done', 'total'):
+        progress[field] = int(progress[field])
+    return progress
+
+def _signal_process_group(process, sig):
+    # git runs its transport (ssh, remote-https, upload-pack) as children that
+    # hold our pipes open, so the whole group has to go, not just git itself
+    if os.name == 'posix':
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass
+    elif sig == signal.SIGTERM:
+        process.terminate()
+    else:
+        process.kill()
+
+def _terminate_on_cancel(job, process, grace=5):
+    # Runs beside the reader: SIGTERM on cancel, SIGKILL if git ignores it
+    while process.poll() is None:
+        if job.wait_cancelled(0.2):
+            _signal_process_group(process, signal.SIGTERM)
+            try:
+                process.wait(grace)
+            except subprocess.TimeoutExpired:
+                _signal_process_group(process, getattr(signal, 'SIGKILL', signal.SIGTERM))
+            return
+
+def run_remote_git(job, repo_path, args, env):
+    """Run a network git command or checkout, streaming its --progress output to the job.
+
+    Returns (stdout, transfer) where transfer is the last progress line that
+    carried a byte count and rate, or None. Cancelling the job stops git.
+    """
+    command = ['git', '-C', repo_path] + list(args)
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               env=dict(os.environ, **env), start_new_session=(os.name == 'posix'))
+    stdout = []
+    reader = threading.Thread(target=lambda: stdout.append(process.stdout.read()), daemon=True)
+    reader.start()
+    threading.Thread(target=_terminate_on_cancel, args=(job, process), daemon=True).start()
+    
+    messages = []
+    transfer = None
+    pending = b''
+    stderr_bytes = 0
+    while True:
+        chunk = process.stderr.read1(8192)
+        if not chunk:
+            break
+        stderr_bytes += len(chunk)
+        *lines, pending = re.split(rb'[\r\n]', pending + chunk)
+        for raw_line in lines:
+            line = raw_line.decode('utf-8', 'replace').strip()
+            if not line:
+                continue
+            progress = parse_git_progress(line)
+            if progress is None:
+                messages.append(line)
+                continue
+            if progress['rate']:
+                transfer = progress
+            job.report_progress(progress)
+    if pending.strip():
+        messages.append(pending.decode('utf-8', 'replace').strip())
+    
+    process.wait()
+    reader.join()
+    count_process(len(stdout[0]) + stderr_bytes)
+    if process.returncode != 0 and not job.is_cancelled():
+        raise GitError(command, process.returncode, '\n'.join(messages))
+    return stdout[0].decode('utf-8', 'replace').strip(), transfer
+
+def github_auth_env(remote_url, token):
+    """Environment that authenticates git's HTTPS requests to remote_url's host.
+
+    The token travels as an http.<host>.extraHeader passed through
+    GIT_CONFIG_COUNT/KEY/VALUE, so it never touches .git/config or shows up
+    in the process list, and concurrent remote operations don't race.
+    """
+    env = {'GIT_TERMINAL_PROMPT': '0'}
+    parsed = urllib.parse.urlparse(remote_url)
+    if parsed.scheme == 'https' and token:
+        host = parsed.hostname + (f":{parsed.port}" if parsed.port else "")
+        credentials = base64.b64encode(f"x-access-token:{token}".encode()).decode()
+        env.update({
+            'GIT_CONFIG_COUNT': '1',
+            'GIT_CONFIG_KEY_0': f"http.https://{host}/.extraHeader",
+            'GIT_CONFIG_VALUE_0': f"Authorization: Basic {credentials}"
+        })
+    return env
+
+def push_branch(job, repo_path, branch, github_manager):
+    """Push branch to origin (setting upstream), authenticating with the GitHub token"""
+    env = github_auth_env(remote_url(repo_path), github_manager.token)
+    return run_remote_git(job, repo_path, ['push', '--progress', '--porcelain', '--set-upstream', 'origin', branch], env)
+
+def pull_branch(job, repo_path, branch, github_manager):
+    """Pull branch from origin, authenticating with the GitHub token"""
+    env = github_auth_env(remote_url(repo_path), github_manager.token)
+    return run_remote_git(job, repo_path, ['pull', '--progress', 'origin', branch], env)
+
+def fetch_remote(job, repo_path, github_manager, background=False):
+    """Fetch origin, authenticating with the GitHub token"""
+    env = github_auth_env(remote_url(repo_path), github_manager.token)
+    if background and 'GIT_SSH_COMMAND' not in os.environ:
+        # Nobody is there to answer an ssh passphrase or host key prompt
+        env['GIT_SSH_COMMAND'] = 'ssh -o BatchMode=yes'
+    return run_remote_git(job, repo_path, ['fetch', '--progress', '--prune', 'origin'], env)
+
+def checkout_ref(job, repo_path, args):
+    """Run git checkout with its "Updating files" progress streamed to the job.
+
+    Returns (old_sha, new_sha, branch): HEAD before and after, and the branch
+    now checked out (None when detached).
+    """
+    git_dir = find_git_dir(repo_path)
+    old_sha = read_head_sha(git_dir)
+    run_remote_git(job, repo_path, ['checkout', '--progress'] + list(args), {})
+    return old_sha, read_head_sha(git_dir), read_current_branch(git_dir)
+
+class WorkspaceStatus:
+    """Branch and change counts of one workspace repository"""
+    __slots__ = ('path', 'branch', 'upstream', 'ahead', 'behind', 'staged', 'modified',
+                 'untracked', 'conflicted', 'elapsed', 'error')
+
+    def __init__(self, path, error=None):
+        self.path = path
+        self.branch = None
+        self.upstream = None
+        self.ahead = self.behind = 0
+        self.staged = self.modified = self.untracked = self.conflicted = 0
+        self.elapsed = 0.0
+        self.error = error
+
+    @classmethod
+    def from_snapshot(cls, path, snapshot):
+        status = cls(path)
+        status.branch = snapshot.branch
+        status.upstream = snapshot.upstream
+        status.ahead = snapshot.ahead
+        status.behind = snapshot.behind
+        status.staged = len(snapshot.staged)
+        status.modified = len(snapshot.unstaged)
+        status.untracked = len(snapshot.untracked)
+        status.conflicted = len(snapshot.conflicted)
+        return status
+
+# Each scan is one git process; a thread per slot only waits on it
+WORKSPACE_SCAN_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+
+def scan_workspace_repo(repo_path):
+    """Return the WorkspaceStatus of one repository; errors are captured, not raised"""
+    started = time.monotonic()
+    try:
+        # Untracked directories are collapsed; the dashboard only needs counts
+        status = WorkspaceStatus.from_snapshot(repo_path, StatusSnapshot.scan(repo_path, untracked='normal'))
+    except Exception as e:
+        status = WorkspaceStatus(repo_path, error=str(e).strip())
+    status.elapsed = time.monotonic() - started
+    return status
+
+def scan_workspace(job, repo_paths):
+    """Scan many repositories concurrently, reporting each one as it completes.
+
+    Up to WORKSPACE_SCAN_WORKERS `git status` processes run at once, so a full
+    pass takes about as long as the slowest repository. Returns the wall time.
+    """
+    import concurrent.futures  # pulls in logging; only the workspace needs it
+    
+    started = time.monotonic()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=WORKSPACE_SCAN_WORKERS)
+    try:
+        futures = [executor.submit(scan_workspace_repo, path) for path in repo_paths]
+        for future in concurrent.futures.as_completed(futures):
+            if job.is_cancelled():
+                break
+            job.report_progress(future.result())
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return time.monotonic() - started
+
+class CommitRecord:
+    """Lightweight commit metadata parsed from git log"""
+    __slots__ = ('sha', 'parents', 'author', 'author_email', 'timestamp', 'tz_minutes', 'subject')
+
+    # One NUL-separated field per slot; with -z every record also ends in NUL
+    LOG_FORMAT = '%x00'.join(['%H', '%P', '%an', '%ae', '%ct', '%cI', '%s'])
+    FIELD_COUNT = 7
+
+    def __init__(self, sha, parents, author, author_email, timestamp, tz_minutes, subject):
+        self.sha = sha
+        self.parents = parents
+        self.author = author
+        self.author_email = author_email
+        self.timestamp = timestamp
+        self.tz_minutes = tz_minutes
+        self.subject = subject
+
+    @classmethod
+    def from_fields(cls, fields):
+        sha, parents, author, email, timestamp, iso_date, subject = (
+            field.decode('utf-8', 'replace') for field in fields
+        )
+        # Committer timezone from the strict ISO date, e.g. "...T01:45:00+02:00"
+        offset = iso_date[-6:]
+        tz_minutes = int(offset[1:3]) * 60 + int(offset[4:6])
+        if offset[0] == '-':
+            tz_minutes = -tz_minutes
+        return cls(sha, parents.split(), author, email, int(timestamp), tz_minutes, subject)
+
+    def committed_datetime(self):
+        tz = datetime.timezone(datetime.timedelta(minutes=self.tz_minutes))
+        return datetime.datetime.fromtimestamp(self.timestamp, tz)
+
+def find_git_dir(work_dir):
+    """Return the git directory of a worktree (follows 'gitdir:' files)"""
+    dot_git = os.path.join(work_dir, ".git")
+    if os.path.isfile(dot_git):
+        with open(dot_git, 'r') as f:
+            content = f.read().strip()
+        if content.startswith("gitdir: "):
+            return os.path.normpath(os.path.join(work_dir, content[8:]))
+    return dot_git
+
+def iter_log(repo_path, *revs, max_count=None, extra_args=()):
+    """Stream CommitRecords from a single `git log -z` process.
+
+    Records are parsed as the output arrives, so callers that stop early
+    only pay for what they consumed; closing the generator ends the process.
+    """
+    args = ['git', '-C', repo_path, 'log', '-z', f'--format={CommitRecord.LOG_FORMAT}']
+    if max_count is not None:
+        args.append(f'--max-count={max_count}')
+    args.extend(extra_args)
+    args.extend(revs or ('HEAD',))
+    args.append('--')
+    
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    size = CommitRecord.FIELD_COUNT
+    bytes_read = 0
+    try:
+        fields = []
+        tail = b''
+        while True:
+            chunk = proc.stdout.read1(65536)
+            if not chunk:
+                break
+            bytes_read += len(chunk)
+            parts = (tail + chunk).split(b'\0')
+            tail = parts.pop()
+            fields.extend(parts)
+            while len(fields) >= size:
+                yield CommitRecord.from_fields(fields[:size])
+                del fields[:size]
+        if tail:
+            fields.append(tail)
+        if len(fields) == size:
+            yield CommitRecord.from_fields(fields)
+        
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            raise GitError(args, proc.returncode, stderr)
+    finally:
+        if proc.poll() is None:
+            # Consumer stopped early
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+        count_process(bytes_read)
+
+class CommitPager:
+    """Reads history page by page from one streaming git log"""
+    def __init__(self, repo_path, head_sha=None, seen=None):
+        # Pin the walk to the sha HEAD pointed at when the view was loaded
+        self.head_sha = head_sha or read_head_sha(find_git_dir(repo_path))
+        self.exhausted = self.head_sha is None
+        # Unborn branch: nothing to read (git log would fail)
+        self._records = iter(()) if self.exhausted else iter_log(repo_path, self.head_sha)
+        self._drained = self.exhausted
+        # Shas that are already loaded; the walk skips them
+        self._seen = seen or set()
+        # Last page handed out, kept until page_delivered()
+        self._page = []
+        self._lock = threading.Lock()
+
+    def next_page(self, job, size):
+        """Return up to size CommitRecords.
+
+        Records are read off the log stream only once, so the page stays with
+        the pager until page_delivered() confirms it: a call after a cancelled
+        job gets the same records again (topped up to size) instead of
+        skipping them.
+        """
+        with self._lock:
+            rows = list(self._page)
+            if len(rows) < size and not self._drained:
+                for record in self._records:
+                    if record.sha in self._seen:
+                        self._seen.discard(record.sha)
+                        continue
+                    rows.append(record)
+                    if len(rows) >= size or job.is_cancelled():
+                        break
+                else:
+                    self._drained = True
+            self._page = rows
+        return rows
+
+    def page_delivered(self, rows):
+        """Confirm that rows (the last page) were shown; the next page starts after them"""
+        with self._lock:
+            if rows is self._page:
+                self._page = []
+                self.exhausted = self._drained
+
+    def close(self):
+        with self._lock:
+            if not self._drained:
+                self._records.close()
+            self._drained = True
+            self._page = []
+            self.exhausted = True
+
+def fetch_commit_page(job, pager, size):
+    return pager.next_page(job, size)
+
+# More commits than this on either side and the view reloads instead
+NEW_COMMITS_LIMIT = 5000
+
+def fetch_head_change(job, repo_path, old_sha, new_sha, since=None):
+    """How history changes when HEAD moves from old_sha to new_sha.
+
+    Returns (dropped, added, deferred): the shas reachable only from old_sha,
+    the CommitRecords reachable only from new_sha (newest first) and how many
+    of those were left out because they were committed before since; paging
+    reaches them later. Returns None when old_sha is gone (pruned after a
+    rewrite) or either side has more than NEW_COMMITS_LIMIT commits; the
+    caller then reloads history from scratch.
+    """
+    try:
+        dropped = run_git(repo_path, 'rev-list', f'--max-count={NEW_COMMITS_LIMIT + 1}',
+                          old_sha, f'^{new_sha}', '--').decode().split()
+    except GitError:
+        return None
+    if len(dropped) > NEW_COMMITS_LIMIT:
+        return None
+    records = list(iter_log(repo_path, new_sha, f'^{old_sha}', max_count=NEW_COMMITS_LIMIT + 1))
+    if len(records) > NEW_COMMITS_LIMIT:
+        return None
+    added = [record for record in records if since is None or record.timestamp >= since]
+    return dropped, added, len(records) - len(added)
+
+# ==== History cache ====
+
+def _shifted(ends, offset):
+    # Offset a column of end positions without a Python-level loop
+    return array('Q', map(offset.__add__, ends)) if offset else array('Q', ends)
+
+class CommitColumns:
+    """Commit metadata stored column by column, newest commit first.
+
+    Packed binary shas and parents, arrays of timestamps and interned author
+    ids, one UTF-8 buffer for all subjects: a few dozen bytes per commit. The
+    history view keeps its rows in one and the history cache writes the
+    columns to disk as they are.
+    """
+    def __init__(self):
+        self.shas = bytearray()
+        self.times = array('q')
+        self.tz_minutes = array('h')
+        self.author_ids = array('I')
+        self.authors = []
+        self.author_index = {}
+        self.subjects = bytearray()
+        self.subject_ends = array('Q')
+        self.parents = bytearray()
+        self.parent_ends = array('Q')
+
+    def __len__(self):
+        return len(self.times)
+
+    @classmethod
+    def from_records(cls, records):
+        columns = cls()
+        for record in records:
+            columns.append_record(record)
+        return columns
+
+    def intern_author(self, author):
+        author_id = self.author_index.get(author)
+        if author_id is None:
+            author_id = self.author_index[author] = len(self.authors)
+            self.authors.append(author)
+        return author_id
+
+    def append_record(self, record):
+        self.shas += bytes.fromhex(record.sha)
+        self.times.append(record.timestamp)
+        self.tz_minutes.append(record.tz_minutes)
+        self.author_ids.append(self.intern_author(record.author))
+        self.subjects += record.subject.encode('utf-8')
+        self.subject_ends.append(len(self.subjects))
+        for parent in record.parents:
+            self.parents += bytes.fromhex(parent)
+        self.parent_ends.append(len(self.parents))
+
+    def insert(self, row, other):
+        """Splice the rows of other in before row"""
+        subject_offset = self.subject_ends[row - 1] if row else 0
+        parent_offset = self.parent_ends[row - 1] if row else 0
+        remap = [self.intern_author(author) for author in other.authors]
+        self.shas[row * 20:row * 20] = other.shas
+        self.times[row:row] = other.times
+        self.tz_minutes[row:row] = other.tz_minutes
+        self.author_ids[row:row] = array('I', map(remap.__getitem__, other.author_ids))
+        self.subjects[subject_offset:subject_offset] = other.subjects
+        self.subject_ends[row:] = (_shifted(other.subject_ends, subject_offset)
+                                   + _shifted(self.subject_ends[row:], len(other.subjects)))
+        self.parents[parent_offset:parent_offset] = other.parents
+        self.parent_ends[row:] = (_shifted(other.parent_ends, parent_offset)
+                                  + _shifted(self.parent_ends[row:], len(other.parents)))
+
+    def delete(self, first, last):
+        """Remove rows first to last, inclusive"""
+        subject_start = self.subject_ends[first - 1] if first else 0
+        parent_start = self.parent_ends[first - 1] if first else 0
+        subject_shift = self.subject_ends[last] - subject_start
+        parent_shift = self.parent_ends[last] - parent_start
+        del self.shas[first * 20:(last + 1) * 20]
+        del self.times[first:last + 1]
+        del self.tz_minutes[first:last + 1]
+        del self.author_ids[first:last + 1]
+        del self.subjects[subject_start:subject_start + subject_shift]
+        self.subject_ends[first:] = _shifted(self.subject_ends[last + 1:], -subject_shift)
+        del self.parents[parent_start:parent_start + parent_shift]
+        self.parent_ends[first:] = _shifted(self.parent_ends[last + 1:], -parent_shift)
+
+    def slice(self, first, last=None):
+        """Copy of rows first up to (not including) last"""
+        last = len(self) if last is None else last
+        columns = CommitColumns()
+        if first >= last:
+            return columns
+        subject_start = self.subject_ends[first - 1] if first else 0
+        parent_start = self.parent_ends[first - 1] if first else 0
+        columns.shas = self.shas[first * 20:last * 20]
+        columns.times = self.times[first:last]
+        columns.tz_minutes = self.tz_minutes[first:last]
+        columns.author_ids = self.author_ids[first:last]
+        columns.authors = list(self.authors)
+        columns.author_index = dict(self.author_index)
+        columns.subjects = self.subjects[subject_start:self.subject_ends[last - 1]]
+        columns.subject_ends = _shifted(self.subject_ends[first:last], -subject_start)
+        columns.parents = self.parents[parent_start:self.parent_ends[last - 1]]
+        columns.parent_ends = _shifted(self.parent_ends[first:last], -parent_start)
+        return columns
+
+    def sha(self, row):
+        return self.shas[row * 20:(row + 1) * 20].hex()
+
+    def subject(self, row):
+        start = self.subject_ends[row - 1] if row else 0
+        return self.subjects[start:self.subject_ends[row]].decode('utf-8', 'replace')
+
+    def author(self, row):
+        return self.authors[self.author_ids[row]]
+
+    def parent_shas(self, row):
+        start = self.parent_ends[row - 1] if row else 0
+        packed = self.parents[start:self.parent_ends[row]]
+        return [packed[i:i + 20].hex() for i in range(0, len(packed), 20)]
+
+# Segments are only read back by the machine that wrote them
+SEGMENT_LAYOUT = "{}:q{}h{}I{}Q{}".format(sys.byteorder, *(array(code).itemsize for code in 'qhIQ'))
+SEGMENT_COLUMNS = ('shas', 'times', 'tz_minutes', 'author_ids', 'subjects', 'subject_ends',
+                   'parents', 'parent_ends')
+
+def write_segment(path, columns):
+    """Write columns to path: one JSON header line, then each column's raw bytes"""
+    authors = '\0'.join(columns.authors).encode('utf-8', 'surrogateescape')
+    chunks = [bytes(getattr(columns, name)) if name in ('shas', 'subjects', 'parents')
+              else getattr(columns, name).tobytes() for name in SEGMENT_COLUMNS] + [authors]
+    header = {
+        'version': HistoryCache.VERSION,
+        'layout': SEGMENT_LAYOUT,
+        'rows': len(columns),
+        'authors': len(columns.authors),
+        'lengths': [len(chunk) for chunk in chunks]
+    }
+    with open(path, 'wb') as f:
+        f.write(json.dumps(header).encode() + b'\n')
+        for chunk in chunks:
+            f.write(chunk)
+
+def read_segment(path):
+    """Map a segment file and load its columns; ValueError if it doesn't fit"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        end = data.find(b'\n', 0, 4096)
+        if end < 0:
+            raise ValueError(f"{path}: no segment header")
+        header = json.loads(data[:end])
+        if header.get('version') != HistoryCache.VERSION or header.get('layout') != SEGMENT_LAYOUT:
+            raise ValueError(f"{path}: written by another version or platform")
+        offset = end + 1
+        chunks = []
+        for length in header['lengths']:
+            chunks.append(data[offset:offset + length])
+            offset += length
+        if offset != len(data):
+            raise ValueError(f"{path}: truncated")
+    
+    columns = CommitColumns()
+    *fields, authors = chunks
+    for name, chunk in zip(SEGMENT_COLUMNS, fields):
+        if name in ('shas', 'subjects', 'parents'):
+            setattr(columns, name, bytearray(chunk))
+        else:
+            getattr(columns, name).frombytes(chunk)
+    columns.authors = authors.decode('utf-8', 'surrogateescape').split('\0') if header['authors'] else []
+    columns.author_index = {author: i for i, author in enumerate(columns.authors)}
+    rows = header['rows']
+    if (len(columns.authors) != header['authors'] or len(columns.shas) != rows * 20
+            or not len(columns.times) == len(columns.subject_ends) == len(columns.parent_ends) == rows):
+        raise ValueError(f"{path}: inconsistent columns")
+    return columns
+
+class HistoryCache:
+    """Parsed history of one repository, kept on disk between sessions.
+
+    manifest.json names the tip the history belongs to and its segment
+    files, newest first: a base segment with the whole history of an
+    earlier tip, then one delta segment per fast-forward since. Segments
+    are written once and never modified; the manifest is replaced
+    atomically, so readers see either the old or the new cache.
+    """
+    VERSION = 1
+    # More segments than this are merged into one base segment
+    MAX_SEGMENTS = 16
+    # Unreferenced segments younger than this may belong to a writer in another process
+    PRUNE_AGE_S = 60
+
+    def __init__(self, root, repo_path):
+        # Linked worktrees share one cache; their HEADs are deltas of each other
+        git_dir, common_dir = resolve_git_dirs(find_git_dir(repo_path))
+        key = hashlib.sha1(os.path.realpath(common_dir).encode('utf-8', 'surrogateescape')).hexdigest()
+        self.directory = os.path.join(root, key[:16])
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (not isinstance(manifest, dict) or manifest.get('version') != self.VERSION
+                or not isinstance(manifest.get('tip'), str) or not isinstance(manifest.get('segments'), list)):
+            return None
+        return manifest
+
+    def _write_manifest(self, tip, segments):
+        previous = self._read_manifest()
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': self.VERSION, 'tip': tip, 'segments': segments}, f)
+        os.replace(tmp_path, self.manifest_path)
+        self._prune(segments, set(previous['segments']) if previous else set())
+
+    def _write_segment(self, columns):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="segment-", suffix=".seg", dir=self.directory)
+        os.close(fd)
+        write_segment(path, columns)
+        return os.path.basename(path)
+
+    def _prune(self, segments, replaced):
+        # Segments the previous manifest named are ours to delete right away
+        keep = set(segments)
+        cutoff = time.time() - self.PRUNE_AGE_S
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".seg") and entry.name not in keep:
+                try:
+                    if entry.name in replaced or entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def load(self):
+        """Return (tip, CommitColumns), or None when there is no usable cache"""
+        manifest = self._read_manifest()
+        if manifest is None:
+            return None
+        columns = None
+        try:
+            for name in manifest['segments']:
+                segment = read_segment(os.path.join(self.directory, name))
+                if columns is None:
+                    columns = segment
+                else:
+                    columns.insert(len(columns), segment)
+        except (OSError, ValueError, KeyError):
+            return None
+        return (manifest['tip'], columns) if columns else None
+
+    def save(self, tip, columns):
+        """Replace the cache with columns, the whole history of tip"""
+        self._write_manifest(tip, [self._write_segment(columns)])
+
+    def extend(self, old_tip, new_tip, columns):
+        """Add the commits from old_tip to new_tip (newest first) as a delta segment.
+
+        Returns False, changing nothing, when the cache isn't at old_tip.
+        """
+        manifest = self._read_manifest()
+        if manifest is None or manifest['tip'] != old_tip:
+            return False
+        segments = [self._write_segment(columns)] + manifest['segments']
+        self._write_manifest(new_tip, segments)
+        if len(segments) > self.MAX_SEGMENTS:
+            cached = self.load()
+            if cached is not None:
+                self.save(*cached)
+        return True
+
+    def clear(self):
+        try:
+            os.remove(self.manifest_path)
+        except OSError:
+            pass
+
+def load_history_cache(job, cache):
+    return cache.load()
+
+def build_history_cache(job, cache, repo_path, tip):
+    """Read the whole history of tip into the cache; returns its CommitColumns"""
+    columns = CommitColumns()
+    records = iter_log(repo_path, tip)
+    try:
+        for record in records:
+            columns.append_record(record)
+            if job.is_cancelled():
+                return None
+    finally:
+        records.close()
+    cache.save(tip, columns)
+    return columns
+
+def save_history_cache(job, cache, tip, columns):
+    cache.save(tip, columns)
+
+def extend_history_cache(job, cache, old_tip, new_tip, columns):
+    return cache.extend(old_tip, new_tip, columns)
+
+# ==== Commit graph ====
+
+def _lowest_free_lane(active):
+    # Index of the lowest clear bit of the active lane mask
+    return (~active & (active + 1)).bit_length() - 1
+
+class CommitGraph:
+    """Lane layout of a CommitColumns history, laid out from the top as rows are needed.
+
+    A lane waits for one sha: a commit takes the lane its child reserved for
+    it (or the lowest free lane if it is a branch tip), its first parent
+    continues in that lane and further parents join the lane already
+    waiting for them or open a new one. The layout state is just the
+    waiting lanes, and each row keeps its lane plus two bit masks (lanes
+    passing straight through, lanes its parents continue in), so any row
+    can be painted on its own. Each commit costs an amortized O(1), paid
+    when a row is first asked for.
+
+    A row's lanes depend only on the rows above it. The waiting lanes are
+    saved every CHECKPOINT_ROWS rows, so rows inserted or removed further
+    down only cost the rows from the checkpoint above them.
+    """
+    CHECKPOINT_ROWS = 1024
+
+    def __init__(self, columns):
+        self.columns = columns
+        self._nodes = array('I')
+        self.invalidate()
+
+    def invalidate(self, row=0):
+        """Drop the layout from row down; rows changed there (insert, remove).
+
+        Rows above keep their lanes; layout resumes from the last checkpoint
+        at or above row when it is asked for.
+        """
+        if row >= len(self._nodes) and self._nodes:
+            return
+        kept = row // self.CHECKPOINT_ROWS
+        if kept:
+            keep = kept * self.CHECKPOINT_ROWS
+            waiting, self._active, self.width = self._checkpoints[kept - 1]
+            self._waiting = dict(waiting)
+            del self._checkpoints[kept:]
+            del self._nodes[keep:]
+            del self._through[keep:]
+            del self._parents[keep:]
+            self._wide = {wide_row: masks for wide_row, masks in self._wide.items() if wide_row < keep}
+            return
+        self._waiting = {}        # sha -> lane waiting for it
+        self._active = 0          # bit mask of waiting lanes
+        self._nodes = array('I')  # lane << 1, | 1 when a child's lane leads into the commit
+        self._through = array('Q')
+        self._parents = array('Q')
+        self._wide = {}           # row -> (through, parents) when the masks don't fit 64 bits
+        self._checkpoints = []    # (waiting, active, width) after each CHECKPOINT_ROWS rows
+        self.width = 0            # most lanes any laid-out row spans
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def row(self, row):
+        """(lane, from_child, through, parents) of row, laying out the rows above first"""
+        if row >= len(self._nodes):
+            self._layout(row + 1)
+        node = self._nodes[row]
+        through, parents = self._wide.get(row) or (self._through[row], self._parents[row])
+        return node >> 1, node & 1, through, parents
+
+    def _layout(self, stop):
+        columns = self.columns
+        shas, parent_shas, parent_ends = columns.shas, columns.parents, columns.parent_ends
+        waiting, active = self._waiting, self._active
+        width = self.width
+        start = parent_ends[len(self._nodes) - 1] if self._nodes else 0
+        # Last row before the next checkpoint is taken
+        checkpoint_row = (len(self._checkpoints) + 1) * self.CHECKPOINT_ROWS - 1
+        for row in range(len(self._nodes), min(stop, len(columns))):
+            lane = waiting.pop(bytes(shas[row * 20:row * 20 + 20]), None)
+            from_child = lane is not None
+            if lane is None:
+                lane = _lowest_free_lane(active)
+            active &= ~(1 << lane)
+            through = active
+            parents = 0
+            end = parent_ends[row]
+            for offset in range(start, end, 20):
+                parent = bytes(parent_shas[offset:offset + 20])
+                target = waiting.get(parent)
+                if target is None:
+                    # The first parent continues in the commit's own lane (free by now)
+                    target = lane if not active >> lane & 1 else _lowest_free_lane(active)
+                    waiting[parent] = target
+                    active |= 1 << target
+                parents |= 1 << target
+            start = end
+            
+            self._nodes.append(lane << 1 | from_child)
+            if (through | parents) >> 64:
+                self._wide[row] = (through, parents)
+                through = parents = 0
+            self._through.append(through)
+            self._parents.append(parents)
+            width = max(width, lane + 1, active.bit_length())
+            if row == checkpoint_row:
+                self._checkpoints.append((dict(waiting), active, width))
+                checkpoint_row += self.CHECKPOINT_ROWS
+        self._waiting, self._active, self.width = waiting, active, width
+
+# ==== Commit diffs ====
+
+NULL_OID = '0' * 40
+SUBMODULE_MODE = '160000'
+
+class LRUCache:
+    """Least-recently-used cache bounded by the total size of its values.
+
+    Keys are git object ids (or tuples of them). Objects never change, so
+    entries can't go stale; they are only evicted when the budget runs out.
+    Values larger than the whole budget are not cached.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+class ChangedFile:
+    """One entry of `git diff-tree --raw`"""
+    __slots__ = ('status', 'path', 'orig_path', 'old_mode', 'new_mode', 'old_oid', 'new_oid')
+
+    def __init__(self, status, path, old_mode, new_mode, old_oid, new_oid, orig_path=None):
+        self.status = status
+        self.path = path
+        self.orig_path = orig_path
+        self.old_mode = old_mode
+        self.new_mode = new_mode
+        self.old_oid = old_oid
+        self.new_oid = new_oid
+
+    def is_submodule(self):
+        return SUBMODULE_MODE in (self.old_mode, self.new_mode)
+
+    def diff_key(self):
+        return ('diff', self.old_oid, self.new_oid)
+
+def commit_files_key(sha):
+    return ('files', sha)
+
+def blob_key(oid):
+    return ('blob', oid)
+
+def parse_raw_diff(output):
+    """ChangedFiles from `--raw -z` output"""
+    fields = output.split(b'\0')
+    files = []
+    i = 0
+    while i < len(fields) - 1:
+        # ":old_mode new_mode old_oid new_oid status", then one or two paths
+        old_mode, new_mode, old_oid, new_oid, status = fields[i][1:].decode().split(' ')
+        path = fields[i + 1].decode('utf-8', 'surrogateescape')
+        i += 2
+        orig_path = None
+        if status[0] in 'RC':
+            orig_path, path = path, fields[i].decode('utf-8', 'surrogateescape')
+            i += 1
+        files.append(ChangedFile(status[0], path, old_mode, new_mode, old_oid, new_oid, orig_path))
+    return files
+
+def read_commit_files(job, repo_path, sha, cache):
+    """Files changed by commit sha (against its first parent), cached by sha"""
+    files = cache.get(commit_files_key(sha))
+    if files is None:
+        output = run_git(repo_path, 'diff-tree', '-r', '-z', '--raw', '-M', '--root', '--no-commit-id',
+                         '--diff-merges=first-parent', sha)
+        files = parse_raw_diff(output)
+        cache.put(commit_files_key(sha), files, len(output) + 200 * len(files))
+    return files
+
+def read_blob(job, repo_path, oid, cache):
+    """Raw contents of a blob, cached by object id"""
+    data = cache.get(blob_key(oid))
+    if data is None:
+        data = run_git(repo_path, 'cat-file', 'blob', oid)
+        cache.put(blob_key(oid), data, len(data))
+    return data
+
+def is_binary(data):
+    # git's heuristic: a NUL byte near the start
+    return b'\0' in data[:8000]
+
+def blob_text(data):
+    """Blob contents decoded for display, or a placeholder for binary content"""
+    if is_binary(data):
+        return f"Binary file ({len(data)} bytes)"
+    return data.decode('utf-8', 'replace')
+
+def read_file_diff(job, repo_path, changed, cache):
+    """Unified diff text for one ChangedFile, cached by its pair of blob ids"""
+    text = cache.get(changed.diff_key())
+    if text is None:
+        text = _file_diff(job, repo_path, changed, cache)
+        cache.put(changed.diff_key(), text, len(text))
+    return text
+
+def _file_diff(job, repo_path, changed, cache):
+    if changed.is_submodule():
+        return f"Submodule commit {changed.old_oid[:7]} → {changed.new_oid[:7]}"
+    if changed.old_oid == changed.new_oid:
+        return "(no content changes)"
+    if changed.old_oid == NULL_OID or changed.new_oid == NULL_OID:
+        # Added or deleted: git can't diff against the null id, so spell it out
+        added = changed.old_oid == NULL_OID
+        data = read_blob(job, repo_path, changed.new_oid if added else changed.old_oid, cache)
+        if is_binary(data):
+            return f"Binary file {'added' if added else 'deleted'} ({len(data)} bytes)"
+        lines = data.decode('utf-8', 'replace').splitlines()
+        sign = '+' if added else '-'
+        header = f"@@ -0,0 +1,{len(lines)} @@" if added else f"@@ -1,{len(lines)} +0,0 @@"
+        return '\n'.join([header] + [sign + line for line in lines])
+    output = run_git(repo_path, 'diff', '--no-color', '--no-ext-diff', changed.old_oid, changed.new_oid)
+    text = output.decode('utf-8', 'replace')
+    # Drop the diff/index/---/+++ header; its names are blob ids
+    start = text.find('\n@@')
+    if start != -1:
+        return text[start + 1:].rstrip('\n')
+    binary = text.find('Binary files')
+    return "Binary files differ" if binary != -1 else "(no content changes)"
+
+# ==== GitHub ====
+
+class GitHubManager:
+    """Owns the single GitHub client used by every GitHub feature.
+
+    The client keeps a pooled keep-alive HTTP session for its whole lifetime,
+    and the authenticated user is fetched once per token and memoized, so
+    push/pull/test cycles don't repeat TLS handshakes or GET /user calls.
+    The client (and PyGithub itself) is only created on first use.
+    """
+    POOL_SIZE = 8
+
+    def __init__(self, token=None):
+        self.token = None
+        self.github = None
+        self._user = None
+        self._session = None
+        self._lock = threading.Lock()
+        if token:
+            self.set_token(token)
+        
+    def set_token(self, token):
+        """Set or update GitHub token"""
+        with self._lock:
+            if token == self.token:
+                return
+            if self.github is not None:
+                self.github.close()
+                self.github = None
+            self.token = token
+            self._user = None
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _client(self):
+        # Called with the lock held
+        if self.github is None:
+            from github import Github, Auth
+            self.github = Github(auth=Auth.Token(self.token), pool_size=self.POOL_SIZE)
+        return self.github
+        
+    def get_user(self, refresh=False):
+        """Authenticated user, fetched with one GET /user and then memoized"""
+        if not GITHUB_AVAILABLE:
+            raise RuntimeError("PyGithub library not installed")
+        with self._lock:
+            if self._user is None or refresh:
+                user = self._client().get_user()
+                user.login  # Completes the lazy object in a single request
+                self._user = user
+            return self._user
+        
+    def get_login(self):
+        return self.get_user().login
+        
+    def test_connection(self):
+        """Test if token is valid"""
+        if not GITHUB_AVAILABLE:
+            return False, "PyGithub library not installed"
+        try:
+            user = self.get_user(refresh=True)
+            return True, f"Connected as {user.login} ({user.name})"
+        except Exception as e:
+            return False, str(e)
+    
+    def get_identity(self):
+        """Return (login, name) of the token's user; raises on failure"""
+        user = self.get_user(refresh=True)
+        return user.login, user.name
+
+    def create_remote_repo(self, name, description="", private=False):
+        """Create a new repository on GitHub"""
+        if not GITHUB_AVAILABLE:
+            return False, "PyGithub library not installed"
+        from github import GithubException
+        try:
+            user = self.get_user()
+            repo = user.create_repo(
+                name=name,
+                description=description,
+                private=private,
+                auto_init=False  # Don't init, we'll push our local
+            )
+            return True, repo.clone_url
+        except GithubException as e:
+            if e.status == 422:
+                return False, "Repository name already exists"
+            return False, str(e)
+        except Exception as e:
+            return False, str(e)
+    
+    GITHUB_API = "https://api.github.com"
+
+    def _http(self):
+        """Pooled keep-alive session for raw REST calls (conditional requests)"""
+        with self._lock:
+            if self._session is None:
+                import requests
+                import requests.adapters
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_SIZE)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    "Authorization": f"token {self.token}",
+                    "Accept": "application/vnd.github+json"
+                })
+                self._session = session
+            return self._session
+
+    def iter_repo_pages(self, cached_pages=()):
+        """Yield (page, changed) for each page of the user's repositories.
+
+        Pages already in the cache are revalidated with If-None-Match, so an
+        unchanged listing costs one 304 per page (which GitHub does not count
+        against the rate limit) and no JSON decoding.
+        """
+        cached = {page['url']: page for page in cached_pages}
+        url = f"{self.GITHUB_API}/user/repos?per_page=100&sort=full_name"
+        while url:
+            headers = {}
+            if url in cached and cached[url].get('etag'):
+                headers['If-None-Match'] = cached[url]['etag']
+            response = self._http().get(url, headers=headers, timeout=15)
+            next_url = response.links.get('next', {}).get('url')
+            if response.status_code == 304:
+                page = cached[url]
+                changed = False
+                next_url = next_url or page.get('next')
+            else:
+                response.raise_for_status()
+                page = {
+                    'url': url,
+                    'etag': response.headers.get('ETag'),
+                    'next': next_url,
+                    'rows': [{
+                        'name': repo['name'],
+                        'description': repo['description'],
+                        'url': repo['html_url'],
+                        'clone_url': repo['clone_url'],
+                        'private': repo['private']
+                    } for repo in response.json()]
+                }
+                changed = True
+            yield page, changed
+            url = next_url
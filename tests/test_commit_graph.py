@@ -0,0 +1,84 @@
+# test_commit_graph.py - CommitGraph lane layout after rows change
+#
+#   python -m pytest tests
+#
+# After rows are inserted or removed, an invalidated graph must lay out
+# exactly like a graph built from scratch. Histories are synthetic DAGs;
+# no repository is involved.
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from gitdash_core import CommitColumns, CommitGraph, CommitRecord
+
+class SmallCheckpointGraph(CommitGraph):
+    # Many checkpoints in a short history
+    CHECKPOINT_ROWS = 16
+
+def synthetic_history(count, seed):
+    """count CommitRecords newest first, with branches and merges"""
+    rng = random.Random(seed)
+    shas = [f"{rng.getrandbits(160):040x}" for _ in range(count)]
+    records = []
+    for row, sha in enumerate(shas):
+        older = range(row + 1, count)
+        parents = []
+        if older:
+            parents.append(shas[min(row + 1 + int(rng.expovariate(0.5)), count - 1)])
+            if rng.random() < 0.2:
+                parents.append(shas[rng.choice(older)])
+        records.append(CommitRecord(sha, list(dict.fromkeys(parents)), "A", "a@a", 1700000000 - row, 0, f"c{row}"))
+    return records
+
+def layout(graph):
+    return [graph.row(row) for row in range(len(graph.columns))], graph.width
+
+class CommitGraphInvalidateTest(unittest.TestCase):
+    def assert_fresh(self, graph):
+        self.assertEqual(layout(graph), layout(SmallCheckpointGraph(graph.columns)))
+
+    def test_insert_and_remove_rows(self):
+        rng = random.Random(1)
+        records = synthetic_history(400, seed=2)
+        columns = CommitColumns.from_records(records[:300])
+        graph = SmallCheckpointGraph(columns)
+        layout(graph)
+        spare = records[300:]
+        for _ in range(40):
+            row = rng.randrange(len(columns) + 1)
+            if spare and rng.random() < 0.5:
+                count = rng.randint(1, 5)
+                inserted, spare = spare[:count], spare[count:]
+                columns.insert(row, CommitColumns.from_records(inserted))
+            elif row < len(columns):
+                columns.delete(row, min(row + rng.randint(0, 5), len(columns) - 1))
+            graph.invalidate(row)
+            # Half of the time only the rows above are asked for first
+            if rng.random() < 0.5:
+                graph.row(rng.randrange(len(columns)))
+            self.assert_fresh(graph)
+
+    def test_rows_above_keep_their_layout(self):
+        columns = CommitColumns.from_records(synthetic_history(200, seed=3))
+        graph = SmallCheckpointGraph(columns)
+        layout(graph)
+        graph.invalidate(100)
+        # Back to the checkpoint at row 96, not to the top
+        self.assertEqual(len(graph), 96)
+
+    def test_append_keeps_layout(self):
+        records = synthetic_history(100, seed=4)
+        columns = CommitColumns.from_records(records[:60])
+        graph = SmallCheckpointGraph(columns)
+        layout(graph)
+        columns.insert(60, CommitColumns.from_records(records[60:]))
+        graph.invalidate(60)
+        self.assertEqual(len(graph), 60)
+        self.assert_fresh(graph)
+
+if __name__ == "__main__":
+    unittest.main()
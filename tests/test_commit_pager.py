@@ -0,0 +1,126 @@
+# test_commit_pager.py - History paging when a page job is cancelled
+#
+#   python -m pytest tests
+#
+# A cancelled page has already read its records off the git log stream; the
+# next page must hand them out again instead of leaving a gap in the history.
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from gitdash_core import CommitPager, Job, fetch_commit_page, run_git
+
+COMMITS = 700
+PAGE_SIZE = 200
+
+GIT_ENV = dict(os.environ, GIT_CONFIG_NOSYSTEM='1', GIT_CONFIG_GLOBAL=os.devnull)
+
+def make_repo(path, commits):
+    """A linear history c1..c<commits>, written with one git fast-import"""
+    subprocess.run(['git', 'init', '--quiet', '--initial-branch=main', path], check=True, env=GIT_ENV)
+    stream = bytearray()
+    for number in range(1, commits + 1):
+        message = f"c{number}".encode()
+        stream += f"commit refs/heads/main\ncommitter T <t@t> {1700000000 + number * 60} +0000\n".encode()
+        stream += b"data %d\n%s\n" % (len(message), message)
+    subprocess.run(['git', '-C', path, 'fast-import', '--quiet'], input=bytes(stream), check=True, env=GIT_ENV)
+    subprocess.run(['git', '-C', path, 'checkout', '--quiet', 'main'], check=True, env=GIT_ENV)
+
+def cancelled_job():
+    job = Job()
+    job.cancel()
+    return job
+
+class HistoryTestCase(unittest.TestCase):
+    """Shares one synthetic repository between a class's tests"""
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.repo = os.path.join(cls.tmp.name, 'repo')
+        make_repo(cls.repo, COMMITS)
+        cls.history = run_git(cls.repo, 'rev-list', 'HEAD').decode().split()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+class CommitPagerCancelTest(HistoryTestCase):
+    def read_all(self, pager):
+        shas = []
+        while not pager.exhausted:
+            rows = fetch_commit_page(Job(), pager, PAGE_SIZE)
+            pager.page_delivered(rows)
+            shas.extend(record.sha for record in rows)
+        return shas
+
+    def test_cancelled_page_is_handed_out_again(self):
+        pager = CommitPager(self.repo)
+        first = fetch_commit_page(Job(), pager, PAGE_SIZE)
+        pager.page_delivered(first)
+        # Stops after one record, which the cancelled job never delivers
+        self.assertEqual(len(fetch_commit_page(cancelled_job(), pager, PAGE_SIZE)), 1)
+        shas = [record.sha for record in first] + self.read_all(pager)
+        self.assertEqual(shas, self.history)
+
+    def test_undelivered_full_page_is_handed_out_again(self):
+        # Cancelled after the page was read but before it reached the view
+        pager = CommitPager(self.repo)
+        lost = fetch_commit_page(Job(), pager, PAGE_SIZE)
+        self.assertEqual(self.read_all(pager)[:len(lost)], [record.sha for record in lost])
+
+    def test_cancelled_last_page(self):
+        pager = CommitPager(self.repo)
+        shas = []
+        for _ in range(COMMITS // PAGE_SIZE):
+            rows = fetch_commit_page(Job(), pager, PAGE_SIZE)
+            pager.page_delivered(rows)
+            shas.extend(record.sha for record in rows)
+        fetch_commit_page(Job(), pager, PAGE_SIZE)
+        self.assertFalse(pager.exhausted)
+        self.assertEqual(shas + self.read_all(pager), self.history)
+
+class CommitLogModelCancelTest(HistoryTestCase):
+    """cancel-then-fetchMore through the history view's model"""
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            from PyQt6.QtCore import QModelIndex, QObject
+            from PyQt6.QtWidgets import QApplication
+            import GitDash
+        except ImportError as e:
+            raise unittest.SkipTest(f"GUI not importable: {e}")
+        super().setUpClass()
+        cls.app = QApplication.instance() or QApplication([])
+        cls.QModelIndex = QModelIndex
+        cls.QObject = QObject
+        cls.GitDash = GitDash
+
+    def wait_idle(self, model):
+        while model.workers.is_busy('commits'):
+            self.app.processEvents()
+
+    def test_cancel_then_fetch_more(self):
+        owner = self.QObject()
+        owner.show_error = self.fail
+        workers = self.GitDash.RepoWorkerPool(owner)
+        model = self.GitDash.CommitLogModel(workers, parent=owner)
+        model.reset(self.repo)
+        self.wait_idle(model)
+        self.assertEqual(model.rowCount(), PAGE_SIZE)
+        # A page job that read part of a page and was then superseded
+        fetch_commit_page(cancelled_job(), model.pager, PAGE_SIZE)
+        while model.canFetchMore(self.QModelIndex()):
+            model.fetchMore(self.QModelIndex())
+            self.wait_idle(model)
+        model.refresh(self.repo)
+        self.assertEqual([model.sha(row) for row in range(model.rowCount())], self.history)
+        workers.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
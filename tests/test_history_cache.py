@@ -0,0 +1,213 @@
+# test_history_cache.py - CommitColumns edits and the on-disk history cache
+#
+#   python -m pytest tests
+#
+# The history view splices CommitColumns in place and reopens repositories
+# from a HistoryCache. Edits are checked against columns built from the
+# records directly; the cache against `git log` of a real repository after
+# a new commit, an amend, and damage to its manifest or segments.
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from gitdash_core import (
+    CommitColumns, CommitRecord, HistoryCache, Job, build_history_cache, iter_log, read_segment,
+    write_segment
+)
+
+GIT_ENV = dict(os.environ, GIT_CONFIG_NOSYSTEM='1', GIT_CONFIG_GLOBAL=os.devnull,
+               GIT_AUTHOR_NAME='T', GIT_AUTHOR_EMAIL='t@t.invalid',
+               GIT_COMMITTER_NAME='T', GIT_COMMITTER_EMAIL='t@t.invalid')
+
+AUTHORS = ["Ann", "Bob", "Zoë"]
+
+def synthetic_records(count):
+    """Records with merges, repeated authors and non-ASCII subjects"""
+    records = []
+    for number in range(count):
+        parents = [f"{number + 1:040x}"] if number + 1 < count else []
+        if number % 5 == 0 and number + 2 < count:
+            parents.append(f"{number + 2:040x}")
+        records.append(CommitRecord(
+            f"{number:040x}", parents, AUTHORS[number % 3], "a@b", 1700000000 - number * 60,
+            (number % 7 - 3) * 30, f"commit {number} – ü" * (number % 3 + 1)
+        ))
+    return records
+
+def rows(columns):
+    return [(columns.sha(row), columns.parent_shas(row), columns.author(row), columns.times[row],
+             columns.tz_minutes[row], columns.subject(row)) for row in range(len(columns))]
+
+def make_repo(path, commits):
+    """A linear history c1..c<commits>, written with one git fast-import"""
+    subprocess.run(['git', 'init', '--quiet', '--initial-branch=main', path], check=True, env=GIT_ENV)
+    stream = bytearray()
+    for number in range(1, commits + 1):
+        message = f"c{number}".encode()
+        stream += f"commit refs/heads/main\ncommitter T <t@t> {1700000000 + number * 60} +0000\n".encode()
+        stream += b"data %d\n%s\n" % (len(message), message)
+    subprocess.run(['git', '-C', path, 'fast-import', '--quiet'], input=bytes(stream), check=True, env=GIT_ENV)
+    subprocess.run(['git', '-C', path, 'checkout', '--quiet', 'main'], check=True, env=GIT_ENV)
+
+def git(repo, *args):
+    return subprocess.run(['git', '-C', repo, *args], check=True, env=GIT_ENV,
+                          stdout=subprocess.PIPE).stdout.decode().strip()
+
+class CommitColumnsTest(unittest.TestCase):
+    def setUp(self):
+        self.records = synthetic_records(40)
+
+    def test_insert_matches_from_records(self):
+        for row in (0, 1, 17, 25):
+            with self.subTest(row=row):
+                columns = CommitColumns.from_records(self.records[:row] + self.records[25:])
+                columns.insert(row, CommitColumns.from_records(self.records[row:25]))
+                self.assertEqual(rows(columns), rows(CommitColumns.from_records(self.records)))
+
+    def test_delete_matches_from_records(self):
+        for first, last in ((0, 0), (0, 9), (12, 20), (30, 39)):
+            with self.subTest(first=first, last=last):
+                columns = CommitColumns.from_records(self.records)
+                columns.delete(first, last)
+                expected = CommitColumns.from_records(self.records[:first] + self.records[last + 1:])
+                self.assertEqual(rows(columns), rows(expected))
+
+    def test_slice_matches_from_records(self):
+        columns = CommitColumns.from_records(self.records)
+        for first, last in ((0, None), (0, 1), (7, 23), (39, None), (20, 20)):
+            with self.subTest(first=first, last=last):
+                expected = CommitColumns.from_records(self.records[first:last])
+                self.assertEqual(rows(columns.slice(first, last)), rows(expected))
+
+    def test_segment_round_trip(self):
+        columns = CommitColumns.from_records(self.records)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "segment.seg")
+            write_segment(path, columns)
+            self.assertEqual(rows(read_segment(path)), rows(columns))
+            with open(path, 'r+b') as f:
+                f.truncate(os.path.getsize(path) - 1)
+            with self.assertRaises(ValueError):
+                read_segment(path)
+
+class HistoryCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.repo = os.path.join(self.tmp.name, 'repo')
+        self.root = os.path.join(self.tmp.name, 'cache')
+        make_repo(self.repo, 50)
+        self.cache = HistoryCache(self.root, self.repo)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def head(self):
+        return git(self.repo, 'rev-parse', 'HEAD')
+
+    def log(self, *revs):
+        return rows(CommitColumns.from_records(iter_log(self.repo, *revs)))
+
+    def reopen(self):
+        """What a later session sees: a new HistoryCache on the same directory"""
+        return HistoryCache(self.root, self.repo).load()
+
+    def test_missing_cache_loads_nothing(self):
+        self.assertIsNone(self.cache.load())
+
+    def test_build_and_reopen(self):
+        tip = self.head()
+        columns = build_history_cache(Job(), self.cache, self.repo, tip)
+        self.assertEqual(rows(columns), self.log())
+        cached_tip, cached = self.reopen()
+        self.assertEqual(cached_tip, tip)
+        self.assertEqual(rows(cached), self.log())
+
+    def test_reopen_after_new_commit(self):
+        old_tip = self.head()
+        build_history_cache(Job(), self.cache, self.repo, old_tip)
+        git(self.repo, 'commit', '--quiet', '--allow-empty', '-m', "new")
+        new_tip = self.head()
+        # The cached tip is an ancestor of HEAD: only the new commits are read
+        delta = CommitColumns.from_records(iter_log(self.repo, f"{old_tip}..{new_tip}"))
+        self.assertTrue(self.cache.extend(old_tip, new_tip, delta))
+        cached_tip, cached = self.reopen()
+        self.assertEqual(cached_tip, new_tip)
+        self.assertEqual(rows(cached), self.log())
+
+    def test_reopen_after_amend(self):
+        old_tip = self.head()
+        build_history_cache(Job(), self.cache, self.repo, old_tip)
+        git(self.repo, 'commit', '--quiet', '--amend', '--allow-empty', '-m', "amended")
+        new_tip = self.head()
+        # The cache still names the replaced tip; HEAD no longer contains it
+        cached_tip, cached = self.reopen()
+        self.assertEqual(cached_tip, old_tip)
+        self.assertEqual(rows(cached)[1:], self.log()[1:])
+        self.assertNotEqual(rows(cached)[0], self.log()[0])
+        # A delta on top of the wrong tip is refused and changes nothing
+        delta = CommitColumns.from_records(iter_log(self.repo, new_tip, max_count=1))
+        self.assertFalse(self.cache.extend(new_tip, new_tip, delta))
+        self.assertEqual(self.reopen()[0], old_tip)
+        # ...so the history is rewritten instead
+        self.cache.save(new_tip, CommitColumns.from_records(iter_log(self.repo, new_tip)))
+        cached_tip, cached = self.reopen()
+        self.assertEqual(cached_tip, new_tip)
+        self.assertEqual(rows(cached), self.log())
+
+    def test_many_deltas_are_merged(self):
+        tip = self.head()
+        build_history_cache(Job(), self.cache, self.repo, tip)
+        for number in range(HistoryCache.MAX_SEGMENTS + 1):
+            git(self.repo, 'commit', '--quiet', '--allow-empty', '-m', f"delta {number}")
+            new_tip = self.head()
+            delta = CommitColumns.from_records(iter_log(self.repo, f"{tip}..{new_tip}"))
+            self.assertTrue(self.cache.extend(tip, new_tip, delta))
+            tip = new_tip
+        with open(self.cache.manifest_path) as f:
+            segments = json.load(f)['segments']
+        self.assertLessEqual(len(segments), HistoryCache.MAX_SEGMENTS)
+        self.assertEqual(sorted(segments), sorted(name for name in os.listdir(self.cache.directory)
+                                                  if name.endswith(".seg")))
+        self.assertEqual(rows(self.reopen()[1]), self.log())
+
+    def test_missing_manifest(self):
+        build_history_cache(Job(), self.cache, self.repo, self.head())
+        os.remove(self.cache.manifest_path)
+        self.assertIsNone(self.reopen())
+        self.assertFalse(self.cache.extend(self.head(), self.head(), CommitColumns()))
+
+    def test_corrupt_manifest(self):
+        build_history_cache(Job(), self.cache, self.repo, self.head())
+        for content in ("", "{\"version\": 1, \"tip\"", "[]", json.dumps({'version': 1}),
+                        json.dumps({'version': 0, 'tip': self.head(), 'segments': []})):
+            with self.subTest(content=content):
+                with open(self.cache.manifest_path, 'w') as f:
+                    f.write(content)
+                self.assertIsNone(self.reopen())
+
+    def test_missing_or_corrupt_segment(self):
+        build_history_cache(Job(), self.cache, self.repo, self.head())
+        with open(self.cache.manifest_path) as f:
+            segment = os.path.join(self.cache.directory, json.load(f)['segments'][0])
+        with open(segment, 'r+b') as f:
+            f.seek(0)
+            f.write(b"garbage")
+        self.assertIsNone(self.reopen())
+        os.remove(segment)
+        self.assertIsNone(self.reopen())
+
+    def test_rebuild_after_corruption(self):
+        build_history_cache(Job(), self.cache, self.repo, self.head())
+        with open(self.cache.manifest_path, 'w') as f:
+            f.write("not json")
+        build_history_cache(Job(), self.cache, self.repo, self.head())
+        self.assertEqual(rows(self.reopen()[1]), self.log())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+# test_status_snapshot.py - StatusSnapshot's predicted index state against git
+#
+#   python -m pytest tests
+#
+# apply_staged, apply_unstaged and apply_committed patch a snapshot instead
+# of rescanning. Each case builds a repository with one file in a given
+# porcelain v2 state, runs the command the GUI runs, and compares the
+# prediction with a fresh `git status --porcelain=v2` scan.
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+from gitdash_core import StatusSnapshot, Job, commit_staged, run_git, run_git_on_paths
+
+GIT_ENV = {
+    'GIT_CONFIG_NOSYSTEM': '1',
+    'GIT_CONFIG_GLOBAL': os.devnull,
+    'GIT_AUTHOR_NAME': 'T',
+    'GIT_AUTHOR_EMAIL': 't@t.invalid',
+    'GIT_COMMITTER_NAME': 'T',
+    'GIT_COMMITTER_EMAIL': 't@t.invalid'
+}
+
+CONTENT = "".join(f"line {i}\n" for i in range(20))
+
+def write(repo, path, text):
+    with open(os.path.join(repo, path), 'w') as f:
+        f.write(text)
+
+def git(repo, *args):
+    run_git(repo, *args)
+
+# state -> (path it concerns, steps from a commit holding `tracked`)
+STATES = {
+    '.M': ('tracked', lambda repo: write(repo, 'tracked', CONTENT + "edit\n")),
+    'MM': ('tracked', lambda repo: (write(repo, 'tracked', CONTENT + "edit\n"), git(repo, 'add', 'tracked'),
+                                    write(repo, 'tracked', CONTENT + "edit\nagain\n"))),
+    '.D': ('tracked', lambda repo: os.remove(os.path.join(repo, 'tracked'))),
+    'D.': ('tracked', lambda repo: git(repo, 'rm', '--quiet', 'tracked')),
+    '??': ('new', lambda repo: write(repo, 'new', "new\n")),
+    'A.': ('new', lambda repo: (write(repo, 'new', "new\n"), git(repo, 'add', 'new'))),
+    'AM': ('new', lambda repo: (write(repo, 'new', "new\n"), git(repo, 'add', 'new'),
+                                write(repo, 'new', "new\nedit\n"))),
+    'R.': ('moved', lambda repo: git(repo, 'mv', 'tracked', 'moved')),
+    '.T': ('tracked', lambda repo: (os.remove(os.path.join(repo, 'tracked')),
+                                    os.symlink('elsewhere', os.path.join(repo, 'tracked')))),
+}
+
+def entries(snapshot):
+    return {path: (entry.index_status + entry.worktree_status, entry.orig_path)
+            for path, entry in snapshot.entries.items()}
+
+class StatusSnapshotPredictionTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.saved_env = {name: os.environ.get(name) for name in GIT_ENV}
+        os.environ.update(GIT_ENV)
+        cls.tmp = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+        for name, value in cls.saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    def make_repo(self, state, committed=True):
+        repo = os.path.join(self.tmp.name, f"{self.id().rsplit('.', 1)[-1]}-{state.replace('?', 'u')}")
+        shutil.rmtree(repo, ignore_errors=True)
+        subprocess.run(['git', 'init', '--quiet', repo], check=True)
+        if committed:
+            write(repo, 'tracked', CONTENT)
+            git(repo, 'add', 'tracked')
+            git(repo, 'commit', '--quiet', '-m', 'base')
+        path, steps = STATES[state]
+        steps(repo)
+        snapshot = StatusSnapshot.scan(repo)
+        self.assertEqual(entries(snapshot)[path][0], state, "repository not set up in the intended state")
+        return repo, path, snapshot
+
+    def assert_predicted(self, repo, snapshot):
+        self.assertEqual(entries(snapshot), entries(StatusSnapshot.scan(repo)))
+
+    def test_apply_staged(self):
+        for state in STATES:
+            with self.subTest(state=state):
+                repo, path, snapshot = self.make_repo(state)
+                # As stage_selected: only paths with something to add
+                paths = snapshot.unstaged_paths([path])
+                if paths:
+                    run_git_on_paths(Job(), repo, ['add'], paths)
+                snapshot.apply_staged(paths)
+                self.assert_predicted(repo, snapshot)
+
+    def test_apply_unstaged(self):
+        for state in STATES:
+            with self.subTest(state=state):
+                repo, path, snapshot = self.make_repo(state)
+                # As unstage_selected: staged paths plus rename sources
+                paths = snapshot.staged_paths([path])
+                if paths:
+                    renamed = [snapshot.entries[p].orig_path for p in paths if snapshot.entries[p].orig_path]
+                    pathspecs = paths + renamed
+                    run_git_on_paths(Job(), repo, ['reset', '--quiet'], pathspecs)
+                snapshot.apply_unstaged(paths)
+                self.assert_predicted(repo, snapshot)
+
+    def test_apply_unstaged_without_commits(self):
+        for state in ('??', 'A.', 'AM'):
+            with self.subTest(state=state):
+                repo, path, snapshot = self.make_repo(state, committed=False)
+                paths = snapshot.staged_paths([path])
+                if paths:
+                    run_git_on_paths(Job(), repo, ['rm', '--cached', '--force', '--quiet', '-r'], paths)
+                snapshot.apply_unstaged(paths)
+                self.assert_predicted(repo, snapshot)
+
+    def test_apply_committed(self):
+        for state in STATES:
+            with self.subTest(state=state):
+                repo, path, snapshot = self.make_repo(state)
+                if not snapshot.has_staged_changes():
+                    continue
+                record = commit_staged(Job(), repo, "commit")
+                snapshot.apply_committed(record.sha)
+                self.assert_predicted(repo, snapshot)
+                self.assertEqual(snapshot.head_oid, StatusSnapshot.scan(repo).head_oid)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+# test_worker_pool.py - Job ordering in the GUI's RepoWorkerPool
+#
+#   python -m pytest tests
+#
+# Runs the pool with an offscreen Qt platform; jobs are plain Python
+# functions, no repository is involved.
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+def work(job, name, gate=None):
+    if gate is not None:
+        gate.wait(5)
+    return name
+
+class PoolTestCase(unittest.TestCase):
+    """A fresh RepoWorkerPool per test, results collected in delivered"""
+    @classmethod
+    def setUpClass(cls):
+        try:
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            from PyQt6.QtWidgets import QApplication
+            import GitDash
+        except ImportError as e:
+            raise unittest.SkipTest(f"GUI not importable: {e}")
+        cls.app = QApplication.instance() or QApplication([])
+        cls.GitDash = GitDash
+
+    def setUp(self):
+        self.pool = self.GitDash.RepoWorkerPool()
+        self.delivered = []
+        # Holds jobs that must still be running when the test checks
+        self.gate = threading.Event()
+
+    def tearDown(self):
+        self.gate.set()
+        self.pool.shutdown()
+
+    def submit(self, key, name, gate=None, **options):
+        return self.pool.submit(key, work, name, gate, on_result=self.delivered.append, **options)
+
+    def wait_until(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, f"timed out; delivered {self.delivered}")
+            self.app.processEvents()
+            time.sleep(0.005)
+
+class RepoWorkerPoolTest(PoolTestCase):
+    def test_read_replaces_read_with_same_key(self):
+        self.submit('pull', 'pull', self.gate, exclusive=True, supersedes=('stage',))
+        self.submit('stage', 'stale')
+        self.submit('stage', 'fresh')
+        self.gate.set()
+        self.wait_until(lambda: not self.pool.is_busy('stage'))
+        self.assertEqual(self.delivered, ['pull', 'fresh'])
+
+    def test_mutations_with_same_key_all_run_in_order(self):
+        self.submit('pull', 'pull', self.gate, exclusive=True)
+        self.submit('index', 'add a', exclusive=True, supersedes=('stage',))
+        self.submit('index', 'add b', exclusive=True, supersedes=('stage',))
+        self.gate.set()
+        self.wait_until(lambda: not self.pool.is_busy('index'))
+        self.assertEqual(self.delivered, ['pull', 'add a', 'add b'])
+
+    def test_unrelated_reads_run_during_exclusive_job(self):
+        self.submit('pull', 'pull', self.gate, exclusive=True, supersedes=('stage',))
+        self.submit('stage', 'stage')
+        self.submit('file_diff', 'diff')
+        self.wait_until(lambda: not self.pool.is_busy('file_diff'))
+        # The status read would see the pull half done; it waits
+        self.assertEqual(self.delivered, ['diff'])
+        self.gate.set()
+        self.wait_until(lambda: not self.pool.is_busy('stage'))
+        self.assertEqual(self.delivered, ['diff', 'pull', 'stage'])
+
+    def test_exclusive_jobs_run_one_at_a_time(self):
+        self.submit('pull', 'pull', self.gate, exclusive=True)
+        self.submit('commit', 'commit', exclusive=True)
+        self.submit('file_diff', 'diff')
+        self.wait_until(lambda: not self.pool.is_busy('file_diff'))
+        self.assertEqual(self.delivered, ['diff'])
+        self.gate.set()
+        self.wait_until(lambda: not self.pool.is_busy('commit'))
+        self.assertEqual(self.delivered, ['diff', 'pull', 'commit'])
+
+    def test_cancel_drops_every_job_under_key(self):
+        self.submit('pull', 'pull', self.gate, exclusive=True)
+        self.submit('index', 'add a', exclusive=True)
+        self.submit('index', 'add b', exclusive=True)
+        self.pool.cancel('index')
+        self.gate.set()
+        self.wait_until(lambda: not self.pool.is_busy('pull'))
+        self.assertEqual(self.delivered, ['pull'])
+
+class FetchSchedulerTest(PoolTestCase):
+    """Background fetching survives its job being cancelled"""
+    def setUp(self):
+        super().setUp()
+        self.scheduler = self.GitDash.FetchScheduler(self.pool, None, lambda: False)
+        self.scheduler.start('/nonexistent', 600)
+        self.scheduler._timer.stop()
+
+    def test_rearms_after_cancelled_fetch(self):
+        # Stands in for the fetch the timer started
+        self.submit('auto_fetch', 'fetch', self.gate)
+        self.pool.cancel('auto_fetch')
+        self.assertTrue(self.scheduler._timer.isActive())
+
+    def test_start_rearms_idle_timer(self):
+        self.scheduler.start('/nonexistent', 600)
+        self.assertTrue(self.scheduler._timer.isActive())
+
+    def test_stop_stays_stopped(self):
+        self.submit('auto_fetch', 'fetch', self.gate)
+        self.scheduler.stop()
+        self.assertFalse(self.scheduler._timer.isActive())
+
+if __name__ == "__main__":
+    unittest.main()